@@ -0,0 +1,45 @@
+"""Add token usage columns to analysis_history
+
+Revision ID: 3f9a2c7d1b4e
+Revises: 8ce936915c0b
+Create Date: 2026-10-19 13:05:12.418230
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9a2c7d1b4e"
+down_revision: Union[str, Sequence[str], None] = "8ce936915c0b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    DatabaseService adds these columns itself when the API starts: skip those it added if the API ran before this upgrade.
+    """
+    existing = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("analysis_history")}
+    for column in (
+        sa.Column("input_tokens", sa.Integer(), nullable=True),
+        sa.Column("output_tokens", sa.Integer(), nullable=True),
+        sa.Column("model_requests", sa.Integer(), nullable=True),
+        sa.Column("model_latency_seconds", sa.Float(), nullable=True),
+        sa.Column("usage_steps", sa.Text(), nullable=True),
+    ):
+        if column.name not in existing:
+            op.add_column("analysis_history", column)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("analysis_history", "usage_steps")
+    op.drop_column("analysis_history", "model_latency_seconds")
+    op.drop_column("analysis_history", "model_requests")
+    op.drop_column("analysis_history", "output_tokens")
+    op.drop_column("analysis_history", "input_tokens")
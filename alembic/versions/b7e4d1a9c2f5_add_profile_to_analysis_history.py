@@ -0,0 +1,34 @@
+"""Add profile column to analysis_history
+
+Revision ID: b7e4d1a9c2f5
+Revises: 3f9a2c7d1b4e
+Create Date: 2026-10-19 15:42:37.106514
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e4d1a9c2f5"
+down_revision: Union[str, Sequence[str], None] = "3f9a2c7d1b4e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    DatabaseService adds this column itself when the API starts: skip it if the API ran before this upgrade.
+    """
+    existing = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("analysis_history")}
+    if "profile" not in existing:
+        op.add_column("analysis_history", sa.Column("profile", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("analysis_history", "profile")
@@ -0,0 +1,34 @@
+"""Add product_name column to analysis_history
+
+Revision ID: c4d8e2f6a1b3
+Revises: b7e4d1a9c2f5
+Create Date: 2026-10-19 16:20:11.482930
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4d8e2f6a1b3"
+down_revision: Union[str, Sequence[str], None] = "b7e4d1a9c2f5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    DatabaseService adds this column itself when the API starts: skip it if the API ran before this upgrade.
+    """
+    existing = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("analysis_history")}
+    if "product_name" not in existing:
+        op.add_column("analysis_history", sa.Column("product_name", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("analysis_history", "product_name")
@@ -0,0 +1,34 @@
+"""Add prewarmed column to analysis_history
+
+Revision ID: d9a3f7b2c5e8
+Revises: c4d8e2f6a1b3
+Create Date: 2026-10-19 17:05:48.231764
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d9a3f7b2c5e8"
+down_revision: Union[str, Sequence[str], None] = "c4d8e2f6a1b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    DatabaseService adds this column itself when the API starts: skip it if the API ran before this upgrade.
+    """
+    existing = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("analysis_history")}
+    if "prewarmed" not in existing:
+        op.add_column("analysis_history", sa.Column("prewarmed", sa.Boolean(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("analysis_history", "prewarmed")
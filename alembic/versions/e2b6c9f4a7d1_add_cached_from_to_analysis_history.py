@@ -0,0 +1,34 @@
+"""Add cached_from column to analysis_history
+
+Revision ID: e2b6c9f4a7d1
+Revises: d9a3f7b2c5e8
+Create Date: 2026-10-19 19:42:11.508213
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2b6c9f4a7d1"
+down_revision: Union[str, Sequence[str], None] = "d9a3f7b2c5e8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    DatabaseService adds this column itself when the API starts: skip it if the API ran before this upgrade.
+    """
+    existing = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("analysis_history")}
+    if "cached_from" not in existing:
+        op.add_column("analysis_history", sa.Column("cached_from", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("analysis_history", "cached_from")
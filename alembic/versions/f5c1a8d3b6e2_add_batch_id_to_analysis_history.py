@@ -0,0 +1,34 @@
+"""Add batch_id column to analysis_history
+
+Revision ID: f5c1a8d3b6e2
+Revises: e2b6c9f4a7d1
+Create Date: 2026-10-19 20:16:37.904512
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f5c1a8d3b6e2"
+down_revision: Union[str, Sequence[str], None] = "e2b6c9f4a7d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    DatabaseService adds this column itself when the API starts: skip it if the API ran before this upgrade.
+    """
+    existing = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("analysis_history")}
+    if "batch_id" not in existing:
+        op.add_column("analysis_history", sa.Column("batch_id", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("analysis_history", "batch_id")
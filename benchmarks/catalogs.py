@@ -0,0 +1,49 @@
+import json
+from collections.abc import Callable, Iterator, Mapping
+from functools import lru_cache
+from typing import Any
+
+from benchmarks.dataset import SyntheticDataset
+from src.catalog import DATA_DIR, Catalog
+
+
+class SyntheticSection(Mapping):
+    """Read-only mapping over `names` whose values are generated on access from the key's index.
+
+    Only the last few values are kept, so a catalog of a million products mostly costs its list of names,
+    and repeated lookups of the same product (as in a benchmark loop) don't measure the generator.
+    """
+
+    def __init__(self, names: list[str], make_value: Callable[[int, str], Any]):
+        self._names = names
+        self._index = {name: index for index, name in enumerate(names)}
+        self._make_value = lru_cache(maxsize=8)(make_value)
+
+    def __getitem__(self, name: str) -> Any:
+        return self._make_value(self._index[name], name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+def synthetic_catalog(products: int, reviews: int, retailers: int = 15, seed: int = 0) -> Catalog:
+    """An in-memory catalog over a `SyntheticDataset`, generating records lazily instead of writing files."""
+    dataset = SyntheticDataset(products, reviews, retailers, seed)
+    names = dataset.product_names()
+    retailer_config = dataset.retailer_config()
+    with open(DATA_DIR / "market_data.json", encoding="utf-8") as f:
+        market_data = json.load(f)
+    return Catalog(
+        products=SyntheticSection(names, dataset.product),
+        reviews=SyntheticSection(names, dataset.product_reviews),
+        market_trends=SyntheticSection(names, dataset.market_trends),
+        retailers=list(retailer_config),
+        retailer_config=retailer_config,
+        market_data=market_data,
+    )
@@ -0,0 +1,75 @@
+"""Input tokens per analysis with and without compacting the data handles already seen (src/llm/history.py).
+
+    python -m benchmarks.context_trimming                   # the first products of data/
+    python -m benchmarks.context_trimming --reviews 20000   # the most reviewed products of a synthetic catalog
+
+Analyses run through the standard pipeline with `benchmarks.stub_model.scripted_model`, so token counts are
+pydantic-ai's word-based estimate of what the model would be sent, not provider counts.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+from contextlib import nullcontext
+from itertools import islice
+from unittest.mock import patch
+
+from loguru import logger
+
+from benchmarks.catalogs import synthetic_catalog
+from benchmarks.run import use_catalog
+from benchmarks.stub_model import scripted_model
+from src.api.services.research import execute_analysis
+from src.catalog import get_catalog
+from src.config import settings
+from src.llm.agent import generate_research_agent
+
+
+def input_tokens(product: str, compact: bool) -> int:
+    agent = generate_research_agent(model=scripted_model(), **({} if compact else {"history_processors": []}))
+    result = asyncio.run(execute_analysis(f"context-{product}", product, agent))
+    if result["error"]:
+        raise RuntimeError(f"Analysis of {product!r} failed: {result['error']}")
+    return result["usage"]["input_tokens"]
+
+
+def compare_trimming(products: list[str]) -> dict[str, dict[str, float]]:
+    results = {}
+    with tempfile.TemporaryDirectory() as reports_dir, patch.object(settings, "REPORTS_DIR", reports_dir):
+        for product in products:
+            full, compacted = input_tokens(product, compact=False), input_tokens(product, compact=True)
+            results[product] = {"full": full, "compacted": compacted, "reduction": round(1 - compacted / full, 4)}
+    return results
+
+
+def format_results(results: dict[str, dict[str, float]]) -> str:
+    width = max(len(product) for product in results)
+    lines = [f"{'product':<{width}}  {'full':>9}  {'compacted':>9}  reduction"]
+    for product, tokens in results.items():
+        lines.append(f"{product:<{width}}  {tokens['full']:>9}  {tokens['compacted']:>9}  {tokens['reduction']:>9.1%}")
+    full = sum(tokens["full"] for tokens in results.values())
+    compacted = sum(tokens["compacted"] for tokens in results.values())
+    lines.append(f"{'total':<{width}}  {full:>9}  {compacted:>9}  {1 - compacted / full:>9.1%}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare input tokens per analysis with and without context trimming.")
+    parser.add_argument("--products", type=int, default=5, help="Number of products to analyse")
+    parser.add_argument("--reviews", type=int, help="Use a synthetic catalog of 1000 products with this many reviews")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    catalog = synthetic_catalog(products=1_000, reviews=args.reviews) if args.reviews else None
+    with use_catalog(catalog) if catalog else nullcontext():
+        results = compare_trimming(list(islice(catalog.products if catalog else get_catalog().products, args.products)))
+    print(json.dumps(results, indent=2) if args.json else format_results(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
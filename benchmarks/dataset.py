@@ -0,0 +1,313 @@
+"""Synthetic catalog generator for scale testing.
+
+    python -m benchmarks.dataset data/synthetic --products 100000 --reviews 5000000 --retailers 2000 --snapshot
+
+Writes products.json, reviews.json, market_trends.json, retailers.json, retailer_config.json and
+market_data.json in the layout of `data/`, and with --snapshot the catalog snapshot the API maps
+(serve it with CATALOG_SNAPSHOT_PATH=data/synthetic/catalog.snapshot).
+
+Every record is derived from (seed, index), so any product, its reviews or its trends can also be
+generated on their own, without writing the files (see benchmarks.catalogs). Product names come
+from real product lines with generations, variants and editions, so near-duplicates such as
+"Samsung Galaxy S23" and "Samsung Galaxy S23 Ultra" are common, and review counts follow a Zipf
+distribution over popularity rank (index 0 is the most reviewed product).
+"""
+
+import argparse
+import json
+import random
+from collections import Counter
+from collections.abc import Iterator
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+from src.catalog import DATA_DIR
+from src.catalog.snapshot import build_snapshot
+
+# (brand, product line with a slot for the generation number, category, first generation, base price)
+PRODUCT_LINES = [
+    ("Samsung", "Galaxy S{}", "Smartphones", 20, 799.0),
+    ("Samsung", "Galaxy A{}", "Smartphones", 10, 299.0),
+    ("Samsung", "Galaxy Z Fold{}", "Smartphones", 1, 1799.0),
+    ("Apple", "iPhone {}", "Smartphones", 11, 799.0),
+    ("Google", "Pixel {}", "Smartphones", 5, 599.0),
+    ("OnePlus", "Nord {}", "Smartphones", 2, 399.0),
+    ("Apple", "MacBook Pro {}", "Laptops", 13, 1599.0),
+    ("Apple", "MacBook Air {}", "Laptops", 13, 1099.0),
+    ("Dell", "XPS {}", "Laptops", 13, 1299.0),
+    ("Lenovo", "ThinkPad X1 Carbon Gen {}", "Laptops", 9, 1499.0),
+    ("HP", "Spectre x360 {}", "Laptops", 13, 1399.0),
+    ("Sony", "WH-1000XM{}", "Headphones", 3, 349.0),
+    ("Bose", "QuietComfort {}", "Headphones", 35, 299.0),
+    ("Apple", "AirPods Pro {}", "Headphones", 1, 249.0),
+    ("Apple", "iPad Pro {}", "Tablets", 11, 999.0),
+    ("Samsung", "Galaxy Tab S{}", "Tablets", 7, 699.0),
+    ("Apple", "Watch Series {}", "Smartwatches", 7, 399.0),
+    ("Samsung", "Galaxy Watch{}", "Smartwatches", 4, 299.0),
+    ("Sony", "PlayStation {}", "Gaming", 4, 499.0),
+    ("Nintendo", "Switch {}", "Gaming", 1, 299.0),
+]
+VARIANTS = [
+    ("", 1.0),
+    (" Plus", 1.15),
+    (" Ultra", 1.45),
+    (" Pro", 1.3),
+    (" Pro Max", 1.5),
+    (" Mini", 0.8),
+    (" Lite", 0.7),
+    (" FE", 0.75),
+]
+GENERATIONS = 40
+STORAGES = ["", " 128GB", " 256GB", " 512GB", " 1TB", " 2TB"]
+COLORS = ["", " Black", " White", " Silver", " Blue", " Green", " Titanium", " Graphite", " Pink", " Gold"]
+CONDITIONS = ["", " (Renewed)", " (Open Box)"]
+EDITIONS = [storage + color + condition for condition in CONDITIONS for color in COLORS for storage in STORAGES]
+
+ASPECTS = ["battery life", "screen", "camera", "build quality", "price", "performance", "sound", "software", "shipping", "support"]
+REVIEW_TEMPLATES = {
+    "positive": [
+        "Love the {aspect} on the {name}.",
+        "The {name} is excellent, the {aspect} is outstanding.",
+        "Great {aspect}, worth it.",
+    ],
+    "neutral": [
+        "The {name} is fine, {aspect} is average.",
+        "Decent {aspect}, nothing special.",
+        "Okay overall, the {aspect} could be better.",
+    ],
+    "negative": [
+        "Disappointed with the {aspect} of the {name}.",
+        "The {aspect} is poor for the price.",
+        "Returned it, the {aspect} failed.",
+    ],
+}
+FIRST_NAMES = [
+    "Sarah",
+    "Mike",
+    "Jennifer",
+    "David",
+    "Lisa",
+    "James",
+    "Emma",
+    "Carlos",
+    "Aisha",
+    "Wei",
+    "Olga",
+    "Tom",
+    "Priya",
+    "Noah",
+]
+RETAILER_PREFIXES = ["Tech", "Gadget", "Electro", "Digital", "Smart", "Mega", "Prime", "Value", "Metro", "Nova", "Bright", "Urban"]
+RETAILER_SUFFIXES = ["Mart", "Hub", "Depot", "Direct", "Outlet", "World", "Store", "Zone", "Shop", "Express"]
+AVAILABILITY = ["In Stock"] * 6 + ["Limited Stock"] * 2 + ["Backorder", "Out of Stock"]
+PROMOTIONS = [
+    "Free shipping",
+    "Price match guarantee",
+    "Cashback offer",
+    "Bundle discount",
+    "Extended warranty",
+    "Student discount",
+]
+ZIPF_EXPONENT = 1.1
+REVIEW_START_DATE = date(2023, 1, 1)
+
+
+def product_name(index: int) -> str:
+    index, line = divmod(index, len(PRODUCT_LINES))
+    index, variant = divmod(index, len(VARIANTS))
+    index, generation = divmod(index, GENERATIONS)
+    brand, product_line, _, first_generation, _ = PRODUCT_LINES[line]
+    name = f"{brand} {product_line.format(first_generation + generation)}{VARIANTS[variant][0]}"
+    if index < len(EDITIONS):
+        return name + EDITIONS[index]
+    return f"{name} #{index}"
+
+
+def sentiment_for(rating: int) -> str:
+    return "positive" if rating >= 4 else "negative" if rating <= 2 else "neutral"
+
+
+class SyntheticDataset:
+    def __init__(self, products: int, reviews: int, retailers: int = 15, seed: int = 0):
+        self.products = products
+        self.reviews = reviews
+        self.retailers = retailers
+        self.seed = seed
+        self.review_counts = self._allocate_reviews()
+
+    def _allocate_reviews(self) -> list[int]:
+        weights = [1 / (rank + 1) ** ZIPF_EXPONENT for rank in range(self.products)]
+        total_weight = sum(weights)
+        counts = [int(self.reviews * weight / total_weight) for weight in weights]
+        if counts:
+            counts[0] += self.reviews - sum(counts)
+        return counts
+
+    def _rng(self, kind: str, index: int) -> random.Random:
+        return random.Random(f"{self.seed}:{kind}:{index}")
+
+    def product_names(self) -> list[str]:
+        return [product_name(index) for index in range(self.products)]
+
+    def ratings(self, index: int) -> list[int]:
+        rng = self._rng("ratings", index)
+        quality = rng.random()
+        weights = [1 + 4 * (1 - quality), 1 + 2 * (1 - quality), 2, 2 + 4 * quality, 2 + 8 * quality]
+        return rng.choices(range(1, 6), weights=weights, k=self.review_counts[index])
+
+    def product(self, index: int, name: str | None = None) -> dict[str, Any]:
+        name = name or product_name(index)
+        brand, product_line, category, _, base_price = PRODUCT_LINES[index % len(PRODUCT_LINES)]
+        multiplier = VARIANTS[index // len(PRODUCT_LINES) % len(VARIANTS)][1]
+        rng = self._rng("product", index)
+        distribution = Counter(self.ratings(index))
+        return {
+            "name": name,
+            "brand": brand,
+            "category": category,
+            "base_price": round(base_price * multiplier * rng.uniform(0.9, 1.1), 2),
+            "description": f"{brand} {product_line.format('').strip()} {category.lower().rstrip('s')} with {rng.choice(ASPECTS)} upgrades",
+            "specifications": {
+                "processor": f"{brand} chip gen {rng.randint(1, 9)}",
+                "storage": rng.choice(STORAGES[1:]).strip(),
+                "weight": f"{rng.randint(150, 2500)}g",
+            },
+            "rating_distribution": {
+                "5_star": distribution[5],
+                "4_star": distribution[4],
+                "3_star": distribution[3],
+                "2_star": distribution[2],
+                "1_star": distribution[1],
+                "total_reviews": self.review_counts[index],
+            },
+        }
+
+    def product_reviews(self, index: int, name: str | None = None) -> list[dict[str, Any]]:
+        name = name or product_name(index)
+        rng = self._rng("reviews", index)
+        reviews = []
+        for review, rating in enumerate(self.ratings(index)):
+            sentiment = sentiment_for(rating)
+            reviews.append(
+                {
+                    "review_id": f"rev_{index}_{review}",
+                    "reviewer_name": f"{rng.choice(FIRST_NAMES)} {chr(65 + rng.randrange(26))}.",
+                    "rating": rating,
+                    "review_text": rng.choice(REVIEW_TEMPLATES[sentiment]).format(aspect=rng.choice(ASPECTS), name=name),
+                    "sentiment": sentiment,
+                    "review_date": (REVIEW_START_DATE + timedelta(days=rng.randrange(730))).isoformat(),
+                    "verified_purchase": rng.random() < 0.85,
+                    "helpful_votes": int(rng.paretovariate(1.5)) - 1,
+                }
+            )
+        return reviews
+
+    def market_trends(self, index: int, name: str | None = None) -> dict[str, Any]:
+        name = name or product_name(index)
+        category = PRODUCT_LINES[index % len(PRODUCT_LINES)][2]
+        rng = self._rng("trends", index)
+        search_change = round(rng.uniform(-12, 15), 1)
+        price_change = round(rng.uniform(-6, 6), 1)
+        growth = round(rng.uniform(-20, 30), 1)
+        competition = round(rng.uniform(0.2, 0.95), 2)
+        insights = [f"Search volume {'increased' if search_change >= 0 else 'decreased'} by {abs(search_change)}% this month"]
+        if growth > 10:
+            insights.append("Strong 6-month growth trend indicates rising market interest")
+        if competition > 0.7:
+            insights.append("High competition index suggests a crowded market with many players")
+        return {
+            "category": category.lower(),
+            "current_metrics": {
+                # Popular products are searched more.
+                "search_volume": max(1, int(200 / (index + 1) ** 0.3 * rng.uniform(0.8, 1.2))),
+                "price_index": round(rng.uniform(80, 120), 1),
+                "competition_index": competition,
+            },
+            "trend_changes": {
+                "monthly_search_change_percent": search_change,
+                "monthly_price_change_percent": price_change,
+                "six_month_growth_percent": growth,
+            },
+            "market_sentiment": "bullish" if growth > 10 else "bearish" if growth < -5 else "neutral",
+            "insights": insights,
+        }
+
+    def retailer_names(self) -> list[str]:
+        names = []
+        for index in range(self.retailers):
+            rest, prefix = divmod(index, len(RETAILER_PREFIXES))
+            number, suffix = divmod(rest, len(RETAILER_SUFFIXES))
+            names.append(f"{RETAILER_PREFIXES[prefix]}{RETAILER_SUFFIXES[suffix]}" + (f" {number + 1}" if number else ""))
+        return names
+
+    def retailer_config(self) -> dict[str, dict[str, Any]]:
+        config = {}
+        for index, name in enumerate(self.retailer_names()):
+            rng = self._rng("retailer", index)
+            config[name] = {
+                "shipping_cost": rng.choice([0.0, 0.0, 4.99, 5.99, 9.99, 14.99]),
+                "promotion": rng.choice(PROMOTIONS),
+                "url_format": f"https://{name.lower().replace(' ', '')}.com/product/mock-url",
+                "discount": rng.choice([0, 5, 10, 15, 20]),
+                "rating": round(rng.uniform(3.2, 4.9), 1),
+                "review_count": int(rng.paretovariate(1.2) * 200),
+                "availability": rng.choice(AVAILABILITY),
+            }
+        return config
+
+    def write(self, output_dir: Path) -> None:
+        """Write the dataset as the `data/` JSON files; reviews are streamed so millions of them fit in memory."""
+        output_dir.mkdir(parents=True, exist_ok=True)
+        names = self.product_names()
+        _write_json_array(output_dir / "products.json", (self.product(index, name) for index, name in enumerate(names)))
+        _write_json_object(
+            output_dir / "reviews.json", ((name, self.product_reviews(index, name)) for index, name in enumerate(names))
+        )
+        _write_json_object(
+            output_dir / "market_trends.json", ((name, self.market_trends(index, name)) for index, name in enumerate(names))
+        )
+        retailer_config = self.retailer_config()
+        (output_dir / "retailers.json").write_text(json.dumps(list(retailer_config), indent=2))
+        (output_dir / "retailer_config.json").write_text(json.dumps(retailer_config, indent=2))
+        (output_dir / "market_data.json").write_text((Path(DATA_DIR) / "market_data.json").read_text())
+
+
+def _write_json_array(path: Path, items: Iterator[Any]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for position, item in enumerate(items):
+            f.write(",\n" if position else "\n")
+            json.dump(item, f)
+        f.write("\n]\n")
+
+
+def _write_json_object(path: Path, items: Iterator[tuple[str, Any]]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{")
+        for position, (key, value) in enumerate(items):
+            f.write(",\n" if position else "\n")
+            f.write(f"{json.dumps(key)}: {json.dumps(value)}")
+        f.write("\n}\n")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic catalog for scale testing.")
+    parser.add_argument("output", type=Path, help="Directory to write the JSON files to")
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--reviews", type=int, default=1_000_000, help="Total reviews, spread over products by popularity")
+    parser.add_argument("--retailers", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--snapshot", action="store_true", help="Also build catalog.snapshot in the output directory")
+    args = parser.parse_args(argv)
+
+    dataset = SyntheticDataset(args.products, args.reviews, args.retailers, args.seed)
+    dataset.write(args.output)
+    print(f"Wrote {args.products} products, {args.reviews} reviews and {args.retailers} retailers to {args.output}")
+    if args.snapshot:
+        build_snapshot(args.output, args.output / "catalog.snapshot")
+        print(f"Built {args.output / 'catalog.snapshot'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Offline load test of the analysis API, with a scripted stand-in for the model.
+
+    python -m benchmarks.loadtest --rate 5 --requests 200 --model-delay 0.5
+
+The API runs in-process with the agent's model swapped for `benchmarks.stub_model.scripted_model`,
+a temporary database and a temporary reports directory. Requests arrive at a fixed rate (open loop,
+whether or not earlier analyses finished); each one is a `POST /api/v1/analyze` followed by polling
+`GET /api/v1/analyze/{id}` until the report is served.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+import uvicorn
+from loguru import logger
+
+from benchmarks.stub_model import scripted_model
+from src.api.main import app
+from src.api.services.database_service import DatabaseService
+from src.api.services.reports import IMMUTABLE_CACHE_CONTROL
+from src.catalog import get_catalog
+from src.config import settings
+from src.llm.agent import generate_research_agent
+from src.monitoring.metrics import Summary
+
+
+@dataclass
+class LoadTestResult:
+    offered_rate: float
+    requests: int = 0
+    completed: int = 0
+    elapsed_seconds: float = 0.0
+    errors: Counter = field(default_factory=Counter)
+    submit_latency: Summary = field(
+        default_factory=lambda: Summary("submit_latency_seconds", "POST /analyze latency", window=1 << 20)
+    )
+    poll_latency: Summary = field(
+        default_factory=lambda: Summary("poll_latency_seconds", "GET /analyze/{id} latency", window=1 << 20)
+    )
+    analysis_latency: Summary = field(
+        default_factory=lambda: Summary("analysis_latency_seconds", "Submission to report latency", window=1 << 20)
+    )
+
+    def to_dict(self) -> dict:
+        return {
+            "offered_rate": self.offered_rate,
+            "requests": self.requests,
+            "completed": self.completed,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "throughput_per_second": round(self.completed / self.elapsed_seconds, 3) if self.elapsed_seconds else 0.0,
+            "error_rate": round(sum(self.errors.values()) / self.requests, 4) if self.requests else 0.0,
+            "errors": dict(self.errors),
+            "submit_latency_seconds": self.submit_latency.percentiles(),
+            "poll_latency_seconds": self.poll_latency.percentiles(),
+            "analysis_latency_seconds": self.analysis_latency.percentiles(),
+        }
+
+
+@contextmanager
+def stub_api(model_delay: float) -> Iterator[str]:
+    """Serve the API on a free local port with the scripted model; yield its base URL."""
+    model = scripted_model(model_delay)
+    with (
+        tempfile.TemporaryDirectory() as workdir,
+        patch("src.api.services.research.generate_research_agent", lambda **kwargs: generate_research_agent(model=model, **kwargs)),
+        patch("src.api.routes.analysis.db_service", DatabaseService(str(Path(workdir) / "loadtest.db"))),
+        patch.object(settings, "REPORTS_DIR", str(Path(workdir) / "reports")),
+    ):
+        server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+        thread = threading.Thread(target=server.run, name="loadtest-api", daemon=True)
+        thread.start()
+        while not server.started:
+            if not thread.is_alive():
+                raise RuntimeError("Load test API failed to start")
+            time.sleep(0.01)
+        port = server.servers[0].sockets[0].getsockname()[1]
+        try:
+            yield f"http://127.0.0.1:{port}"
+        finally:
+            server.should_exit = True
+            thread.join()
+
+
+async def _analysis(client: httpx.AsyncClient, query: str, result: LoadTestResult, poll_interval: float, timeout: float) -> None:
+    started = time.perf_counter()
+    try:
+        response = await client.post("/api/v1/analyze", json={"query": query})
+        result.submit_latency.observe(time.perf_counter() - started)
+        if response.status_code != 200:
+            result.errors[f"submit_http_{response.status_code}"] += 1
+            return
+        analysis_id = response.json()["analysis_id"]
+
+        while time.perf_counter() - started < timeout:
+            polled = time.perf_counter()
+            response = await client.get(f"/api/v1/analyze/{analysis_id}")
+            result.poll_latency.observe(time.perf_counter() - polled)
+            if response.status_code != 200:
+                result.errors[f"poll_http_{response.status_code}"] += 1
+                return
+            # Finished reports are served as immutable; the still-running page is not cached.
+            if response.headers.get("cache-control") == IMMUTABLE_CACHE_CONTROL:
+                result.analysis_latency.observe(time.perf_counter() - started)
+                result.completed += 1
+                return
+            await asyncio.sleep(poll_interval)
+        result.errors["timeout"] += 1
+    except httpx.HTTPError as e:
+        result.errors[type(e).__name__] += 1
+
+
+async def run_load(
+    base_url: str, queries: list[str], rate: float, requests: int, poll_interval: float = 0.25, timeout: float = 120.0
+) -> LoadTestResult:
+    result = LoadTestResult(offered_rate=rate)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        started = time.perf_counter()
+        tasks = []
+        for index in range(requests):
+            await asyncio.sleep(max(0.0, started + index / rate - time.perf_counter()))
+            tasks.append(asyncio.create_task(_analysis(client, queries[index % len(queries)], result, poll_interval, timeout)))
+            result.requests += 1
+        await asyncio.gather(*tasks)
+        result.elapsed_seconds = time.perf_counter() - started
+    return result
+
+
+def format_result(result: dict) -> str:
+    lines = [
+        f"requests: {result['requests']} at {result['offered_rate']}/s, completed: {result['completed']} "
+        f"in {result['elapsed_seconds']}s ({result['throughput_per_second']}/s)",
+        f"error rate: {result['error_rate']:.2%} {result['errors'] or ''}".rstrip(),
+    ]
+    for name in ("submit_latency_seconds", "poll_latency_seconds", "analysis_latency_seconds"):
+        percentiles = " ".join(f"{quantile}={value * 1000:.1f}ms" for quantile, value in result[name].items())
+        lines.append(f"{name}: {percentiles or '-'}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the analysis API offline with a scripted model.")
+    parser.add_argument("--rate", type=float, default=2.0, help="Analyses submitted per second")
+    parser.add_argument("--requests", type=int, default=50, help="Total analyses to submit")
+    parser.add_argument("--model-delay", type=float, default=0.2, help="Seconds the stub model waits before each of its 7 steps")
+    parser.add_argument("--poll-interval", type=float, default=0.25)
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds before an unfinished analysis counts as an error")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    queries = list(get_catalog().products)
+    with stub_api(args.model_delay) as base_url:
+        result = asyncio.run(run_load(base_url, queries, args.rate, args.requests, args.poll_interval, args.timeout)).to_dict()
+    print(json.dumps(result, indent=2) if args.json else format_result(result))
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
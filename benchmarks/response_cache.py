@@ -0,0 +1,78 @@
+"""End-to-end analysis latency on a cold model response cache and when replaying it (src/llm/response_cache.py).
+
+    python -m benchmarks.response_cache --delay 1.0 --runs 3
+
+Each product is analysed twice through the standard pipeline with a stub model taking `--delay` seconds per
+request: the first run fills a fresh cache, the second is answered from it and never reaches the model.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+from loguru import logger
+
+from benchmarks.stub_model import scripted_model
+from src.api.services.research import execute_analysis
+from src.catalog import get_catalog
+from src.config import settings
+from src.llm.agent import generate_research_agent
+from src.llm.response_cache import model_response_store
+
+
+def _timed_analysis(agent, product: str) -> float:
+    started = time.perf_counter()
+    result = asyncio.run(execute_analysis(f"cache-{product}", product, agent))
+    elapsed = time.perf_counter() - started
+    if result["error"]:
+        raise RuntimeError(f"Analysis of {product!r} failed: {result['error']}")
+    return elapsed
+
+
+def compare_replay(products: list[str], delay: float) -> dict[str, dict]:
+    with tempfile.TemporaryDirectory() as tmp, patch.object(settings, "REPORTS_DIR", tmp):
+        with patch.object(settings, "MODEL_CACHE_PATH", os.path.join(tmp, "model_cache.db")):
+            agent = generate_research_agent(model=scripted_model(delay))
+            store = model_response_store(settings.MODEL_CACHE_PATH)
+        results = {}
+        for run in ("cold", "replayed"):
+            hits, misses = store.stats()
+            latencies = [_timed_analysis(agent, product) for product in products]
+            results[run] = {
+                "median_seconds": round(statistics.median(latencies), 3),
+                "hits": store.hits - hits,
+                "misses": store.misses - misses,
+            }
+    return results
+
+
+def format_results(results: dict[str, dict]) -> str:
+    lines = [f"{'run':<8}  {'median':>8}  {'hits':>4}  {'misses':>6}"]
+    for run, result in results.items():
+        lines.append(f"{run:<8}  {result['median_seconds']:>7.3f}s  {result['hits']:>4}  {result['misses']:>6}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare analysis latency on a cold and on a warm model response cache.")
+    parser.add_argument("--delay", type=float, default=1.0, help="Seconds the stub model takes per request")
+    parser.add_argument("--runs", type=int, default=3, help="Analyses per pass")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    products = list(get_catalog().products)
+    results = compare_replay([products[index % len(products)] for index in range(args.runs)], args.delay)
+    print(json.dumps(results, indent=2) if args.json else format_results(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
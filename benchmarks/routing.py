@@ -0,0 +1,97 @@
+"""End-to-end analysis latency per model routing policy, with stub models standing in for the large and the fast model.
+
+    python -m benchmarks.routing --large-delay 1.0 --fast-delay 0.3 --runs 3
+
+Each policy runs the same analyses through the standard pipeline; the stub models follow the usual ten steps and
+differ only by how long they take to answer (see src/llm/routing.py for the policies).
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from unittest.mock import patch
+
+from loguru import logger
+from pydantic_ai import capture_run_messages
+from pydantic_ai.messages import ModelResponse, ToolCallPart
+
+from benchmarks.stub_model import scripted_model
+from src.api.services.research import execute_analysis
+from src.catalog import get_catalog
+from src.config import settings
+from src.llm.agent import DATA_FIELDS, generate_research_agent
+from src.llm.routing import ROUTING_POLICIES, route_models
+
+
+async def _timed_analysis(agent, product: str) -> tuple[float, list[ModelResponse]]:
+    with capture_run_messages() as messages:
+        started = time.perf_counter()
+        result = await execute_analysis(f"routing-{product}", product, agent)
+        elapsed = time.perf_counter() - started
+    if result["error"]:
+        raise RuntimeError(f"Analysis of {product!r} failed: {result['error']}")
+    return elapsed, [message for message in messages if isinstance(message, ModelResponse)]
+
+
+def compare_routing(products: list[str], large_delay: float, fast_delay: float, policies=ROUTING_POLICIES) -> dict[str, dict]:
+    results = {}
+    with tempfile.TemporaryDirectory() as reports_dir, patch.object(settings, "REPORTS_DIR", reports_dir):
+        for policy in policies:
+            model = route_models(policy, scripted_model(large_delay, "large"), scripted_model(fast_delay, "fast"), DATA_FIELDS)
+            agent = generate_research_agent(model=model)
+            latencies, requests, large_tool_calls = [], Counter(), []
+            for product in products:
+                elapsed, responses = asyncio.run(_timed_analysis(agent, product))
+                latencies.append(elapsed)
+                requests.update(response.model_name for response in responses)
+                # The tools the large model chose to call: tells which steps it answered.
+                large_tool_calls.extend(
+                    part.tool_name
+                    for response in responses
+                    if response.model_name == "large"
+                    for part in response.parts
+                    if isinstance(part, ToolCallPart)
+                )
+            results[policy] = {
+                "median_seconds": round(statistics.median(latencies), 3),
+                "large_requests": requests["large"],
+                "fast_requests": requests["fast"],
+                "large_tool_calls": large_tool_calls,
+            }
+    return results
+
+
+def format_results(results: dict[str, dict]) -> str:
+    baseline = results.get("large", {}).get("median_seconds")
+    lines = [f"{'policy':<8}  {'median':>8}  {'large':>5}  {'fast':>5}  vs large"]
+    for policy, result in results.items():
+        speedup = f"{baseline / result['median_seconds']:.2f}x" if baseline else "-"
+        lines.append(
+            f"{policy:<8}  {result['median_seconds']:>7.3f}s  {result['large_requests']:>5}  {result['fast_requests']:>5}  {speedup:>8}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare analysis latency across model routing policies with stub models.")
+    parser.add_argument("--large-delay", type=float, default=1.0, help="Seconds the stub large model takes per request")
+    parser.add_argument("--fast-delay", type=float, default=0.3, help="Seconds the stub fast model takes per request")
+    parser.add_argument("--runs", type=int, default=3, help="Analyses per policy")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    products = list(get_catalog().products)
+    results = compare_routing([products[index % len(products)] for index in range(args.runs)], args.large_delay, args.fast_delay)
+    print(json.dumps(results, indent=2) if args.json else format_results(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
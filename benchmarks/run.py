@@ -0,0 +1,207 @@
+"""Micro-benchmarks for the agent tools over synthetic catalogs of growing size.
+
+    python -m benchmarks.run                      # run and compare against benchmarks/baseline.json
+    python -m benchmarks.run --save-baseline      # record a new baseline
+    python -m benchmarks.run --sizes 10 1000000   # pick catalog sizes (products, and reviews)
+
+Exits with status 1 when a case is slower than its baseline by more than --threshold.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+from unittest.mock import Mock, patch
+
+from loguru import logger
+
+from benchmarks.catalogs import synthetic_catalog
+from src.catalog import Catalog
+from src.catalog.resolver import ProductIndex, product_index
+from src.catalog.review_index import review_search
+from src.catalog.rollups import build_category_trends
+from src.catalog.similarity import SimilarityIndex, similarity_index
+from src.llm.agent import ResearchContext
+from src.llm.tools.competitor_analysis import find_competitors
+from src.llm.tools.market_trend_analysis import analyze_category_trends, analyze_market_trends
+from src.llm.tools.report_generator import generate_product_report
+from src.llm.tools.review_search import search_review_aspects
+from src.llm.tools.sentiment_analysis import _analyze_product_sentiment
+from src.llm.tools.webscraping import fetch_product_data, fetch_product_reviews, get_most_similar_product
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+SIZES = (10, 1_000, 100_000, 1_000_000)
+# Differences below this many seconds are timer noise, whatever their ratio.
+NOISE_FLOOR_SECONDS = 0.0005
+
+
+def _context(**deps: Any) -> Mock:
+    ctx = Mock()
+    ctx.deps = ResearchContext(**deps)
+    return ctx
+
+
+def _generate_report(ctx: Mock) -> Callable[[], Any]:
+    def run() -> None:
+        generate_product_report(ctx)
+        Path(ctx.deps.report_path).unlink()
+
+    return run
+
+
+def _get_most_similar_product(index: ProductIndex, query: str) -> Callable[[], Any]:
+    # Measures the resolution, not a hit of the index's result cache.
+    def run() -> None:
+        index.best_match.cache_clear()
+        get_most_similar_product(_context(), query)
+
+    return run
+
+
+def _find_competitors(index: SimilarityIndex, product_name: str) -> Callable[[], Any]:
+    # Measures the query, not a hit of the index's result cache.
+    def run() -> None:
+        index.similar.cache_clear()
+        find_competitors(_context(product_name=product_name))
+
+    return run
+
+
+def build_cases(catalog: Catalog) -> dict[str, Callable[[], Any]]:
+    """One zero-argument callable per benchmarked function, prepared against `catalog`."""
+    # The most reviewed product: synthetic catalogs are ordered by popularity.
+    target = next(iter(catalog.products))
+    reviews = catalog.reviews[target]
+
+    ctx = _context()
+    fetch_product_data(ctx, target)
+    report_ctx = _context(
+        product_name=target,
+        product_info=ctx.deps.product_info,
+        sentiment_analysis=_analyze_product_sentiment(reviews),
+        market_trends=catalog.market_trends[target],
+    )
+    # Measures the search, not the first indexing of the product's reviews.
+    review_search(catalog).index(target, reviews)
+    # Built at warm-up (or read from the snapshot) by the API.
+    products = product_index(catalog)
+    index = similarity_index(catalog)
+    return {
+        "get_most_similar_product": _get_most_similar_product(products, target.lower()),
+        "fetch_product_data": lambda: fetch_product_data(_context(), target),
+        "fetch_product_reviews": lambda: fetch_product_reviews(_context(), target),
+        "_analyze_product_sentiment": lambda: _analyze_product_sentiment(reviews),
+        "search_review_aspects": lambda: search_review_aspects(_context(product_name=target)),
+        "analyze_market_trends": lambda: analyze_market_trends(_context(product_name=target)),
+        "analyze_category_trends": lambda: analyze_category_trends(
+            _context(product_name=target, market_trends=catalog.market_trends[target])
+        ),
+        "find_competitors": _find_competitors(index, target),
+        "generate_product_report": _generate_report(report_ctx),
+    }
+
+
+@contextmanager
+def use_catalog(catalog: Catalog):
+    with (
+        patch("src.llm.tools.webscraping.get_catalog", return_value=catalog),
+        patch("src.llm.tools.market_trend_analysis.get_catalog", return_value=catalog),
+        patch("src.llm.tools.review_search.get_catalog", return_value=catalog),
+        patch("src.llm.tools.competitor_analysis.get_catalog", return_value=catalog),
+    ):
+        yield
+
+
+def measure(function: Callable[[], Any], repeat: int, budget_seconds: float) -> float:
+    """Median wall time of up to `repeat` calls, stopping early once `budget_seconds` is spent (at least one call)."""
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < repeat:
+        call_started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - call_started)
+        if time.perf_counter() - started > budget_seconds:
+            break
+    return statistics.median(timings)
+
+
+def run_benchmarks(sizes: tuple[int, ...] = SIZES, repeat: int = 7, budget_seconds: float = 2.0) -> dict[str, dict[str, float]]:
+    """Return {case: {size: median seconds}}."""
+    results: dict[str, dict[str, float]] = {}
+    logger.disable("src")
+    try:
+        for size in sizes:
+            catalog = synthetic_catalog(products=size, reviews=size)
+            # Catalogs built from files compute their category rollups on load: so does the synthetic one.
+            catalog = replace(catalog, category_trends=build_category_trends(catalog.market_trends.values()))
+            with use_catalog(catalog):
+                for case, function in build_cases(catalog).items():
+                    results.setdefault(case, {})[str(size)] = round(measure(function, repeat, budget_seconds), 6)
+    finally:
+        logger.enable("src")
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[dict[str, Any]]:
+    """Cases whose time grew past `threshold` times the baseline (and past the noise floor)."""
+    regressions = []
+    for case, timings in results.items():
+        for size, seconds in timings.items():
+            expected = baseline.get(case, {}).get(size)
+            if expected is None:
+                continue
+            if seconds > expected * threshold and seconds - expected > NOISE_FLOOR_SECONDS:
+                regressions.append(
+                    {"case": case, "size": size, "baseline": expected, "current": seconds, "ratio": round(seconds / expected, 2)}
+                )
+    return regressions
+
+
+def format_results(results: dict[str, dict[str, float]]) -> str:
+    sizes = sorted({size for timings in results.values() for size in timings}, key=int)
+    lines = [f"{'case':<28}" + "".join(f"{int(size):>14,}" for size in sizes)]
+    for case, timings in results.items():
+        cells = "".join(f"{timings[size] * 1000:>12.3f}ms" if size in timings else f"{'-':>14}" for size in sizes)
+        lines.append(f"{case:<28}{cells}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the agent tools over synthetic catalogs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="Catalog sizes (products and reviews)")
+    parser.add_argument("--repeat", type=int, default=7, help="Maximum calls per case; the median is kept")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio over the baseline that fails the run")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(tuple(args.sizes), repeat=args.repeat)
+    print(format_results(results))
+
+    if args.save_baseline:
+        baseline = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline first")
+        return 0
+    regressions = compare(results, json.loads(args.baseline.read_text())["results"], args.threshold)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['case']} @ {regression['size']}: "
+            f"{regression['baseline'] * 1000:.3f}ms -> {regression['current'] * 1000:.3f}ms (x{regression['ratio']})"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
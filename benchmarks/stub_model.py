@@ -0,0 +1,60 @@
+import asyncio
+import re
+
+from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, ToolCallPart, ToolReturnPart, UserPromptPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+# The tool sequence the real model follows for one analysis (see src/llm/prompt.py).
+TOOL_SEQUENCE = [
+    "get_most_similar_product",
+    "fetch_product_data",
+    "fetch_product_reviews",
+    "get_product_sentiment_analysis",
+    "search_review_aspects",
+    "analyze_market_trends",
+    "analyze_category_trends",
+    "find_competitors",
+    "generate_product_report",
+    "exit_program",
+]
+
+
+def _query(messages: list[ModelMessage]) -> str:
+    for message in messages:
+        for part in getattr(message, "parts", []):
+            if isinstance(part, UserPromptPart) and isinstance(part.content, str):
+                match = re.search(r"'(.*)'", part.content)
+                return match.group(1) if match else part.content
+    return ""
+
+
+def _resolved_product(messages: list[ModelMessage]) -> str | None:
+    for message in messages:
+        if not isinstance(message, ModelRequest):
+            continue
+        for part in message.parts:
+            if isinstance(part, ToolReturnPart) and part.tool_name == "get_most_similar_product":
+                return str(part.content)
+    return None
+
+
+def scripted_model(delay_seconds: float = 0.0, model_name: str = "scripted") -> FunctionModel:
+    """A local stand-in for the LLM that calls the ten tools in order, waiting `delay_seconds` before each step.
+
+    Deterministic and free, so the API can be load-tested without the model provider.
+    """
+
+    async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        if delay_seconds:
+            await asyncio.sleep(delay_seconds)
+        step = sum(isinstance(message, ModelResponse) for message in messages)
+        tool_name = TOOL_SEQUENCE[min(step, len(TOOL_SEQUENCE) - 1)]
+        if tool_name == "get_most_similar_product":
+            args = {"product_name": _query(messages)}
+        elif tool_name in ("fetch_product_data", "fetch_product_reviews"):
+            args = {"product_name": _resolved_product(messages)}
+        else:
+            args = {}
+        return ModelResponse(parts=[ToolCallPart(tool_name, args)], model_name=model_name)
+
+    return FunctionModel(respond, model_name=model_name)
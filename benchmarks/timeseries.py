@@ -0,0 +1,75 @@
+"""Ingest rate and range query latency of the time series store (src/catalog/timeseries.py).
+
+    python -m benchmarks.timeseries --series 1000 --days 180 --points-per-day 24
+
+Every series gets `--points-per-day` points over `--days` days, ingested in time order (as recordings arrive),
+then the 30 and 180 day aggregates and a 30 day range are queried for one series.
+
+Exits with status 1 when fewer than --min-points-per-minute points were ingested per minute.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from src.catalog.timeseries import TimeSeriesStore, price_series
+
+
+def _timed(function, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def run(series: int, days: int, points_per_day: int) -> dict[str, float]:
+    now = time.time()
+    step = 86400 / points_per_day
+    keys = [price_series(f"Product {index}", "Amazon") for index in range(series)]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TimeSeriesStore(os.path.join(tmp, "timeseries.db"))
+        started = time.perf_counter()
+        for point in range(days * points_per_day):
+            timestamp = now - days * 86400 + point * step
+            store.append_many((key, timestamp, 100.0 + point % 7) for key in keys)
+        store.flush()
+        ingest_seconds = time.perf_counter() - started
+        size = os.path.getsize(store.path)
+
+        points = series * days * points_per_day
+        return {
+            "points": points,
+            "points_per_minute": round(points / ingest_seconds * 60),
+            "bytes_per_point": round(size / points, 2),
+            "aggregate_30d_ms": round(_timed(lambda: store.aggregate(keys[:1], now - 30 * 86400, now)) * 1000, 3),
+            "aggregate_180d_ms": round(_timed(lambda: store.aggregate(keys[:1], now - 180 * 86400, now)) * 1000, 3),
+            "range_30d_ms": round(_timed(lambda: store.range(keys[0], now - 30 * 86400, now)) * 1000, 3),
+        }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure the ingest rate and query latency of the time series store.")
+    parser.add_argument("--series", type=int, default=1000, help="Number of series (e.g. product/retailer prices)")
+    parser.add_argument("--days", type=int, default=180, help="Days of history per series")
+    parser.add_argument("--points-per-day", type=int, default=24, help="Points per series and day")
+    parser.add_argument(
+        "--min-points-per-minute", type=int, default=1_000_000, help="Ingest rate below which the run fails (0 to disable)"
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.series, args.days, args.points_per_day)
+    print(json.dumps(results, indent=2))
+    if results["points_per_minute"] < args.min_points_per_minute:
+        print(f"REGRESSION ingest rate: {results['points_per_minute']:,} < {args.min_points_per_minute:,} points/min")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,40 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from pathlib import Path
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response
+from loguru import logger
 import uvicorn
 
-from src.api.routes import analysis, health
+from src.api.routes import analysis, health, usage
+from src.api.services.database_service import db_service
+from src.api.services.prewarm import prewarm_daily
+from src.api.services.warmup import start_warmup, warmup_state
+from src.catalog import DATA_DIR
+from src.catalog.snapshot import ensure_snapshot
 from src.config import settings
-from src.database.database import get_database_info
+from src.monitoring.tracing import configure_tracing
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Heavy dependencies load in the background; /health answers right away and /ready reports progress.
+    if settings.WARMUP_ON_STARTUP:
+        start_warmup()
+    else:
+        warmup_state.defer()
+    prewarming = None
+    if settings.PREWARM_AT and settings.API_WORKERS > 1:
+        # Every worker runs this lifespan, so each one would prewarm the same products.
+        logger.warning("PREWARM_AT is ignored with API_WORKERS > 1: schedule `poetry run prewarm-cache` with cron instead")
+    elif settings.PREWARM_AT:
+        prewarming = asyncio.create_task(prewarm_daily(db_service, settings.PREWARM_AT))
+    yield
+    if prewarming is not None:
+        prewarming.cancel()
+
 
 app = FastAPI(
     title="E-commerce Research Agent API",
@@ -13,6 +42,7 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -25,6 +55,9 @@ app.add_middleware(
 
 app.include_router(analysis.router)
 app.include_router(health.router)
+app.include_router(usage.router)
+
+configure_tracing(app)
 
 
 @app.get("/favicon.ico")
@@ -34,6 +67,8 @@ async def favicon():
 
 @app.get("/")
 async def root():
+    from src.database.database import get_database_info
+
     db_info = get_database_info()
     return {
         "message": "E-commerce Research Agent API",
@@ -42,11 +77,21 @@ async def root():
         "database": db_info["database_type"],
         "docs": "/docs",
         "health": "/health",
+        "ready": "/ready",
     }
 
 
 def start_server():
-    uvicorn.run("src.api.main:app", host=settings.API_HOST, port=settings.API_PORT, reload=settings.API_RELOAD)
+    if settings.API_WORKERS <= 1:
+        uvicorn.run("src.api.main:app", host=settings.API_HOST, port=settings.API_PORT, reload=settings.API_RELOAD)
+        return
+
+    # Parse the catalog once here; workers memory-map the snapshot and share its pages read-only.
+    snapshot_path = Path(settings.CATALOG_SNAPSHOT_PATH or DATA_DIR / "catalog.snapshot")
+    ensure_snapshot(DATA_DIR, snapshot_path)
+    os.environ["CATALOG_SNAPSHOT_PATH"] = str(snapshot_path)
+    logger.info(f"Starting {settings.API_WORKERS} workers sharing catalog snapshot {snapshot_path}")
+    uvicorn.run("src.api.main:app", host=settings.API_HOST, port=settings.API_PORT, workers=settings.API_WORKERS)
 
 
 if __name__ == "__main__":
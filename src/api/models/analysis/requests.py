@@ -1,5 +1,23 @@
+from enum import Enum
+
 from pydantic import BaseModel, Field
 
 
+class AnalysisPriority(str, Enum):
+    HIGH = "high"
+    NORMAL = "normal"
+    LOW = "low"
+
+
 class AnalysisRequest(BaseModel):
     query: str = Field(description="Product name or market to analyze", example="iPhone 15 Pro")
+    priority: AnalysisPriority = Field(
+        AnalysisPriority.NORMAL, description="high for interactive requests, low for bulk refreshes", example="high"
+    )
+
+
+class AnalysisBatchRequest(BaseModel):
+    queries: list[str] = Field(
+        description="Product names or markets to analyze", min_length=1, example=["iPhone 15 Pro", "MacBook Pro 14"]
+    )
+    priority: AnalysisPriority = Field(AnalysisPriority.LOW, description="Priority of every analysis of the batch", example="low")
@@ -12,7 +12,25 @@ class AnalysisStatus(str, Enum):
 class AnalysisResponse(BaseModel):
     analysis_id: str = Field(description="Unique identifier for the analysis", example="abc123")
     status: AnalysisStatus = Field(description="Current status of the analysis", example="completed")
+    product_name: str | None = Field(None, description="Catalog product the query resolved to", example="iPhone 15 Pro")
     created_at: datetime = Field(description="When the analysis was created", example="2024-01-01T12:00:00Z")
     completed_at: datetime | None = Field(None, description="When the analysis was completed", example="2024-01-01T12:05:00Z")
     report: str | None = Field(None, description="Report file path (only present when completed)", example="/path/to/report.html")
     error: str | None = Field(None, description="Error message (only present when failed)", example="Analysis not found")
+    input_tokens: int | None = Field(None, description="Input tokens sent to the model", example=48210)
+    output_tokens: int | None = Field(None, description="Output tokens generated by the model", example=1350)
+    model_requests: int | None = Field(None, description="Number of model requests", example=7)
+    model_latency_seconds: float | None = Field(None, description="Time spent waiting for the model", example=21.4)
+
+
+class AnalysisBatchResponse(BaseModel):
+    batch_id: str = Field(description="Unique identifier for the batch", example="def456")
+    total: int = Field(description="Number of analyses in the batch", example=100)
+    completed: int = Field(description="Number of completed analyses", example=40)
+    failed: int = Field(description="Number of failed analyses", example=1)
+    running: int = Field(description="Number of analyses queued or running", example=59)
+    created_at: datetime = Field(description="When the batch was created", example="2024-01-01T12:00:00Z")
+    completed_at: datetime | None = Field(None, description="When the last analysis finished", example="2024-01-01T12:30:00Z")
+    elapsed_seconds: float = Field(description="Time spent on the batch so far", example=120.5)
+    throughput_per_minute: float = Field(description="Finished analyses per minute", example=20.4)
+    analyses: list[AnalysisResponse] = Field(default_factory=list, description="Analyses created for the batch")
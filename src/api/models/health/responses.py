@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
+from typing import Any
 
 
 class HealthResponse(BaseModel):
@@ -9,6 +10,11 @@ class HealthResponse(BaseModel):
     services: dict[str, str] = Field(
         default_factory=dict, description="Status of individual services", example={"agent": "healthy", "database": "healthy"}
     )
+    metrics: dict[str, Any] = Field(
+        default_factory=dict,
+        description="Live load and latency figures",
+        example={"queue_depth": 0, "running_analyses": 2, "analysis_latency_seconds": {"p50": 41.2, "p95": 63.0, "p99": 80.4}},
+    )
 
     @model_validator(mode="after")
     def check_status(self):
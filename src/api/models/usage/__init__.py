@@ -0,0 +1,3 @@
+from src.api.models.usage.responses import AnalysisUsageResponse, StepUsageResponse, UsageReportResponse, UsageReportRow
+
+__all__ = ["AnalysisUsageResponse", "StepUsageResponse", "UsageReportResponse", "UsageReportRow"]
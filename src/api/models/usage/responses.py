@@ -0,0 +1,38 @@
+from pydantic import BaseModel, Field
+
+
+class StepUsageResponse(BaseModel):
+    requests: int = Field(description="Model requests that ended by calling this step's tool", example=1)
+    input_tokens: int = Field(description="Input tokens of those requests", example=9120)
+    output_tokens: int = Field(description="Output tokens of those requests", example=85)
+    model_latency_seconds: float = Field(description="Time spent waiting for the model", example=2.8)
+    tool_output_bytes: int = Field(description="Size of the tool output added to the conversation", example=5230)
+    model: str | None = Field(None, description="Model that answered the step", example="claude-3-5-haiku-20241022")
+    cost_usd: float = Field(description="Estimated cost of the step, at the rates of its model", example=0.028635)
+
+
+class AnalysisUsageResponse(BaseModel):
+    analysis_id: str = Field(description="Unique identifier for the analysis", example="abc123")
+    query: str = Field(description="Product name or market analyzed", example="iPhone 15 Pro")
+    input_tokens: int = Field(description="Input tokens sent to the model", example=48210)
+    output_tokens: int = Field(description="Output tokens generated by the model", example=1350)
+    model_requests: int = Field(description="Number of model requests", example=7)
+    model_latency_seconds: float = Field(description="Time spent waiting for the model", example=21.4)
+    cost_usd: float = Field(description="Estimated cost of the analysis", example=0.16488)
+    steps: dict[str, StepUsageResponse] = Field(default_factory=dict, description="Usage per step, keyed by tool name")
+
+
+class UsageReportRow(BaseModel):
+    key: str = Field(description="Day (YYYY-MM-DD) or product query", example="2024-01-01")
+    analyses: int = Field(description="Number of analyses", example=120)
+    input_tokens: int = Field(description="Input tokens sent to the model", example=5785200)
+    output_tokens: int = Field(description="Output tokens generated by the model", example=162000)
+    model_requests: int = Field(description="Number of model requests", example=840)
+    model_latency_seconds: float = Field(description="Time spent waiting for the model", example=2568.0)
+    cost_usd: float = Field(description="Estimated cost", example=19.7856)
+    steps: dict[str, StepUsageResponse] = Field(default_factory=dict, description="Usage per step, keyed by tool name")
+
+
+class UsageReportResponse(BaseModel):
+    group_by: str = Field(description="Grouping of the rows: day or product", example="day")
+    rows: list[UsageReportRow] = Field(default_factory=list, description="Usage per group")
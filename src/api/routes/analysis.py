@@ -1,32 +1,55 @@
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
-import uuid
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Header
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
+from pathlib import Path
 
-from src.api.models.analysis.requests import AnalysisRequest
-from src.api.models.analysis.responses import AnalysisResponse
+from src.api.models.analysis.requests import AnalysisBatchRequest, AnalysisRequest
+from src.api.models.analysis.responses import AnalysisBatchResponse, AnalysisResponse
 from src.api.models.analysis.responses import AnalysisStatus
-from src.api.services.research import run_analysis
+from src.api.services.research import cached_analysis, new_analysis, run_analysis
+from src.api.services.batch import batches, create_batch, run_batch, stored_batch
 from src.api.services.database_service import db_service
+from src.api.services.progress import TERMINAL_STEPS, format_sse, progress_broker
+from src.api.services.reports import (
+    IMMUTABLE_CACHE_CONTROL,
+    etag_matches,
+    negotiate_content_encoding,
+    render_report_file,
+    report_etag,
+    report_media_type,
+    report_version,
+)
+from src.config import settings
+from src.monitoring.profiling import should_profile
 
 router = APIRouter(prefix="/api/v1", tags=["analysis"])
 
 
 @router.post("/analyze", response_model=AnalysisResponse)
-async def start_analysis(request: AnalysisRequest, background_tasks: BackgroundTasks):
+async def start_analysis(
+    request: AnalysisRequest,
+    background_tasks: BackgroundTasks,
+    profile: bool = False,
+    x_profile: bool = Header(default=False),
+):
     try:
-        analysis_id = str(uuid.uuid4())
-        output = {
-            "analysis_id": analysis_id,
-            "query": request.query,
-            "status": AnalysisStatus.RUNNING,
-            "created_at": datetime.now(),
-            "completed_at": None,
-            "report": None,
-            "error": None,
-        }
+        # Resolving a vague query against a large catalog scores many names: keep it off the event loop.
+        output = await run_in_threadpool(new_analysis, request.query, datetime.now())
+        profiled = should_profile(profile or x_profile)
+        # A profile needs a run of its own.
+        if output["status"] == AnalysisStatus.RUNNING and not profiled:
+            output.update(cached_analysis(output["product_name"], db_service) or {})
         db_service.add_analysis(**output)
-        background_tasks.add_task(run_analysis, analysis_id, request.query, db_service)
+        if output["status"] == AnalysisStatus.RUNNING:
+            background_tasks.add_task(
+                run_analysis,
+                output["analysis_id"],
+                request.query,
+                db_service,
+                profile=profiled,
+                priority=request.priority,
+            )
         return AnalysisResponse(**output)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid request: {str(e)}")
@@ -35,23 +58,113 @@ async def start_analysis(request: AnalysisRequest, background_tasks: BackgroundT
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/analyze/batch", response_model=AnalysisBatchResponse)
+async def start_batch_analysis(request: AnalysisBatchRequest, background_tasks: BackgroundTasks):
+    if len(request.queries) > settings.BATCH_MAX_SIZE:
+        raise HTTPException(status_code=400, detail=f"Invalid request: a batch is limited to {settings.BATCH_MAX_SIZE} queries")
+    try:
+        batch = await run_in_threadpool(create_batch, request.queries, db_service, request.priority)
+        background_tasks.add_task(run_batch, batch, db_service)
+        return AnalysisBatchResponse(**batch.to_dict(), analyses=[AnalysisResponse(**analysis) for analysis in batch.analyses])
+    except Exception:
+        raise HTTPException(status_code=500, detail="Internal server error") from None
+
+
+@router.get("/analyze/batch/{batch_id}", response_model=AnalysisBatchResponse)
+async def get_batch_analysis(batch_id: str) -> AnalysisBatchResponse:
+    # Batches run by another worker (or before a restart) are read back from the database.
+    batch = batches.get(batch_id) or stored_batch(batch_id, db_service)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return AnalysisBatchResponse(**batch.to_dict())
+
+
 @router.get("/analyze/{analysis_id}")
-async def get_analysis(analysis_id: str) -> FileResponse:
+async def get_analysis(
+    analysis_id: str,
+    accept: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+    if_none_match: str | None = Header(default=None),
+) -> Response:
     try:
         data = db_service.get_analysis(analysis_id)
         if not data:
             raise HTTPException(status_code=404, detail="Analysis not found")
 
         if data["status"] == AnalysisStatus.COMPLETED and data["report"]:
-            return FileResponse(data["report"])
+            media_type = report_media_type(data["report"], accept)
+            if media_type is None:
+                raise HTTPException(status_code=406, detail="Supported formats: text/html, text/markdown, application/json")
+
+            encoding = negotiate_content_encoding(accept_encoding)
+            version = report_version(data["report"])
+            etag = report_etag(data["report"], version, media_type, encoding)
+            headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL, "Vary": "Accept, Accept-Encoding"}
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers=headers)
+
+            rendered = render_report_file(data["report"], media_type, version)
+            if encoding is not None:
+                headers["Content-Encoding"] = encoding
+            return Response(content=rendered.body(encoding), media_type=media_type, headers=headers)
+
+        if data["status"] == AnalysisStatus.FAILED:
+            return JSONResponse(AnalysisResponse(**data).model_dump(mode="json"), headers={"Cache-Control": "no-cache"})
 
-        return FileResponse("template/analysis_still_running.html")
+        return FileResponse("template/analysis_still_running.html", headers={"Cache-Control": "no-cache"})
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.get("/analyze/{analysis_id}/events")
+async def stream_analysis_events(analysis_id: str) -> StreamingResponse:
+    data = db_service.get_analysis(analysis_id)
+    if not data:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+
+    async def event_stream():
+        if data["status"] in TERMINAL_STEPS and not progress_broker.history(analysis_id):
+            outcome = {"report_path": data["report"], "error": data["error"]}
+            yield format_sse(
+                {"analysis_id": analysis_id, "step": data["status"], "timestamp": data["completed_at"], "data": outcome}
+            )
+            return
+
+        async for event in progress_broker.subscribe(analysis_id, heartbeat=settings.PROGRESS_HEARTBEAT_SECONDS):
+            if event is not None:
+                yield format_sse(event)
+                continue
+
+            # Nothing happened for a while: make sure the run is still alive (e.g. after a restart).
+            status = (db_service.get_analysis(analysis_id) or {}).get("status")
+            if status in TERMINAL_STEPS:
+                yield format_sse({"analysis_id": analysis_id, "step": status, "timestamp": None, "data": {}})
+                return
+            yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/analyze/{analysis_id}/profile")
+async def get_analysis_profile(analysis_id: str) -> PlainTextResponse:
+    data = db_service.get_analysis(analysis_id)
+    if not data:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    if not data["profile"] or not Path(data["profile"]).exists():
+        raise HTTPException(status_code=404, detail="Analysis was not profiled")
+    # Folded stacks, one "frame;frame;... samples" line each: flamegraph.pl, speedscope and inferno read them as is.
+    return PlainTextResponse(
+        Path(data["profile"]).read_text(),
+        headers={"Content-Disposition": f'attachment; filename="{analysis_id}.folded"'},
+    )
+
+
 @router.get("/analyze", response_model=list[AnalysisResponse])
 async def list_analyses() -> list[AnalysisResponse]:
     try:
@@ -65,6 +178,10 @@ async def list_analyses() -> list[AnalysisResponse]:
                     completed_at=data["completed_at"],
                     report=data["report"],
                     error=data["error"],
+                    input_tokens=data["input_tokens"],
+                    output_tokens=data["output_tokens"],
+                    model_requests=data["model_requests"],
+                    model_latency_seconds=data["model_latency_seconds"],
                 )
             )
         return analyses
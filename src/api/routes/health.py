@@ -1,13 +1,34 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
 from datetime import datetime
 
 from src.api.models.health import HealthResponse
+from src.api.services.database_service import db_service
+from src.api.services.warmup import READY_STATUSES, warmup_state
+from src.monitoring.metrics import live_metrics, registry
 
 router = APIRouter(tags=["health"])
 
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check() -> HealthResponse:
-    services_status = {"agent": "healthy", "api": "healthy"}
+    readiness = warmup_state.to_dict()
+    services_status = {
+        "api": "healthy",
+        "agent": "healthy" if readiness["components"]["agent"] in READY_STATUSES else readiness["components"]["agent"],
+        "catalog": "healthy" if readiness["components"]["catalog"] in READY_STATUSES else readiness["components"]["catalog"],
+        "database": "healthy" if db_service.ping() else "unhealthy",
+    }
 
-    return HealthResponse(timestamp=datetime.now(), version="0.1.0", services=services_status)
+    return HealthResponse(timestamp=datetime.now(), version="0.1.0", services=services_status, metrics=live_metrics())
+
+
+@router.get("/ready")
+async def readiness_check() -> JSONResponse:
+    readiness = warmup_state.to_dict()
+    return JSONResponse(content=readiness, status_code=200 if readiness["ready"] else 503)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.render_prometheus(), media_type="text/plain; version=0.0.4")
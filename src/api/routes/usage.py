@@ -0,0 +1,27 @@
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query
+
+from src.api.models.usage import AnalysisUsageResponse, UsageReportResponse
+from src.api.services.database_service import db_service
+from src.api.services.usage import analysis_usage, usage_report
+
+router = APIRouter(prefix="/api/v1", tags=["usage"])
+
+
+@router.get("/analyze/{analysis_id}/usage", response_model=AnalysisUsageResponse)
+async def get_analysis_usage(analysis_id: str) -> AnalysisUsageResponse:
+    data = db_service.get_analysis(analysis_id)
+    if not data:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    if data["model_requests"] is None:
+        raise HTTPException(status_code=404, detail="No usage recorded for this analysis yet")
+    return AnalysisUsageResponse(**analysis_usage(data))
+
+
+@router.get("/usage", response_model=UsageReportResponse)
+async def get_usage_report(
+    group_by: Literal["day", "product"] = Query("day", description="Aggregate per day or per product"),
+    days: int | None = Query(None, ge=1, description="Only include analyses from the last N days"),
+) -> UsageReportResponse:
+    return UsageReportResponse(group_by=group_by, rows=usage_report(db_service, group_by, days))
@@ -0,0 +1,174 @@
+import asyncio
+import time
+import uuid
+import weakref
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from loguru import logger
+
+from src.api.models.analysis.requests import AnalysisPriority
+from src.api.models.analysis.responses import AnalysisStatus
+from src.api.services.database_service import DatabaseService
+from src.api.services.progress import progress_broker
+from src.api.services.research import analysis_outcome, execute_analysis, generate_research_agent, new_analysis
+from src.api.services.scheduler import analysis_scheduler
+from src.config import settings
+from src.monitoring.metrics import analyses_queued
+
+_semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = weakref.WeakKeyDictionary()
+
+
+def batch_semaphore() -> asyncio.Semaphore:
+    # One limit shared by every batch running on the event loop, on top of the scheduler's limit for all analyses.
+    loop = asyncio.get_running_loop()
+    if loop not in _semaphores:
+        _semaphores[loop] = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+    return _semaphores[loop]
+
+
+@dataclass
+class BatchProgress:
+    batch_id: str
+    analyses: list[dict]
+    priority: AnalysisPriority = AnalysisPriority.LOW
+    created_at: datetime = field(default_factory=datetime.now)
+    completed_at: datetime | None = None
+    completed: int = 0
+    failed: int = 0
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+    _finished: float | None = field(default=None, repr=False)
+
+    @property
+    def total(self) -> int:
+        return len(self.analyses)
+
+    @property
+    def running(self) -> int:
+        return self.total - self.completed - self.failed
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return (self._finished or time.perf_counter()) - self._started
+
+    @property
+    def throughput_per_minute(self) -> float:
+        elapsed = self.elapsed_seconds
+        return round((self.completed + self.failed) / elapsed * 60, 2) if elapsed > 0 else 0.0
+
+    def record(self, status: AnalysisStatus) -> None:
+        if status == AnalysisStatus.FAILED:
+            self.failed += 1
+        else:
+            self.completed += 1
+        if self.running == 0:
+            self.completed_at = datetime.now()
+            self._finished = time.perf_counter()
+
+    def to_dict(self) -> dict:
+        return {
+            "batch_id": self.batch_id,
+            "total": self.total,
+            "completed": self.completed,
+            "failed": self.failed,
+            "running": self.running,
+            "created_at": self.created_at,
+            "completed_at": self.completed_at,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "throughput_per_minute": self.throughput_per_minute,
+        }
+
+
+# Batches running in this worker; finished ones are rebuilt from the database by stored_batch.
+batches: dict[str, BatchProgress] = {}
+
+
+def create_batch(
+    queries: list[str], db_service: DatabaseService, priority: AnalysisPriority = AnalysisPriority.LOW, prewarmed: bool = False
+) -> BatchProgress:
+    created_at = datetime.now()
+    batch_id = str(uuid.uuid4())
+    analyses = [{**new_analysis(query, created_at), "prewarmed": prewarmed, "batch_id": batch_id} for query in queries]
+    db_service.add_analyses(analyses)
+
+    batch = BatchProgress(batch_id=batch_id, analyses=analyses, priority=priority, created_at=created_at)
+    for analysis in analyses:
+        if analysis["status"] == AnalysisStatus.FAILED:
+            batch.record(AnalysisStatus.FAILED)
+    batches[batch.batch_id] = batch
+    return batch
+
+
+def stored_batch(batch_id: str, db_service: DatabaseService) -> BatchProgress | None:
+    """The progress of a batch rebuilt from its analysis_history rows, for batches run by another worker.
+
+    Results are written every BATCH_FLUSH_SIZE analyses, so the counts can trail those of the running worker.
+    """
+    analyses = db_service.get_batch_analyses(batch_id)
+    if not analyses:
+        return None
+
+    created_at = datetime.fromisoformat(str(analyses[0]["created_at"]))
+    batch = BatchProgress(batch_id=batch_id, analyses=analyses, created_at=created_at)
+    # Elapsed time is measured with perf_counter: start it where the wall clock says the batch started.
+    batch._started = time.perf_counter() - (datetime.now() - created_at).total_seconds()
+    for analysis in analyses:
+        if analysis["status"] != AnalysisStatus.RUNNING:
+            batch.record(AnalysisStatus(analysis["status"]))
+    if batch.running == 0:
+        batch.completed_at = max(datetime.fromisoformat(str(analysis["completed_at"])) for analysis in analyses)
+        batch._finished = batch._started + (batch.completed_at - created_at).total_seconds()
+    return batch
+
+
+async def run_batch(
+    batch: BatchProgress,
+    db_service: DatabaseService,
+    on_result: Callable[[BatchProgress, dict], None] | None = None,
+    concurrency: int | None = None,
+) -> BatchProgress:
+    # A single agent is shared by the whole batch; datasets are already loaded once per process.
+    agent = generate_research_agent()
+    semaphore = asyncio.Semaphore(concurrency) if concurrency else batch_semaphore()
+    pending_updates: list[dict] = []
+
+    def flush() -> None:
+        if pending_updates:
+            db_service.update_analyses(pending_updates)
+            pending_updates.clear()
+
+    async def run_one(analysis: dict) -> None:
+        with analyses_queued.track_inprogress(priority=batch.priority.value):
+            await semaphore.acquire()
+        try:
+            async with analysis_scheduler().slot(batch.priority):
+                result = await execute_analysis(analysis["analysis_id"], analysis["product_name"], agent)
+        finally:
+            semaphore.release()
+
+        outcome = analysis_outcome(analysis["analysis_id"], result)
+        analysis.update(outcome)
+        pending_updates.append(outcome)
+        if len(pending_updates) >= settings.BATCH_FLUSH_SIZE:
+            flush()
+
+        batch.record(outcome["status"])
+        progress_broker.publish(
+            analysis["analysis_id"], outcome["status"].value, report_path=outcome["report"], error=outcome["error"]
+        )
+        if on_result is not None:
+            on_result(batch, analysis)
+
+    logger.info(f"Running batch {batch.batch_id} with {batch.total} analyses")
+    try:
+        # Queries that matched no product were failed when the batch was created.
+        await asyncio.gather(*(run_one(analysis) for analysis in batch.analyses if analysis["status"] == AnalysisStatus.RUNNING))
+    finally:
+        flush()
+        batches.pop(batch.batch_id, None)
+    logger.info(
+        f"Batch {batch.batch_id} finished: {batch.completed} completed, {batch.failed} failed "
+        f"in {batch.elapsed_seconds:.1f}s ({batch.throughput_per_minute} analyses/min)"
+    )
+    return batch
@@ -1,6 +1,24 @@
 import sqlite3
+from datetime import datetime
 from typing import Optional
 
+from src.monitoring.metrics import db_operation_duration_seconds, timed
+
+# Columns added after the initial schema, applied to existing databases on startup.
+ADDED_COLUMNS = {
+    "input_tokens": "INTEGER",
+    "output_tokens": "INTEGER",
+    "model_requests": "INTEGER",
+    "model_latency_seconds": "REAL",
+    "usage_steps": "TEXT",
+    "profile": "TEXT",
+    "product_name": "TEXT",
+    "prewarmed": "INTEGER",
+    "cached_from": "TEXT",
+    "batch_id": "TEXT",
+}
+ANALYSIS_COLUMNS = "analysis_id, query, status, created_at, completed_at, report, error, " + ", ".join(ADDED_COLUMNS)
+
 
 class DatabaseService:
     def __init__(self, db_path: str = "ecommerce_research.db"):
@@ -25,16 +43,31 @@ class DatabaseService:
                 error TEXT
             )
         """)
+        existing = {row["name"] for row in conn.execute("PRAGMA table_info(analysis_history)")}
+        for column, column_type in ADDED_COLUMNS.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE analysis_history ADD COLUMN {column} {column_type}")
         conn.commit()
         conn.close()
 
+    @timed(db_operation_duration_seconds, operation="ping")
+    def ping(self) -> bool:
+        try:
+            conn = self._get_connection()
+            conn.execute("SELECT 1").fetchone()
+            conn.close()
+            return True
+        except sqlite3.Error:
+            return False
+
+    @timed(db_operation_duration_seconds, operation="add_analysis")
     def add_analysis(self, **kwargs) -> None:
         conn = self._get_connection()
         conn.execute(
             """
             INSERT INTO analysis_history 
-            (analysis_id, query, status, created_at, completed_at, report, error)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
+            (analysis_id, query, status, created_at, completed_at, report, error, product_name, prewarmed, cached_from, batch_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
             (
                 kwargs.get("analysis_id"),
@@ -44,16 +77,50 @@ class DatabaseService:
                 kwargs.get("completed_at"),
                 kwargs.get("report"),
                 kwargs.get("error"),
+                kwargs.get("product_name"),
+                kwargs.get("prewarmed"),
+                kwargs.get("cached_from"),
+                kwargs.get("batch_id"),
             ),
         )
         conn.commit()
         conn.close()
 
+    @timed(db_operation_duration_seconds, operation="add_analyses")
+    def add_analyses(self, analyses: list[dict]) -> None:
+        conn = self._get_connection()
+        conn.executemany(
+            """
+            INSERT INTO analysis_history 
+            (analysis_id, query, status, created_at, completed_at, report, error, product_name, prewarmed, cached_from, batch_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            [
+                (
+                    analysis.get("analysis_id"),
+                    analysis.get("query"),
+                    analysis.get("status"),
+                    analysis.get("created_at"),
+                    analysis.get("completed_at"),
+                    analysis.get("report"),
+                    analysis.get("error"),
+                    analysis.get("product_name"),
+                    analysis.get("prewarmed"),
+                    analysis.get("cached_from"),
+                    analysis.get("batch_id"),
+                )
+                for analysis in analyses
+            ],
+        )
+        conn.commit()
+        conn.close()
+
+    @timed(db_operation_duration_seconds, operation="get_analysis")
     def get_analysis(self, analysis_id: str) -> Optional[dict]:
         conn = self._get_connection()
         result = conn.execute(
-            """
-            SELECT analysis_id, query, status, created_at, completed_at, report, error
+            f"""
+            SELECT {ANALYSIS_COLUMNS}
             FROM analysis_history 
             WHERE analysis_id = ?
         """,
@@ -65,16 +132,88 @@ class DatabaseService:
             return dict(result)
         return None
 
+    @timed(db_operation_duration_seconds, operation="get_all_analyses")
     def get_all_analyses(self) -> list[dict]:
         conn = self._get_connection()
-        results = conn.execute("""
-            SELECT analysis_id, query, status, created_at, completed_at, report, error
+        results = conn.execute(f"""
+            SELECT {ANALYSIS_COLUMNS}
             FROM analysis_history 
             ORDER BY created_at DESC
         """).fetchall()
         conn.close()
         return [dict(row) for row in results]
 
+    @timed(db_operation_duration_seconds, operation="get_batch_analyses")
+    def get_batch_analyses(self, batch_id: str) -> list[dict]:
+        conn = self._get_connection()
+        results = conn.execute(
+            f"""
+            SELECT {ANALYSIS_COLUMNS}
+            FROM analysis_history
+            WHERE batch_id = ?
+        """,
+            (batch_id,),
+        ).fetchall()
+        conn.close()
+        return [dict(row) for row in results]
+
+    @timed(db_operation_duration_seconds, operation="get_usage_rows")
+    def get_usage_rows(self, since: datetime | None = None) -> list[dict]:
+        """Usage columns of every analysis that recorded them, optionally only those created after `since`."""
+        conn = self._get_connection()
+        results = conn.execute(
+            """
+            SELECT analysis_id, query, product_name, created_at,
+                input_tokens, output_tokens, model_requests, model_latency_seconds, usage_steps
+            FROM analysis_history
+            WHERE model_requests IS NOT NULL AND created_at >= ?
+        """,
+            (since or datetime.min,),
+        ).fetchall()
+        conn.close()
+        return [dict(row) for row in results]
+
+    @timed(db_operation_duration_seconds, operation="get_recent_analysis")
+    def get_recent_analysis(self, product_name: str, since: datetime) -> dict | None:
+        """The latest completed agent run for `product_name` created after `since`.
+
+        Rows that served a cached report are skipped: they are copies, and would otherwise extend the TTL of the
+        run they copied on every hit.
+        """
+        conn = self._get_connection()
+        result = conn.execute(
+            f"""
+            SELECT {ANALYSIS_COLUMNS}
+            FROM analysis_history
+            WHERE product_name = ? AND status = 'completed' AND report IS NOT NULL AND cached_from IS NULL
+                AND created_at >= ?
+            ORDER BY created_at DESC
+            LIMIT 1
+        """,
+            (product_name, since),
+        ).fetchone()
+        conn.close()
+        return dict(result) if result else None
+
+    @timed(db_operation_duration_seconds, operation="get_top_products")
+    def get_top_products(self, since: datetime, limit: int) -> list[tuple[str, int]]:
+        """The products requested most often since `since`, with their request counts; pre-warming runs don't count."""
+        conn = self._get_connection()
+        results = conn.execute(
+            """
+            SELECT product_name, COUNT(*) AS requests
+            FROM analysis_history
+            WHERE product_name IS NOT NULL AND prewarmed IS NOT 1 AND created_at >= ?
+            GROUP BY product_name
+            ORDER BY requests DESC, product_name
+            LIMIT ?
+        """,
+            (since, limit),
+        ).fetchall()
+        conn.close()
+        return [(row["product_name"], row["requests"]) for row in results]
+
+    @timed(db_operation_duration_seconds, operation="update_analysis")
     def update_analysis(self, analysis_id: str, **kwargs) -> None:
         conn = self._get_connection()
 
@@ -94,5 +233,18 @@ class DatabaseService:
 
         conn.close()
 
+    @timed(db_operation_duration_seconds, operation="update_analyses")
+    def update_analyses(self, updates: list[dict]) -> None:
+        """Apply many updates in one transaction; all updates must set the same columns."""
+        if not updates:
+            return
+
+        columns = [key for key in updates[0] if key != "analysis_id"]
+        query = f"UPDATE analysis_history SET {', '.join(f'{column} = ?' for column in columns)} WHERE analysis_id = ?"
+        conn = self._get_connection()
+        conn.executemany(query, [[update[column] for column in columns] + [update["analysis_id"]] for update in updates])
+        conn.commit()
+        conn.close()
+
 
 db_service = DatabaseService()
@@ -0,0 +1,46 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from loguru import logger
+
+from src.api.models.analysis.requests import AnalysisPriority
+from src.api.services.batch import BatchProgress, create_batch, run_batch
+from src.api.services.database_service import DatabaseService
+from src.config import settings
+
+
+def top_products(db_service: DatabaseService, limit: int, window_days: int) -> list[str]:
+    since = datetime.now() - timedelta(days=window_days)
+    return [product_name for product_name, _ in db_service.get_top_products(since, limit)]
+
+
+async def prewarm(db_service: DatabaseService, limit: int | None = None, window_days: int | None = None) -> BatchProgress | None:
+    """Analyse the most requested products of the last `window_days` again, so that the next requests for them are
+    answered from the analysis cache (ANALYSIS_CACHE_TTL_SECONDS).
+
+    The analyses run as a low priority batch: under the batch and scheduler limits, behind any interactive request.
+    """
+    products = top_products(db_service, limit or settings.PREWARM_TOP_PRODUCTS, window_days or settings.PREWARM_WINDOW_DAYS)
+    if not products:
+        logger.info("Nothing to pre-warm: no analyses were requested recently")
+        return None
+    batch = create_batch(products, db_service, AnalysisPriority.LOW, prewarmed=True)
+    logger.info(f"Pre-warming the {len(products)} most requested products in batch {batch.batch_id}")
+    return await run_batch(batch, db_service)
+
+
+def seconds_until(at: str, now: datetime) -> float:
+    hour, minute = (int(part) for part in at.split(":"))
+    next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if next_run <= now:
+        next_run += timedelta(days=1)
+    return (next_run - now).total_seconds()
+
+
+async def prewarm_daily(db_service: DatabaseService, at: str) -> None:
+    while True:
+        await asyncio.sleep(seconds_until(at, datetime.now()))
+        try:
+            await prewarm(db_service)
+        except Exception:
+            logger.exception("Pre-warming failed")
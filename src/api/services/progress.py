@@ -0,0 +1,82 @@
+import asyncio
+import contextlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any
+
+from src.config import settings
+
+TERMINAL_STEPS = {"completed", "failed"}
+
+
+class ProgressBroker:
+    """In-process fan-out of analysis progress events to streaming clients.
+
+    Sync tools run in worker threads, so `publish` hands events to each subscriber's loop thread-safely.
+    A bounded per-analysis history lets late subscribers catch up.
+    """
+
+    def __init__(self, history_size: int = 1000):
+        self.history_size = history_size
+        self._history: OrderedDict[str, list[dict[str, Any]]] = OrderedDict()
+        self._subscribers: dict[str, list[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, analysis_id: str, step: str, **data: Any) -> None:
+        event = {"analysis_id": analysis_id, "step": step, "timestamp": datetime.now().isoformat(), "data": data}
+        with self._lock:
+            self._history.setdefault(analysis_id, []).append(event)
+            self._history.move_to_end(analysis_id)
+            while len(self._history) > self.history_size:
+                self._history.popitem(last=False)
+            subscribers = list(self._subscribers.get(analysis_id, []))
+
+        for loop, queue in subscribers:
+            # A closed loop means the subscriber is going away; it unregisters itself when its generator exits.
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    def history(self, analysis_id: str) -> list[dict[str, Any]]:
+        with self._lock:
+            return list(self._history.get(analysis_id, []))
+
+    async def subscribe(self, analysis_id: str, heartbeat: float | None = None) -> AsyncIterator[dict[str, Any] | None]:
+        """Yield past and future events until a terminal one; yields None every `heartbeat` seconds of silence."""
+        queue: asyncio.Queue = asyncio.Queue()
+        subscriber = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            past_events = list(self._history.get(analysis_id, []))
+            self._subscribers.setdefault(analysis_id, []).append(subscriber)
+
+        try:
+            for event in past_events:
+                yield event
+                if event["step"] in TERMINAL_STEPS:
+                    return
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except TimeoutError:
+                    yield None
+                    continue
+                yield event
+                if event["step"] in TERMINAL_STEPS:
+                    return
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(analysis_id, [])
+                if subscriber in subscribers:
+                    subscribers.remove(subscriber)
+                if not subscribers:
+                    self._subscribers.pop(analysis_id, None)
+
+
+def format_sse(event: dict[str, Any]) -> str:
+    return f"event: {event['step']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+progress_broker = ProgressBroker(history_size=settings.PROGRESS_HISTORY_SIZE)
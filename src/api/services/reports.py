@@ -0,0 +1,144 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from src.config import settings
+from src.monitoring.metrics import registry
+from src.monitoring.tracing import span
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+REPORT_MEDIA_TYPES = {
+    "text/html": "html",
+    "text/markdown": "markdown",
+    "application/json": "json",
+}
+DEFAULT_MEDIA_TYPE = "text/html"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Bump whenever render_report's output changes (e.g. a new report section): ETags and cached renderings follow it.
+RENDERER_VERSION = 2
+
+
+@dataclass(frozen=True)
+class RenderedReport:
+    media_type: str
+    content: bytes
+    encoded_content: dict[str, bytes] = field(default_factory=dict)
+
+    def body(self, encoding: str | None) -> bytes:
+        if encoding is None:
+            return self.content
+        return self.encoded_content[encoding]
+
+
+def _parse_header_values(header: str) -> list[tuple[str, float]]:
+    values = []
+    for part in header.split(","):
+        value, *params = [item.strip() for item in part.split(";")]
+        quality = 1.0
+        for param in params:
+            key, _, raw_quality = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(raw_quality)
+                except ValueError:
+                    quality = 0.0
+        if value:
+            values.append((value.lower(), quality))
+    return values
+
+
+def negotiate_report_media_type(accept: str | None) -> str | None:
+    if not accept:
+        return DEFAULT_MEDIA_TYPE
+
+    candidates = [
+        (-quality, position, media_range)
+        for position, (media_range, quality) in enumerate(_parse_header_values(accept))
+        if quality > 0
+    ]
+    for _, _, media_range in sorted(candidates):
+        if media_range in REPORT_MEDIA_TYPES:
+            return media_range
+        if media_range in ("*/*", "text/*"):
+            return DEFAULT_MEDIA_TYPE
+        if media_range == "application/*":
+            return "application/json"
+    return None
+
+
+def supported_encodings() -> list[str]:
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate_content_encoding(accept_encoding: str | None) -> str | None:
+    if not accept_encoding:
+        return None
+
+    accepted = dict(_parse_header_values(accept_encoding))
+    for encoding in supported_encodings():
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+def is_structured_report(report_path: str) -> bool:
+    return report_path.endswith(".json")
+
+
+def report_media_type(report_path: str, accept: str | None) -> str | None:
+    if is_structured_report(report_path):
+        return negotiate_report_media_type(accept)
+    # Reports written before lazy rendering are served as-is.
+    return mimetypes.guess_type(report_path)[0] or DEFAULT_MEDIA_TYPE
+
+
+def report_version(report_path: str) -> str:
+    """Identifies the report file's content and its rendering without reading the file."""
+    stat = os.stat(report_path)
+    return f"{RENDERER_VERSION}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def report_etag(report_path: str, version: str, media_type: str, encoding: str | None = None) -> str:
+    digest = hashlib.sha256(f"{report_path}:{version}:{media_type}".encode()).hexdigest()[:32]
+    return f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+@lru_cache(maxsize=settings.REPORT_RENDER_CACHE_SIZE)
+def render_report_file(report_path: str, media_type: str, version: str) -> RenderedReport:
+    # `version` (see report_version) is only part of the cache key: a rewritten file or a new renderer is rendered again.
+    with span("render report", media_type=media_type) as current:
+        if is_structured_report(report_path):
+            from src.llm.tools.report_generator import render_report
+
+            with open(report_path, encoding="utf-8") as f:
+                report_data = json.load(f)
+            content = render_report(report_data, REPORT_MEDIA_TYPES[media_type]).encode("utf-8")
+        else:
+            with open(report_path, "rb") as f:
+                content = f.read()
+
+        # Compressed variants are built once per rendering and then served straight from the cache.
+        encoded_content = {"gzip": gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            encoded_content["br"] = brotli.compress(content)
+        if current is not None:
+            current.set_attribute("payload.output_bytes", len(content))
+    return RenderedReport(media_type=media_type, content=content, encoded_content=encoded_content)
+
+
+registry.register_cache("report_render", lambda: (render_report_file.cache_info().hits, render_report_file.cache_info().misses))
@@ -1,39 +1,165 @@
+from __future__ import annotations
+
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from functools import partial
+from typing import TYPE_CHECKING
 from loguru import logger
+from src.api.models.analysis.requests import AnalysisPriority
 from src.api.models.analysis.responses import AnalysisStatus
 from src.api.services.database_service import DatabaseService
-from src.llm.agent import generate_research_agent, ResearchContext
+from src.api.services.progress import progress_broker
+from src.api.services.scheduler import analysis_scheduler
+from src.api.services.usage import usage_columns
 from src.exceptions import ExitProgramException
+from src.config import settings
+from src.monitoring.metrics import analyses_running, analyses_unresolved_total, analysis_duration_seconds, registry
+from src.monitoring.profiling import profile_coroutine, save_profile
+from src.monitoring.tracing import record_usage, span
+
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
+
+
+def generate_research_agent(**kwargs) -> Agent:
+    # The agent stack (pydantic_ai, anthropic, MCP and the tools) is imported on first use so the API
+    # can start and answer /health without it; the startup warm-up usually loads it in the background.
+    from src.llm.agent import generate_research_agent as build_research_agent
+
+    return build_research_agent(**kwargs)
+
+
+def new_analysis(query: str, created_at: datetime) -> dict:
+    """The analysis_history row of a new analysis, with the catalog product its query resolves to.
+
+    Queries matching no product are failed at once rather than queued: the agent would spend several model
+    requests before reporting an unknown product.
+    """
+    # Imported on first use, like the agent stack: the fuzzy matcher is not needed to start the API.
+    from src.catalog import get_catalog
+    from src.catalog.resolver import resolve_product
+
+    match = resolve_product(query, get_catalog())
+    if match is None:
+        analyses_unresolved_total.inc()
+    return {
+        "analysis_id": str(uuid.uuid4()),
+        "query": query,
+        "product_name": match.name if match else None,
+        "status": AnalysisStatus.RUNNING if match else AnalysisStatus.FAILED,
+        "created_at": created_at,
+        "completed_at": None if match else created_at,
+        "report": None,
+        "error": None if match else f"Product not found: no catalog product matches '{query}'",
+    }
+
+
+_cache_stats: Counter[str] = Counter()
+registry.register_cache("analysis_results", lambda: (_cache_stats["hits"], _cache_stats["misses"]))
+
 
+def cached_analysis(product_name: str, db_service: DatabaseService) -> dict | None:
+    """The outcome of a completed analysis of the product younger than ANALYSIS_CACHE_TTL_SECONDS, if any."""
+    if settings.ANALYSIS_CACHE_TTL_SECONDS <= 0:
+        return None
+    now = datetime.now()
+    recent = db_service.get_recent_analysis(product_name, now - timedelta(seconds=settings.ANALYSIS_CACHE_TTL_SECONDS))
+    _cache_stats["hits" if recent else "misses"] += 1
+    if recent is None:
+        return None
+    return {
+        "status": AnalysisStatus.COMPLETED,
+        "completed_at": now,
+        "report": recent["report"],
+        "cached_from": recent["analysis_id"],
+    }
 
-async def run_analysis(analysis_id: str, query: str, db_service: DatabaseService) -> dict:
+
+async def execute_analysis(analysis_id: str, product_name: str, agent: Agent | None = None) -> dict:
+    from pydantic_ai.usage import RunUsage
+
+    from src.llm.agent import ResearchContext
+    from src.llm.usage import track_usage
+
+    agent = agent or generate_research_agent()
+    research_context = ResearchContext(progress_callback=partial(progress_broker.publish, analysis_id))
+    progress_broker.publish(analysis_id, "started", query=product_name)
+
+    # Passed in rather than read from the result: runs end by raising ExitProgramException, so there is no result.
+    usage = RunUsage()
+    error = None
+    with (
+        analyses_running.track_inprogress(),
+        analysis_duration_seconds.time(),
+        span("analysis", analysis_id=analysis_id, query=product_name) as current,
+        track_usage() as recorder,
+    ):
+        try:
+            logger.info(f"Running analysis for product '{product_name}'")
+            _ = await agent.run(
+                f"conduct a comprehensive analysis for the product '{product_name}'", deps=research_context, usage=usage
+            )
+        except ExitProgramException:
+            logger.info("Analysis Finished")
+        except Exception as e:
+            logger.exception(f"Analysis {analysis_id} failed")
+            error = str(e)
+        record_usage(current, usage)
+
+    result = research_context.to_dict()
+    result["error"] = error
+    result["usage"] = recorder.to_dict()
+    logger.info(f"Report path: {result.get('report_path')}")
+    return result
+
+
+def analysis_outcome(analysis_id: str, result: dict) -> dict:
+    status = AnalysisStatus.FAILED if result.get("error") else AnalysisStatus.COMPLETED
+    return {
+        "analysis_id": analysis_id,
+        "status": status,
+        "completed_at": datetime.now(),
+        "report": result.get("report_path"),
+        "error": result.get("error"),
+        **usage_columns(result.get("usage")),
+    }
+
+
+async def run_analysis(
+    analysis_id: str,
+    query: str,
+    db_service: DatabaseService,
+    agent: Agent | None = None,
+    profile: bool = False,
+    priority: AnalysisPriority = AnalysisPriority.NORMAL,
+) -> dict:
     data = db_service.get_analysis(analysis_id)
     if not data:
         logger.error(f"Analysis {analysis_id} not found in database")
         return {"error": "Analysis not found"}
 
-    product_name = query
+    # Resolved against the catalog when the analysis was created.
+    product_name = data.get("product_name") or query
     status = data["status"]
     if status == AnalysisStatus.COMPLETED or status == AnalysisStatus.FAILED:
         return data
 
     db_service.update_analysis(analysis_id, status=AnalysisStatus.RUNNING)
 
-    logger.info(f"Running analysis for product '{product_name}'")
-    agent = generate_research_agent()
-    research_context = ResearchContext()
-    try:
-        logger.info(f"Running analysis for product '{product_name}'")
-        _ = await agent.run(f"conduct a comprehensive analysis for the product '{product_name}'", deps=research_context)
-    except ExitProgramException:
-        logger.info("Analysis Finished")
-    finally:
-        from datetime import datetime
-
-        result = research_context.to_dict()
-        report_path = result.get("report_path")
-        logger.info(f"Report path: {report_path}")
-
-        db_service.update_analysis(analysis_id, status=AnalysisStatus.COMPLETED, completed_at=datetime.now(), report=report_path)
-        logger.info(f"Database updated for analysis {analysis_id}")
-
-        return result
+    async with analysis_scheduler().slot(priority):
+        if profile:
+            result, profiler = await profile_coroutine(
+                execute_analysis(analysis_id, product_name, agent), settings.PROFILE_INTERVAL_SECONDS
+            )
+        else:
+            result = await execute_analysis(analysis_id, product_name, agent)
+
+    outcome = analysis_outcome(analysis_id, result)
+    if profile:
+        outcome["profile"] = save_profile(analysis_id, profiler)
+    db_service.update_analysis(**outcome)
+    logger.info(f"Database updated for analysis {analysis_id}")
+    progress_broker.publish(analysis_id, outcome["status"].value, report_path=outcome["report"], error=outcome["error"])
+
+    return result
@@ -0,0 +1,92 @@
+import asyncio
+import time
+import weakref
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from src.api.models.analysis.requests import AnalysisPriority
+from src.config import settings
+from src.monitoring.metrics import analyses_queued, analysis_queue_wait_seconds
+
+
+def parse_priority_weights(value: str) -> dict[AnalysisPriority, float]:
+    """Parse "high:8,normal:4,low:1"; classes left out get a weight of 1."""
+    weights = {priority: 1.0 for priority in AnalysisPriority}
+    for item in filter(None, (item.strip() for item in value.split(","))):
+        name, weight = item.split(":")
+        weights[AnalysisPriority(name.strip())] = float(weight)
+    return weights
+
+
+class AnalysisScheduler:
+    """Runs at most `max_concurrency` analyses at a time and hands free slots out by weighted fair queuing.
+
+    While several priority classes are waiting, each gets slots in proportion to its weight (with the defaults,
+    8 high and 4 normal analyses start for every low one), so interactive requests overtake bulk work without
+    starving it. A class that was idle starts level with the others instead of with the credit of its idle time.
+    """
+
+    def __init__(self, max_concurrency: int, weights: dict[AnalysisPriority, float]):
+        self.max_concurrency = max_concurrency
+        self.weights = weights
+        self.running = 0
+        self._waiting: dict[AnalysisPriority, deque[asyncio.Future]] = {priority: deque() for priority in AnalysisPriority}
+        self._passes = {priority: 0.0 for priority in AnalysisPriority}
+        self._virtual_time = 0.0
+
+    @asynccontextmanager
+    async def slot(self, priority: AnalysisPriority) -> AsyncIterator[None]:
+        queued = time.perf_counter()
+        if self.running < self.max_concurrency and not any(self._waiting.values()):
+            self.running += 1
+        else:
+            await self._wait(priority)
+        analysis_queue_wait_seconds.observe(time.perf_counter() - queued, priority=priority.value)
+        try:
+            yield
+        finally:
+            self.running -= 1
+            self._grant()
+
+    async def _wait(self, priority: AnalysisPriority) -> None:
+        if not self._waiting[priority]:
+            self._passes[priority] = max(self._passes[priority], self._virtual_time)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[priority].append(future)
+        try:
+            with analyses_queued.track_inprogress(priority=priority.value):
+                await future
+        except asyncio.CancelledError:
+            if future.cancelled():
+                self._waiting[priority].remove(future)
+            else:
+                # Cancelled after being handed a slot: pass it on.
+                self.running -= 1
+                self._grant()
+            raise
+
+    def _grant(self) -> None:
+        while self.running < self.max_concurrency:
+            waiting = [priority for priority in AnalysisPriority if self._waiting[priority]]
+            if not waiting:
+                return
+            # Earliest virtual finish time first; ties go to the higher priority, listed first.
+            priority = min(waiting, key=lambda priority: self._passes[priority] + 1 / self.weights[priority])
+            self._virtual_time = self._passes[priority]
+            self._passes[priority] += 1 / self.weights[priority]
+            self.running += 1
+            self._waiting[priority].popleft().set_result(None)
+
+
+_schedulers: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AnalysisScheduler] = weakref.WeakKeyDictionary()
+
+
+def analysis_scheduler() -> AnalysisScheduler:
+    # One scheduler shared by every analysis running on the event loop, single or batched.
+    loop = asyncio.get_running_loop()
+    if loop not in _schedulers:
+        _schedulers[loop] = AnalysisScheduler(
+            settings.ANALYSIS_MAX_CONCURRENCY, parse_priority_weights(settings.ANALYSIS_PRIORITY_WEIGHTS)
+        )
+    return _schedulers[loop]
@@ -0,0 +1,98 @@
+import json
+from datetime import datetime, timedelta
+from typing import Any
+
+from src.api.services.database_service import DatabaseService
+from src.llm.pricing import cost_usd
+
+TOTAL_KEYS = ("input_tokens", "output_tokens", "model_requests", "model_latency_seconds")
+STEP_KEYS = ("requests", "input_tokens", "output_tokens", "model_latency_seconds", "tool_output_bytes", "cost_usd")
+USAGE_GROUPS = {"day": lambda row: str(row["created_at"])[:10], "product": lambda row: row["product_name"] or row["query"]}
+
+
+def step_cost_usd(usage: dict[str, Any]) -> float:
+    # Steps recorded before per-model pricing carry no cost: they are priced at the large model's rates.
+    if usage.get("cost_usd") is not None:
+        return usage["cost_usd"]
+    return cost_usd(usage["input_tokens"], usage["output_tokens"], usage.get("model"))
+
+
+def total_cost_usd(usage: dict[str, Any], steps: dict[str, dict[str, Any]]) -> float:
+    if not steps:
+        return cost_usd(usage["input_tokens"], usage["output_tokens"])
+    return round(sum(step["cost_usd"] for step in steps.values()), 6)
+
+
+def usage_columns(usage: dict[str, Any] | None) -> dict[str, Any]:
+    """The analysis_history columns for a UsageRecorder.to_dict(), all None when nothing was recorded."""
+    if not usage:
+        return {
+            "input_tokens": None,
+            "output_tokens": None,
+            "model_requests": None,
+            "model_latency_seconds": None,
+            "usage_steps": None,
+        }
+    return {
+        "input_tokens": usage["input_tokens"],
+        "output_tokens": usage["output_tokens"],
+        "model_requests": usage["model_requests"],
+        "model_latency_seconds": usage["model_latency_seconds"],
+        "usage_steps": json.dumps(usage["steps"]),
+    }
+
+
+def with_costs(steps: dict[str, dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    return {step: {**usage, "cost_usd": round(step_cost_usd(usage), 6)} for step, usage in steps.items()}
+
+
+def analysis_usage(data: dict[str, Any]) -> dict[str, Any]:
+    """Usage of one analysis_history row, with estimated costs."""
+    steps = with_costs(json.loads(data["usage_steps"] or "{}"))
+    return {
+        "analysis_id": data["analysis_id"],
+        "query": data["query"],
+        "input_tokens": data["input_tokens"],
+        "output_tokens": data["output_tokens"],
+        "model_requests": data["model_requests"],
+        "model_latency_seconds": data["model_latency_seconds"],
+        "cost_usd": total_cost_usd(data, steps),
+        "steps": steps,
+    }
+
+
+def _accumulate(total: dict[str, Any], usage: dict[str, Any], keys: tuple[str, ...]) -> None:
+    for key in keys:
+        total[key] = total.get(key, 0) + (usage.get(key) or 0)
+
+
+def usage_report(db_service: DatabaseService, group_by: str, days: int | None = None) -> list[dict[str, Any]]:
+    """Token usage and estimated cost per day or per product, with the breakdown per step.
+
+    Days are listed most recent first; products most expensive first.
+    """
+    since = datetime.now() - timedelta(days=days) if days else None
+    group_key = USAGE_GROUPS[group_by]
+    groups: dict[str, dict[str, Any]] = {}
+    for row in db_service.get_usage_rows(since):
+        group = groups.setdefault(group_key(row), {"key": group_key(row), "analyses": 0, "steps": {}})
+        group["analyses"] += 1
+        _accumulate(group, row, TOTAL_KEYS)
+        steps = with_costs(json.loads(row["usage_steps"] or "{}"))
+        _accumulate(group, {"cost_usd": total_cost_usd(row, steps)}, ("cost_usd",))
+        for step, step_usage in steps.items():
+            total = group["steps"].setdefault(step, {"model": step_usage.get("model")})
+            # A step answered by different models over the period has no single model.
+            if total["model"] != step_usage.get("model"):
+                total["model"] = None
+            _accumulate(total, step_usage, STEP_KEYS)
+
+    rows = []
+    for group in groups.values():
+        for usage in (group, *group["steps"].values()):
+            usage["model_latency_seconds"] = round(usage["model_latency_seconds"], 3)
+            usage["cost_usd"] = round(usage["cost_usd"], 6)
+        rows.append(group)
+    if group_by == "day":
+        return sorted(rows, key=lambda row: row["key"], reverse=True)
+    return sorted(rows, key=lambda row: row["cost_usd"], reverse=True)
@@ -0,0 +1,79 @@
+import threading
+import time
+from collections.abc import Callable
+
+from loguru import logger
+
+from src.monitoring.metrics import component_loaded
+
+
+def _load_catalog() -> None:
+    from src.catalog import get_catalog
+    from src.catalog.resolver import product_index
+    from src.catalog.similarity import similarity_index
+
+    catalog = get_catalog()
+    product_index(catalog)
+    similarity_index(catalog)
+
+
+def _load_agent() -> None:
+    from src.api.services.research import generate_research_agent
+
+    generate_research_agent()
+
+
+WARMUP_STEPS: dict[str, Callable[[], None]] = {"catalog": _load_catalog, "agent": _load_agent}
+# "lazy": warm-up is disabled and the component loads on the first request that needs it.
+READY_STATUSES = {"ready", "lazy"}
+
+
+class WarmupState:
+    def __init__(self, components: list[str]):
+        self._lock = threading.Lock()
+        self.durations: dict[str, float] = {}
+        self.components: dict[str, str] = {}
+        for component in components:
+            self.set(component, "pending")
+
+    def set(self, component: str, status: str, duration: float | None = None) -> None:
+        with self._lock:
+            self.components[component] = status
+            component_loaded.set(1 if status == "ready" else 0, component=component)
+            if duration is not None:
+                self.durations[component] = round(duration, 3)
+
+    def defer(self) -> None:
+        for component in list(self.components):
+            self.set(component, "lazy")
+
+    @property
+    def is_ready(self) -> bool:
+        return all(status in READY_STATUSES for status in self.components.values())
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {"ready": self.is_ready, "components": dict(self.components), "durations_seconds": dict(self.durations)}
+
+
+warmup_state = WarmupState(list(WARMUP_STEPS))
+
+
+def warm_up() -> None:
+    for component, load in WARMUP_STEPS.items():
+        warmup_state.set(component, "loading")
+        started = time.perf_counter()
+        try:
+            load()
+        except Exception:
+            logger.exception(f"Warm-up of {component} failed")
+            warmup_state.set(component, "failed", time.perf_counter() - started)
+            continue
+        warmup_state.set(component, "ready", time.perf_counter() - started)
+        logger.info(f"Warm-up of {component} done in {warmup_state.durations[component]}s")
+
+
+def start_warmup() -> threading.Thread:
+    thread = threading.Thread(target=warm_up, name="warmup", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,3 @@
+from src.catalog.catalog import DATA_DIR, Catalog, get_catalog
+
+__all__ = ["DATA_DIR", "Catalog", "get_catalog"]
@@ -0,0 +1,79 @@
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from src.catalog.rollups import build_category_trends
+from src.catalog.snapshot import INLINE_SECTIONS, KEYED_SECTIONS, CatalogSnapshot
+from src.config import settings
+from src.monitoring.metrics import registry
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+
+
+def _load_json(path: Path, default: Any) -> Any:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+
+@dataclass(frozen=True)
+class Catalog:
+    products: Mapping[str, dict[str, Any]]
+    reviews: Mapping[str, list[dict[str, Any]]]
+    market_trends: Mapping[str, dict[str, Any]]
+    retailers: list[str]
+    retailer_config: dict[str, Any]
+    market_data: dict[str, Any]
+    # Aggregates of market_trends per category (see src/catalog/rollups.py).
+    category_trends: Mapping[str, dict[str, Any]] = field(default_factory=dict)
+    # Similarity vectors of the products and their postings, built with snapshots (see src/catalog/vectors.py).
+    product_vectors: Mapping[str, dict[str, float]] = field(default_factory=dict)
+    feature_postings: Mapping[str, list[list[Any]]] = field(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, data_dir: Path = DATA_DIR) -> "Catalog":
+        data_dir = Path(data_dir)
+        products = _load_json(data_dir / KEYED_SECTIONS["products"], [])
+        market_trends = _load_json(data_dir / KEYED_SECTIONS["market_trends"], {})
+        return cls(
+            products={product["name"]: product for product in products},
+            reviews=_load_json(data_dir / KEYED_SECTIONS["reviews"], {}),
+            market_trends=market_trends,
+            retailers=_load_json(data_dir / INLINE_SECTIONS["retailers"], []),
+            retailer_config=_load_json(data_dir / INLINE_SECTIONS["retailer_config"], {}),
+            market_data=_load_json(data_dir / INLINE_SECTIONS["market_data"], {}),
+            category_trends=build_category_trends(market_trends.values()),
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot_path: Path) -> "Catalog":
+        snapshot = CatalogSnapshot(snapshot_path)
+        for name, section in snapshot.sections.items():
+            registry.register_cache(f"catalog_{name}", section.cache_stats)
+        return cls(
+            products=snapshot.sections["products"],
+            reviews=snapshot.sections["reviews"],
+            market_trends=snapshot.sections["market_trends"],
+            retailers=snapshot.inline["retailers"] or [],
+            retailer_config=snapshot.inline["retailer_config"],
+            market_data=snapshot.inline["market_data"],
+            category_trends=snapshot.header["category_trends"],
+            product_vectors=snapshot.sections["product_vectors"],
+            feature_postings=snapshot.sections["feature_postings"],
+        )
+
+
+@cache
+def get_catalog() -> Catalog:
+    if settings.CATALOG_SNAPSHOT_PATH and Path(settings.CATALOG_SNAPSHOT_PATH).exists():
+        logger.info(f"Mapping catalog snapshot {settings.CATALOG_SNAPSHOT_PATH}")
+        return Catalog.from_snapshot(Path(settings.CATALOG_SNAPSHOT_PATH))
+    logger.info(f"Loading catalog from {DATA_DIR}")
+    return Catalog.from_json(DATA_DIR)
@@ -0,0 +1,86 @@
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+
+from fuzzywuzzy import fuzz
+
+from src.catalog.catalog import Catalog
+from src.config import settings
+from src.monitoring.metrics import registry
+
+# Products scored with the fuzzy matcher per query, out of those sharing the query's rarest words.
+CANDIDATES = 50
+
+
+def tokenize(text: str) -> list[str]:
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+@dataclass(frozen=True)
+class ProductMatch:
+    name: str
+    score: int
+
+
+class ProductIndex:
+    """Product names by word, so that a query is only scored against the products that share its words.
+
+    Candidates are ranked by the inverse document frequency of the words they share with the query ("s24"
+    narrows the catalog down more than "pro"), and the best CANDIDATES are scored with fuzz.WRatio, which
+    also credits partial names ("galaxy s24" for "Samsung Galaxy S24 Ultra").
+    """
+
+    def __init__(self, names: list[str], cache_size: int = 4096):
+        self.product_count = len(names)
+        self.postings: dict[str, list[str]] = defaultdict(list)
+        for name in names:
+            for token in set(tokenize(name)):
+                self.postings[token].append(name)
+        self.best_match = lru_cache(maxsize=cache_size)(self._best_match)
+
+    def candidates(self, query: str, limit: int = CANDIDATES) -> list[str]:
+        weights: Counter[str] = Counter()
+        for token in set(tokenize(query)):
+            names = self.postings.get(token, [])
+            idf = math.log(1 + self.product_count / len(names)) if names else 0.0
+            for name in names:
+                weights[name] += idf
+        return [name for name, _ in weights.most_common(limit)]
+
+    def _best_match(self, query: str) -> ProductMatch | None:
+        scored = [ProductMatch(name, fuzz.WRatio(query, name)) for name in self.candidates(query)]
+        return max(scored, key=lambda match: match.score, default=None)
+
+    def resolve(self, query: str, threshold: int) -> ProductMatch | None:
+        """The best matching product, or None when no product scores at least `threshold` (out of 100)."""
+        # Queries differing only by case or punctuation share a cache entry.
+        match = self.best_match(" ".join(tokenize(query)))
+        return match if match is not None and match.score >= threshold else None
+
+    def cache_stats(self) -> tuple[int, int]:
+        info = self.best_match.cache_info()
+        return info.hits, info.misses
+
+
+_index: tuple[Catalog, ProductIndex] | None = None
+_index_lock = threading.Lock()
+
+
+def product_index(catalog: Catalog) -> ProductIndex:
+    # Built once per catalog (the first time a query is resolved, or at warm-up).
+    global _index
+    if _index is None or _index[0] is not catalog:
+        # Concurrent first queries (tool threads, warm-up) wait for one build instead of each running their own.
+        with _index_lock:
+            if _index is None or _index[0] is not catalog:
+                index = ProductIndex(list(catalog.products), settings.PRODUCT_RESOLUTION_CACHE_SIZE)
+                registry.register_cache("product_resolution", index.cache_stats)
+                _index = (catalog, index)
+    return _index[1]
+
+
+def resolve_product(query: str, catalog: Catalog) -> ProductMatch | None:
+    return product_index(catalog).resolve(query, settings.PRODUCT_MATCH_THRESHOLD)
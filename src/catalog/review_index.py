@@ -0,0 +1,153 @@
+import heapq
+import math
+import re
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from collections.abc import Sequence
+from typing import Any
+
+from src.catalog.catalog import Catalog
+from src.config import settings
+from src.monitoring.metrics import registry
+
+# Words searched for each aspect analysts ask about; other aspects are searched by their own words.
+ASPECTS = {
+    "battery": ("battery", "charge", "charging", "charger"),
+    "camera": ("camera", "photo", "photos", "picture", "pictures", "lens", "video"),
+    "price": ("price", "priced", "overpriced", "expensive", "cheap", "value", "cost", "money"),
+    "screen": ("screen", "display", "brightness", "resolution"),
+    "sound": ("sound", "audio", "speaker", "speakers", "bass", "noise"),
+    "build quality": ("build", "design", "premium", "titanium", "durable", "quality"),
+    "performance": ("performance", "fast", "slow", "lag", "speed", "processor", "chip"),
+    "software": ("software", "update", "updates", "app", "apps", "bug", "bugs"),
+    "shipping": ("shipping", "delivery", "delivered", "arrived", "package"),
+    "support": ("support", "warranty", "service"),
+}
+SNIPPET_CHARS = 160
+# BM25 term frequency saturation and length normalization.
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def aspect_terms(aspect: str) -> tuple[str, ...]:
+    return ASPECTS.get(aspect.strip().lower()) or tuple(tokenize(aspect))
+
+
+def snippet(text: str, terms: Sequence[str], size: int = SNIPPET_CHARS) -> str:
+    """The part of `text` around its first occurrence of one of `terms`, at most `size` characters."""
+    if len(text) <= size:
+        return text
+    match = re.search(r"\b(" + "|".join(map(re.escape, terms)) + r")\b", text, re.IGNORECASE)
+    start = max(0, (match.start() if match else 0) - size // 3)
+    start = text.rfind(" ", 0, start) + 1 if start else 0
+    end = min(len(text), start + size)
+    return ("…" if start else "") + text[start:end].strip() + ("…" if end < len(text) else "")
+
+
+class ReviewIndex:
+    """Inverted index of the review texts of one product, scored with BM25.
+
+    Reviews are added incrementally: only the postings of the new reviews are appended, and the
+    collection statistics BM25 needs (document count, average length) are running totals.
+    """
+
+    def __init__(self):
+        self.reviews: list[dict[str, Any]] = []
+        self.lengths: list[int] = []
+        self.total_length = 0
+        self.postings: dict[str, list[tuple[int, int]]] = defaultdict(list)
+
+    def add(self, reviews: Sequence[dict[str, Any]]) -> None:
+        for review in reviews:
+            tokens = tokenize(review.get("review_text") or "")
+            document = len(self.reviews)
+            self.reviews.append(review)
+            self.lengths.append(len(tokens))
+            self.total_length += len(tokens)
+            for term, frequency in Counter(tokens).items():
+                self.postings[term].append((document, frequency))
+
+    def scores(self, terms: Sequence[str]) -> dict[int, float]:
+        """BM25 score of every review containing at least one of `terms`."""
+        count = len(self.reviews)
+        average_length = self.total_length / count if count else 0.0
+        scores: dict[int, float] = defaultdict(float)
+        for term in set(terms):
+            postings = self.postings.get(term, [])
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for document, frequency in postings:
+                norm = K1 * (1 - B + B * self.lengths[document] / average_length) if average_length else K1
+                scores[document] += idf * frequency * (K1 + 1) / (frequency + norm)
+        return scores
+
+    def aspect(self, aspect: str, limit: int) -> dict[str, Any]:
+        """Mentions of `aspect` (count, share, average rating and sentiment of the matching reviews) and its
+        `limit` best matching snippets."""
+        terms = aspect_terms(aspect)
+        scores = self.scores(terms)
+        matches = [self.reviews[document] for document in scores]
+        top = heapq.nlargest(limit, scores, key=lambda document: (scores[document], self.reviews[document].get("helpful_votes", 0)))
+        return {
+            "mentions": len(matches),
+            "share_percent": round(len(matches) / len(self.reviews) * 100, 1) if self.reviews else 0.0,
+            "average_rating": round(sum(review.get("rating", 0) for review in matches) / len(matches), 1) if matches else None,
+            "sentiment": dict(Counter(review.get("sentiment", "neutral") for review in matches)),
+            "snippets": [
+                {
+                    "text": snippet(self.reviews[document].get("review_text", ""), terms),
+                    "rating": self.reviews[document].get("rating"),
+                    "sentiment": self.reviews[document].get("sentiment"),
+                    "score": round(scores[document], 3),
+                }
+                for document in top
+            ],
+        }
+
+
+class ReviewSearch:
+    """The review indexes of the most recently searched products (least recently used evicted first)."""
+
+    def __init__(self, cache_size: int = 256):
+        self.cache_size = cache_size
+        self._indexes: OrderedDict[str, tuple[ReviewIndex, threading.Lock]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def index(self, product_name: str, reviews: Sequence[dict[str, Any]]) -> ReviewIndex:
+        """The index of the product's reviews, indexing only those it has not seen yet."""
+        with self._lock:
+            entry = self._indexes.get(product_name)
+            if entry is None:
+                self.misses += 1
+                entry = self._indexes[product_name] = (ReviewIndex(), threading.Lock())
+                while len(self._indexes) > self.cache_size:
+                    self._indexes.popitem(last=False)
+            else:
+                self.hits += 1
+                self._indexes.move_to_end(product_name)
+        index, lock = entry
+        # Indexing holds only the product's lock, so that searches of other products do not wait for it.
+        with lock:
+            if len(reviews) > len(index.reviews):
+                index.add(reviews[len(index.reviews) :])
+        return index
+
+    def cache_stats(self) -> tuple[int, int]:
+        return self.hits, self.misses
+
+
+_search: tuple[Catalog, ReviewSearch] | None = None
+
+
+def review_search(catalog: Catalog) -> ReviewSearch:
+    global _search
+    if _search is None or _search[0] is not catalog:
+        search = ReviewSearch(settings.REVIEW_INDEX_CACHE_SIZE)
+        registry.register_cache("review_indexes", search.cache_stats)
+        _search = (catalog, search)
+    return _search[1]
@@ -0,0 +1,70 @@
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from statistics import fmean, quantiles
+from typing import Any
+
+METRICS = ("search_volume", "price_index", "competition_index")
+CHANGES = ("monthly_search_change_percent", "monthly_price_change_percent", "six_month_growth_percent")
+# Six-month growth bands, with the thresholds the report's recommendations use.
+GROWTH_BANDS = (("declining", float("-inf"), -10), ("flat", -10, 5), ("growing", 5, 15), ("strong", 15, float("inf")))
+
+
+def category_key(category: str | None) -> str | None:
+    return category.strip().lower() if category else None
+
+
+def _summary(values: list[float]) -> dict[str, float]:
+    if len(values) < 2:
+        p25 = median = p75 = values[0]
+    else:
+        p25, median, p75 = quantiles(values, n=4, method="inclusive")
+    return {
+        "mean": round(fmean(values), 3),
+        "min": min(values),
+        "p25": round(p25, 3),
+        "median": round(median, 3),
+        "p75": round(p75, 3),
+        "max": max(values),
+    }
+
+
+def build_category_trends(market_trends: Iterable[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Per-category aggregates of the products' market trends, computed in one pass over every trend entry.
+
+    Built with the catalog (and stored in its snapshot), so that analyses look their category up instead of
+    scanning the trends of every product.
+    """
+    values: dict[str, dict[str, list[float]]] = defaultdict(lambda: defaultdict(list))
+    sentiments: dict[str, Counter[str]] = defaultdict(Counter)
+    for trends in market_trends:
+        category = category_key(trends.get("category"))
+        if category is None:
+            continue
+        for group in ("current_metrics", "trend_changes"):
+            for name, value in (trends.get(group) or {}).items():
+                if isinstance(value, int | float):
+                    values[category][name].append(float(value))
+        sentiments[category][trends.get("market_sentiment", "unknown")] += 1
+
+    rollups = {}
+    for category, metrics in values.items():
+        growth = metrics.get("six_month_growth_percent", [])
+        rollups[category] = {
+            "category": category,
+            "product_count": sum(sentiments[category].values()),
+            "metrics": {name: _summary(metrics[name]) for name in METRICS if metrics.get(name)},
+            "changes": {name: _summary(metrics[name]) for name in CHANGES if metrics.get(name)},
+            "growth_distribution": {band: sum(low <= value < high for value in growth) for band, low, high in GROWTH_BANDS},
+            "market_sentiment": dict(sentiments[category]),
+        }
+    return rollups
+
+
+def compare_to_category(trends: dict[str, Any], rollup: dict[str, Any]) -> dict[str, float]:
+    """How far a product's metrics are from its category median."""
+    comparison = {}
+    for group, summaries in (("current_metrics", rollup["metrics"]), ("trend_changes", rollup["changes"])):
+        for name, value in (trends.get(group) or {}).items():
+            if name in summaries and isinstance(value, int | float):
+                comparison[f"{name}_vs_median"] = round(value - summaries[name]["median"], 3)
+    return comparison
@@ -0,0 +1,80 @@
+import heapq
+import threading
+from collections import defaultdict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from src.catalog.catalog import Catalog
+from src.catalog.vectors import build_product_vectors
+from src.config import settings
+from src.monitoring.metrics import registry
+
+
+@dataclass(frozen=True)
+class SimilarProduct:
+    name: str
+    score: float
+
+
+class SimilarityIndex:
+    """Top-k most similar products by cosine similarity of their TF-IDF vectors.
+
+    A query only reads the postings of its own features: the scores are a sparse matrix product of the query
+    vectors with the postings, accumulated per product, instead of a comparison with every product.
+    """
+
+    def __init__(self, vectors: Mapping[str, dict[str, float]], postings: Mapping[str, list[list[Any]]], cache_size: int = 4096):
+        self.vectors = vectors
+        self.postings = postings
+        self.similar = lru_cache(maxsize=cache_size)(self._similar)
+
+    def similar_batch(self, names: list[str], k: int) -> dict[str, list[SimilarProduct]]:
+        """The `k` most similar products of each of `names`, reading the postings of a feature once for the batch."""
+        queries_by_feature: dict[str, list[tuple[str, float]]] = defaultdict(list)
+        for name in names:
+            for feature, weight in (self.vectors.get(name) or {}).items():
+                queries_by_feature[feature].append((name, weight))
+
+        scores: dict[str, defaultdict[str, float]] = {name: defaultdict(float) for name in names}
+        for feature, queries in queries_by_feature.items():
+            entries = self.postings.get(feature) or []
+            for name, query_weight in queries:
+                accumulated = scores[name]
+                for other, weight in entries:
+                    accumulated[other] += query_weight * weight
+
+        results = {}
+        for name, accumulated in scores.items():
+            accumulated.pop(name, None)
+            top = heapq.nlargest(k, accumulated.items(), key=lambda item: item[1])
+            results[name] = [SimilarProduct(other, round(score, 4)) for other, score in top]
+        return results
+
+    def _similar(self, name: str, k: int) -> tuple[SimilarProduct, ...]:
+        return tuple(self.similar_batch([name], k)[name])
+
+    def cache_stats(self) -> tuple[int, int]:
+        info = self.similar.cache_info()
+        return info.hits, info.misses
+
+
+_index: tuple[Catalog, SimilarityIndex] | None = None
+_index_lock = threading.Lock()
+
+
+def similarity_index(catalog: Catalog) -> SimilarityIndex:
+    # Snapshots carry the vectors; JSON catalogs build them once (the first time a query runs, or at warm-up).
+    global _index
+    if _index is None or _index[0] is not catalog:
+        with _index_lock:
+            if _index is None or _index[0] is not catalog:
+                if catalog.feature_postings:
+                    vectors, postings = catalog.product_vectors, catalog.feature_postings
+                else:
+                    vectors, postings = build_product_vectors(catalog.products.values())
+                index = SimilarityIndex(vectors, postings, settings.COMPETITORS_CACHE_SIZE)
+                registry.register_cache("similar_products", index.cache_stats)
+                _index = (catalog, index)
+    return _index[1]
@@ -0,0 +1,189 @@
+import json
+import mmap
+import os
+import struct
+from collections.abc import Iterator, Mapping
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from src.catalog.rollups import build_category_trends
+from src.catalog.vectors import build_product_vectors
+
+# Bumped with the layout, so that older snapshots are rebuilt.
+MAGIC = b"ECSNAP03"
+_PREAMBLE = struct.Struct("<8sQQ")
+_ALIGNMENT = 8
+
+KEYED_SECTIONS = {"products": "products.json", "reviews": "reviews.json", "market_trends": "market_trends.json"}
+INLINE_SECTIONS = {"retailers": "retailers.json", "retailer_config": "retailer_config.json", "market_data": "market_data.json"}
+# Keyed sections computed from the products rather than read from a file (see src/catalog/vectors.py).
+DERIVED_SECTIONS = ("product_vectors", "feature_postings")
+
+
+def source_fingerprint(data_dir: Path) -> dict[str, list[int]]:
+    fingerprint = {}
+    for filename in sorted({**KEYED_SECTIONS, **INLINE_SECTIONS}.values()):
+        path = Path(data_dir) / filename
+        if path.exists():
+            stat = path.stat()
+            fingerprint[filename] = [stat.st_size, stat.st_mtime_ns]
+    return fingerprint
+
+
+def _load_json(path: Path, default: Any) -> Any:
+    if not path.exists():
+        return default
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_blobs(f, blobs: list[bytes]) -> tuple[int, int]:
+    f.write(b"\0" * (-f.tell() % _ALIGNMENT))
+    offsets_position = f.tell()
+    offsets = [0]
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+    blobs_position = f.tell()
+    for blob in blobs:
+        f.write(blob)
+    return offsets_position, blobs_position
+
+
+def _write_section(f, records: dict[str, Any]) -> dict[str, int]:
+    items = sorted(records.items())
+    keys_offsets, keys = _write_blobs(f, [key.encode("utf-8") for key, _ in items])
+    values_offsets, values = _write_blobs(f, [json.dumps(value, separators=(",", ":")).encode("utf-8") for _, value in items])
+    return {"count": len(items), "keys_offsets": keys_offsets, "keys": keys, "values_offsets": values_offsets, "values": values}
+
+
+def build_snapshot(data_dir: Path, snapshot_path: Path) -> Path:
+    """Write the catalog to a single read-only file that worker processes memory-map.
+
+    Keyed sections hold sorted keys and JSON records addressed through uint64 offset arrays, so the
+    pages are shared through the OS page cache and each worker only decodes the records it touches.
+    Category rollups of the market trends are computed here, once per data version, and kept in the header;
+    the products' similarity vectors and their postings get keyed sections of their own.
+    """
+    data_dir = Path(data_dir)
+    snapshot_path = Path(snapshot_path)
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+
+    header: dict[str, Any] = {
+        "fingerprint": source_fingerprint(data_dir),
+        "inline": {section: _load_json(data_dir / filename, {}) for section, filename in INLINE_SECTIONS.items()},
+        "sections": {},
+    }
+
+    tmp_path = snapshot_path.with_name(snapshot_path.name + f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, 0, 0))
+        for section, filename in KEYED_SECTIONS.items():
+            records = _load_json(data_dir / filename, {})
+            if isinstance(records, list):
+                records = {record["name"]: record for record in records}
+            if section == "products":
+                derived = dict(zip(DERIVED_SECTIONS, build_product_vectors(records.values()), strict=True))
+            if section == "market_trends":
+                header["category_trends"] = build_category_trends(records.values())
+            header["sections"][section] = _write_section(f, records)
+            del records
+        for section in DERIVED_SECTIONS:
+            header["sections"][section] = _write_section(f, derived.pop(section))
+
+        header_position = f.tell()
+        encoded_header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        f.write(encoded_header)
+        f.seek(0)
+        f.write(_PREAMBLE.pack(MAGIC, header_position, len(encoded_header)))
+
+    os.replace(tmp_path, snapshot_path)
+    return snapshot_path
+
+
+class MappedSection(Mapping):
+    """Read-only mapping over one keyed section of a memory-mapped snapshot."""
+
+    def __init__(self, buffer: memoryview, layout: dict[str, int], cache_size: int = 256):
+        self._buffer = buffer
+        self._count = layout["count"]
+        self._keys_offsets = buffer[layout["keys_offsets"] : layout["keys_offsets"] + 8 * (self._count + 1)].cast("Q")
+        self._keys_position = layout["keys"]
+        self._values_offsets = buffer[layout["values_offsets"] : layout["values_offsets"] + 8 * (self._count + 1)].cast("Q")
+        self._values_position = layout["values"]
+        self._decode_value = lru_cache(maxsize=cache_size)(self._decode_value_at)
+
+    def _key_at(self, index: int) -> str:
+        start = self._keys_position + self._keys_offsets[index]
+        end = self._keys_position + self._keys_offsets[index + 1]
+        return bytes(self._buffer[start:end]).decode("utf-8")
+
+    def _decode_value_at(self, index: int) -> Any:
+        start = self._values_position + self._values_offsets[index]
+        end = self._values_position + self._values_offsets[index + 1]
+        return json.loads(self._buffer[start:end].tobytes())
+
+    def _index_of(self, key: str) -> int:
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._key_at(low) == key:
+            return low
+        raise KeyError(key)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._decode_value(self._index_of(key))
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        try:
+            self._index_of(key)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._key_at(index) for index in range(self._count))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def cache_stats(self) -> tuple[int, int]:
+        info = self._decode_value.cache_info()
+        return info.hits, info.misses
+
+
+class CatalogSnapshot:
+    def __init__(self, snapshot_path: Path):
+        self.path = Path(snapshot_path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_position, header_length = _PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a catalog snapshot")
+
+        self.header = json.loads(self._mmap[header_position : header_position + header_length])
+        buffer = memoryview(self._mmap)
+        self.sections = {section: MappedSection(buffer, layout) for section, layout in self.header["sections"].items()}
+        self.inline = self.header["inline"]
+
+    def is_fresh(self, data_dir: Path) -> bool:
+        return self.header["fingerprint"] == source_fingerprint(data_dir)
+
+
+def ensure_snapshot(data_dir: Path, snapshot_path: Path) -> Path:
+    """Build the snapshot unless an up-to-date one already exists."""
+    snapshot_path = Path(snapshot_path)
+    if snapshot_path.exists():
+        try:
+            if CatalogSnapshot(snapshot_path).is_fresh(data_dir):
+                return snapshot_path
+        except (ValueError, struct.error, json.JSONDecodeError):
+            pass
+    return build_snapshot(data_dir, snapshot_path)
@@ -0,0 +1,341 @@
+import atexit
+import math
+import sqlite3
+import threading
+import time
+import zlib
+from array import array
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import accumulate, pairwise
+from typing import Any
+
+from src.config import settings
+
+# Points are grouped in chunks of this many milliseconds per series; a flush appends one segment per chunk it touches.
+CHUNK_MS = 24 * 3600 * 1000
+HISTORY_WINDOWS_DAYS = (30, 180)
+TREND_METRICS = ("search_volume", "price_index", "competition_index")
+
+
+def price_series(product_name: str, retailer: str = "") -> str:
+    return f"price/{product_name}/{retailer}"
+
+
+def trend_series(product_name: str, metric: str) -> str:
+    return f"trend/{product_name}/{metric}"
+
+
+def _encode_timestamps(timestamps: list[int]) -> bytes:
+    # Delta-encoded: regularly sampled series compress to a few bytes per point.
+    deltas = array("q", [timestamps[0]])
+    deltas.extend(current - previous for previous, current in pairwise(timestamps))
+    return zlib.compress(deltas.tobytes(), 1)
+
+
+def _decode_timestamps(blob: bytes) -> list[int]:
+    deltas = array("q")
+    deltas.frombytes(zlib.decompress(blob))
+    return list(accumulate(deltas))
+
+
+def _encode_values(values: list[float]) -> bytes:
+    return zlib.compress(array("d", values).tobytes(), 1)
+
+
+def _decode_values(blob: bytes) -> array:
+    values = array("d")
+    values.frombytes(zlib.decompress(blob))
+    return values
+
+
+@dataclass
+class Aggregate:
+    count: int = 0
+    total: float = 0.0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+    first: tuple[int, float] | None = None
+    last: tuple[int, float] | None = None
+
+    def add(self, count: int, total: float, minimum: float, maximum: float, first: tuple[int, float], last: tuple[int, float]):
+        self.count += count
+        self.total += total
+        self.minimum = min(self.minimum, minimum)
+        self.maximum = max(self.maximum, maximum)
+        if self.first is None or first[0] < self.first[0]:
+            self.first = first
+        if self.last is None or last[0] >= self.last[0]:
+            self.last = last
+
+    def add_points(self, timestamps: list[int], values: list[float]) -> None:
+        if values:
+            self.add(len(values), sum(values), min(values), max(values), (timestamps[0], values[0]), (timestamps[-1], values[-1]))
+
+    def to_dict(self) -> dict[str, Any] | None:
+        if not self.count:
+            return None
+        first, last = self.first[1], self.last[1]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 4),
+            "min": self.minimum,
+            "max": self.maximum,
+            "first": first,
+            "last": last,
+            "change_percent": round((last - first) / first * 100, 2) if first else None,
+        }
+
+
+class TimeSeriesStore:
+    """Append-only time series (price per retailer, trend metrics per product) in a sqlite file.
+
+    Points are buffered and written in segments: one row per series and time chunk holding the chunk's
+    timestamps and values as two compressed columns, along with their count/sum/min/max/first/last. Aggregates
+    over a range read those statistics for the segments it fully covers and only decode the ones at its edges.
+    Queries also read the buffered points, which other processes only see once they are flushed.
+    """
+
+    def __init__(self, path: str, flush_size: int = 100_000, flush_seconds: float | None = None):
+        self.path = path
+        self.flush_size = flush_size
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        self._buffer: dict[tuple[str, int], tuple[list[int], list[float]]] = defaultdict(lambda: ([], []))
+        self._buffered = 0
+        self._flushed = time.monotonic()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS segments (series TEXT NOT NULL, chunk_start INTEGER NOT NULL, "
+                "count INTEGER NOT NULL, first_ts INTEGER NOT NULL, last_ts INTEGER NOT NULL, first REAL NOT NULL, "
+                "last REAL NOT NULL, min REAL NOT NULL, max REAL NOT NULL, sum REAL NOT NULL, "
+                "timestamps BLOB NOT NULL, value_data BLOB NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS segments_by_series ON segments (series, chunk_start)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, isolation_level=None, timeout=5)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def append(self, series: str, timestamp: float, value: float) -> None:
+        self.append_many([(series, timestamp, value)])
+
+    def append_many(self, points: Iterable[tuple[str, float, float]]) -> None:
+        """Buffer (series, timestamp in seconds, value) points; they are written every `flush_size` points, or at the
+        first append `flush_seconds` after the last write."""
+        with self._lock:
+            buffer = self._buffer
+            for series, timestamp, value in points:
+                milliseconds = int(timestamp * 1000)
+                timestamps, values = buffer[series, milliseconds - milliseconds % CHUNK_MS]
+                timestamps.append(milliseconds)
+                values.append(float(value))
+                self._buffered += 1
+            full = self._buffered >= self.flush_size
+            stale = self.flush_seconds is not None and time.monotonic() - self._flushed >= self.flush_seconds
+        if full or stale:
+            self.flush()
+
+    def flush(self) -> int:
+        with self._lock:
+            buffer, self._buffer = self._buffer, defaultdict(lambda: ([], []))
+            self._buffered = 0
+            self._flushed = time.monotonic()
+        rows = []
+        for (series, chunk_start), (timestamps, values) in buffer.items():
+            if any(current < previous for previous, current in pairwise(timestamps)):
+                timestamps, values = map(list, zip(*sorted(zip(timestamps, values, strict=True)), strict=True))
+            rows.append(self._segment(series, chunk_start, timestamps, values))
+        if rows:
+            with self._connect() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany("INSERT INTO segments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                conn.execute("COMMIT")
+        return sum(row[2] for row in rows)
+
+    @staticmethod
+    def _segment(series: str, chunk_start: int, timestamps: list[int], values: list[float]) -> tuple:
+        return (
+            series,
+            chunk_start,
+            len(values),
+            timestamps[0],
+            timestamps[-1],
+            values[0],
+            values[-1],
+            min(values),
+            max(values),
+            math.fsum(values),
+            _encode_timestamps(timestamps),
+            _encode_values(values),
+        )
+
+    def _segments(self, conn: sqlite3.Connection, series: list[str], start: float, end: float, columns: str) -> list[tuple]:
+        start_ms, end_ms = int(start * 1000), int(end * 1000)
+        placeholders = ", ".join("?" * len(series))
+        return conn.execute(
+            f"SELECT {columns} FROM segments WHERE series IN ({placeholders}) AND chunk_start BETWEEN ? AND ? "
+            "AND last_ts >= ? AND first_ts <= ? ORDER BY first_ts",
+            (*series, start_ms - start_ms % CHUNK_MS, end_ms, start_ms, end_ms),
+        ).fetchall()
+
+    def _buffered_points(self, series: str, start_ms: int, end_ms: int) -> list[tuple[int, float]]:
+        with self._lock:
+            chunks = [points for (name, _), points in self._buffer.items() if name == series]
+            return sorted(
+                (timestamp, value)
+                for timestamps, values in chunks
+                for timestamp, value in zip(timestamps, values, strict=True)
+                if start_ms <= timestamp <= end_ms
+            )
+
+    def series(self, prefix: str) -> list[str]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT series FROM segments WHERE series >= ? AND series < ?", (prefix, prefix + "\uffff")
+            ).fetchall()
+        with self._lock:
+            buffered = {name for name, _ in self._buffer if name.startswith(prefix)}
+        return sorted(buffered.union(row[0] for row in rows))
+
+    def range(self, series: str, start: float, end: float) -> list[tuple[float, float]]:
+        """The (timestamp in seconds, value) points of `series` between `start` and `end`, in time order."""
+        start_ms, end_ms = int(start * 1000), int(end * 1000)
+        with self._connect() as conn:
+            segments = self._segments(conn, [series], start, end, "timestamps, value_data")
+        points = []
+        for timestamps, values in segments:
+            points.extend(
+                (timestamp / 1000, value)
+                for timestamp, value in zip(_decode_timestamps(timestamps), _decode_values(values), strict=True)
+                if start_ms <= timestamp <= end_ms
+            )
+        points.extend((timestamp / 1000, value) for timestamp, value in self._buffered_points(series, start_ms, end_ms))
+        points.sort()
+        return points
+
+    def aggregate(self, series: list[str], start: float, end: float) -> dict[str, Any] | None:
+        """Count, mean, min, max, first and last value of the points of every series of `series` in [start, end]."""
+        if not series:
+            return None
+        start_ms, end_ms = int(start * 1000), int(end * 1000)
+        result = Aggregate()
+        with self._connect() as conn:
+            segments = self._segments(
+                conn, series, start, end, "count, sum, min, max, first_ts, first, last_ts, last, timestamps, value_data"
+            )
+        for count, total, minimum, maximum, first_ts, first, last_ts, last, timestamps, values in segments:
+            if start_ms <= first_ts and last_ts <= end_ms:
+                result.add(count, total, minimum, maximum, (first_ts, first), (last_ts, last))
+                continue
+            inside = [
+                (timestamp, value)
+                for timestamp, value in zip(_decode_timestamps(timestamps), _decode_values(values), strict=True)
+                if start_ms <= timestamp <= end_ms
+            ]
+            result.add_points([timestamp for timestamp, _ in inside], [value for _, value in inside])
+        for name in series:
+            buffered = self._buffered_points(name, start_ms, end_ms)
+            result.add_points([timestamp for timestamp, _ in buffered], [value for _, value in buffered])
+        return result.to_dict()
+
+    def downsample(self, series: str, start: float, end: float, bucket_seconds: float) -> list[dict[str, Any]]:
+        """The points of `series` in [start, end] summarized per `bucket_seconds` bucket (mean, min, max, last)."""
+        buckets: dict[float, list[float]] = defaultdict(list)
+        for timestamp, value in self.range(series, start, end):
+            buckets[timestamp - timestamp % bucket_seconds].append(value)
+        return [
+            {
+                "start": bucket,
+                "count": len(values),
+                "mean": round(math.fsum(values) / len(values), 4),
+                "min": min(values),
+                "max": max(values),
+                "last": values[-1],
+            }
+            for bucket, values in sorted(buckets.items())
+        ]
+
+    def compact(self, before: float, bucket_seconds: float | None = None) -> int:
+        """Merge the segments of every chunk ending before `before` into a single one, keeping one point (the mean)
+        per `bucket_seconds` when given. Returns the number of chunks rewritten."""
+        before_ms = int(before * 1000)
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            chunks = conn.execute(
+                "SELECT series, chunk_start FROM segments WHERE chunk_start + ? <= ? GROUP BY series, chunk_start "
+                "HAVING COUNT(*) > 1 OR ?",
+                (CHUNK_MS, before_ms, bucket_seconds is not None),
+            ).fetchall()
+            for series, chunk_start in chunks:
+                points = []
+                for timestamps, values in conn.execute(
+                    "SELECT timestamps, value_data FROM segments WHERE series = ? AND chunk_start = ?", (series, chunk_start)
+                ):
+                    points.extend(zip(_decode_timestamps(timestamps), _decode_values(values), strict=True))
+                points.sort()
+                if bucket_seconds is not None:
+                    bucket_ms = int(bucket_seconds * 1000)
+                    buckets: dict[int, list[float]] = defaultdict(list)
+                    for timestamp, value in points:
+                        buckets[timestamp - timestamp % bucket_ms].append(value)
+                    points = [(bucket, math.fsum(values) / len(values)) for bucket, values in sorted(buckets.items())]
+                conn.execute("DELETE FROM segments WHERE series = ? AND chunk_start = ?", (series, chunk_start))
+                conn.execute(
+                    "INSERT INTO segments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    self._segment(series, chunk_start, [point[0] for point in points], [point[1] for point in points]),
+                )
+            conn.execute("COMMIT")
+        return len(chunks)
+
+
+_stores: dict[str, TimeSeriesStore] = {}
+
+
+def timeseries_store() -> TimeSeriesStore | None:
+    # One store per file, shared by the analyses of the process; unset TIMESERIES_PATH disables recording.
+    if not settings.TIMESERIES_PATH:
+        return None
+    if settings.TIMESERIES_PATH not in _stores:
+        store = TimeSeriesStore(settings.TIMESERIES_PATH, settings.TIMESERIES_FLUSH_SIZE, settings.TIMESERIES_FLUSH_SECONDS)
+        # Points still buffered when the process exits are written then.
+        atexit.register(store.flush)
+        _stores[settings.TIMESERIES_PATH] = store
+    return _stores[settings.TIMESERIES_PATH]
+
+
+def record_prices(store: TimeSeriesStore, product_name: str, retailer_data: list[dict[str, Any]], timestamp: float) -> None:
+    store.append_many(
+        (price_series(product_name, data["retailer"]), timestamp, data["price"])
+        for data in retailer_data
+        if data.get("price") is not None
+    )
+
+
+def record_trends(store: TimeSeriesStore, product_name: str, trends: dict[str, Any], timestamp: float) -> None:
+    metrics = trends.get("current_metrics") or {}
+    store.append_many(
+        (trend_series(product_name, metric), timestamp, metrics[metric]) for metric in TREND_METRICS if metric in metrics
+    )
+
+
+def market_history(store: TimeSeriesStore, product_name: str, now: float) -> dict[str, dict[str, Any]]:
+    """Price (over every retailer) and trend metric aggregates of the product for each of HISTORY_WINDOWS_DAYS."""
+    price_keys = store.series(price_series(product_name))
+    history = {}
+    for days in HISTORY_WINDOWS_DAYS:
+        start = now - days * 86400
+        window = {"price": store.aggregate(price_keys, start, now)}
+        for metric in TREND_METRICS:
+            window[metric] = store.aggregate([trend_series(product_name, metric)], start, now)
+        window = {name: aggregate for name, aggregate in window.items() if aggregate is not None}
+        if window:
+            history[f"{days}d"] = window
+    return history
@@ -0,0 +1,58 @@
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+from src.catalog.rollups import category_key
+
+# Category and brand are single features among a dozen description/specification words: weighted up so that
+# competitors come from the product's category first.
+FIELD_WEIGHTS = {"category": 3.0, "brand": 1.5, "text": 1.0}
+# Postings kept per feature, highest weights first. Bounds the work of a query on features shared by most of
+# a large catalog ("category:smartphones"), whose low weights barely change the ranking.
+POSTINGS_LIMIT = 2000
+
+
+def product_features(product: dict[str, Any]) -> Counter[str]:
+    features: Counter[str] = Counter()
+    text = " ".join([product.get("description") or "", *map(str, (product.get("specifications") or {}).values())])
+    for word in re.findall(r"[a-z0-9]+", text.lower()):
+        features[f"text:{word}"] += 1
+    if category := category_key(product.get("category")):
+        features[f"category:{category}"] += 1
+    if brand := (product.get("brand") or "").strip().lower():
+        features[f"brand:{brand}"] += 1
+    return features
+
+
+def build_product_vectors(
+    products: Iterable[dict[str, Any]],
+) -> tuple[dict[str, dict[str, float]], dict[str, list[list[Any]]]]:
+    """TF-IDF vectors of the products (L2-normalized, so that a dot product is their cosine similarity), and the
+    inverted postings of every feature: {feature: [[product name, weight], ...]}.
+
+    Built offline with the catalog snapshot, or when the first competitor query runs on a JSON catalog.
+    """
+    features = {product["name"]: product_features(product) for product in products}
+    document_frequency: Counter[str] = Counter()
+    for counts in features.values():
+        document_frequency.update(counts.keys())
+    idf = {feature: math.log((1 + len(features)) / (1 + count)) + 1 for feature, count in document_frequency.items()}
+
+    vectors: dict[str, dict[str, float]] = {}
+    postings: dict[str, list[list[Any]]] = defaultdict(list)
+    for name, counts in features.items():
+        weights = {
+            feature: (1 + math.log(count)) * idf[feature] * FIELD_WEIGHTS[feature.split(":", 1)[0]]
+            for feature, count in counts.items()
+        }
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+        vectors[name] = {feature: round(weight / norm, 4) for feature, weight in weights.items()}
+        for feature, weight in vectors[name].items():
+            postings[feature].append([name, weight])
+    for feature, entries in postings.items():
+        if len(entries) > POSTINGS_LIMIT:
+            postings[feature] = heapq.nlargest(POSTINGS_LIMIT, entries, key=lambda entry: entry[1])
+    return vectors, dict(postings)
@@ -0,0 +1,87 @@
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+from pydantic import ValidationError
+from tqdm import tqdm
+
+from src.api.models.analysis.requests import AnalysisRequest
+from src.config import settings
+
+
+def read_queries(path: Path) -> list[str]:
+    queries = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                if isinstance(record, str):
+                    record = {"query": record}
+                queries.append(AnalysisRequest(**record).query)
+            except (json.JSONDecodeError, TypeError, ValidationError) as e:
+                raise ValueError(f"{path}:{line_number}: invalid analysis request ({e})") from e
+    return queries
+
+
+def batch_analyze(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run analyses for every product listed in a JSONL file.")
+    parser.add_argument("input", type=Path, help='JSONL file with one {"query": "..."} object per line')
+    parser.add_argument("--output", type=Path, help="Write one JSON result per analysis to this JSONL file")
+    parser.add_argument("--concurrency", type=int, default=settings.BATCH_MAX_CONCURRENCY, help="Concurrent analyses")
+    args = parser.parse_args(argv)
+
+    # Imported here so `--help` and input errors don't pay for loading the agent stack.
+    from src.api.services.batch import create_batch, run_batch
+    from src.api.services.database_service import db_service
+
+    queries = read_queries(args.input)
+    batch = create_batch(queries, db_service)
+
+    with tqdm(total=batch.total, unit="analysis") as progress_bar:
+
+        def on_result(batch, analysis):
+            progress_bar.update(1)
+            progress_bar.set_postfix(failed=batch.failed, per_min=batch.throughput_per_minute)
+
+        asyncio.run(run_batch(batch, db_service, on_result=on_result, concurrency=args.concurrency))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            for analysis in batch.analyses:
+                f.write(json.dumps(analysis, default=str) + "\n")
+
+    print(json.dumps(batch.to_dict(), default=str, indent=2))
+
+
+def prewarm_cache(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Analyse the most requested products again, ahead of the day's requests.")
+    parser.add_argument("--top", type=int, default=settings.PREWARM_TOP_PRODUCTS, help="Number of products to analyse")
+    parser.add_argument("--days", type=int, default=settings.PREWARM_WINDOW_DAYS, help="Days of request history to rank")
+    args = parser.parse_args(argv)
+
+    from src.api.services.database_service import db_service
+    from src.api.services.prewarm import prewarm
+
+    batch = asyncio.run(prewarm(db_service, limit=args.top, window_days=args.days))
+    print(json.dumps(batch.to_dict() if batch else {"total": 0}, default=str, indent=2))
+
+
+def compact_timeseries(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Merge (and optionally downsample) the older chunks of the time series store.")
+    parser.add_argument("--older-than-days", type=float, default=30, help="Only rewrite chunks older than this")
+    parser.add_argument("--bucket-seconds", type=float, help="Keep one point (the mean) per bucket of this many seconds")
+    args = parser.parse_args(argv)
+
+    from datetime import datetime, timedelta
+
+    from src.catalog.timeseries import timeseries_store
+
+    store = timeseries_store()
+    if store is None:
+        parser.error("TIMESERIES_PATH is not set")
+    before = (datetime.now() - timedelta(days=args.older_than_days)).timestamp()
+    print(json.dumps({"chunks_rewritten": store.compact(before, args.bucket_seconds)}))
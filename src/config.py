@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 from pydantic import BaseModel, model_validator
 
 
@@ -16,9 +17,99 @@ class Settings(BaseModel):
     API_HOST: str = os.getenv("API_HOST", "0.0.0.0")
     API_PORT: int = int(os.getenv("API_PORT", "8000"))
     API_RELOAD: bool = os.getenv("API_RELOAD", "true").lower() == "true"
+    API_WORKERS: int = int(os.getenv("API_WORKERS", "1"))
+    WARMUP_ON_STARTUP: bool = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
+
+    # Catalog Configuration
+    CATALOG_SNAPSHOT_PATH: str | None = os.getenv("CATALOG_SNAPSHOT_PATH")
+
+    # Product Resolution Configuration
+    # Queries matching no catalog product with at least this score (0-100) fail before any model request
+    PRODUCT_MATCH_THRESHOLD: int = int(os.getenv("PRODUCT_MATCH_THRESHOLD", "70"))
+    PRODUCT_RESOLUTION_CACHE_SIZE: int = int(os.getenv("PRODUCT_RESOLUTION_CACHE_SIZE", "4096"))
+
+    # Competitor Configuration
+    # Most similar products (description, specifications, category, brand) compared in the report
+    COMPETITORS_TOP_K: int = int(os.getenv("COMPETITORS_TOP_K", "5"))
+    COMPETITORS_CACHE_SIZE: int = int(os.getenv("COMPETITORS_CACHE_SIZE", "4096"))
+
+    # Review Search Configuration
+    # Best matching review snippets returned per aspect by search_review_aspects
+    REVIEW_SNIPPETS_PER_ASPECT: int = int(os.getenv("REVIEW_SNIPPETS_PER_ASPECT", "2"))
+    # Products whose review index is kept in memory
+    REVIEW_INDEX_CACHE_SIZE: int = int(os.getenv("REVIEW_INDEX_CACHE_SIZE", "256"))
+
+    # Time Series Configuration
+    # sqlite file recording retailer prices and trend metrics at every analysis; unset disables recording
+    TIMESERIES_PATH: str | None = os.getenv("TIMESERIES_PATH")
+    TIMESERIES_FLUSH_SIZE: int = int(os.getenv("TIMESERIES_FLUSH_SIZE", "100000"))
+    TIMESERIES_FLUSH_SECONDS: float = float(os.getenv("TIMESERIES_FLUSH_SECONDS", "60"))
+
+    # Reports Configuration
+    REPORTS_DIR: str = os.getenv("REPORTS_DIR", str(Path(__file__).parent.parent / "reports"))
+    REPORT_RENDER_CACHE_SIZE: int = int(os.getenv("REPORT_RENDER_CACHE_SIZE", "128"))
+
+    # Progress Streaming Configuration
+    PROGRESS_HEARTBEAT_SECONDS: float = float(os.getenv("PROGRESS_HEARTBEAT_SECONDS", "15"))
+    PROGRESS_HISTORY_SIZE: int = int(os.getenv("PROGRESS_HISTORY_SIZE", "1000"))
+
+    # Scheduling Configuration
+    ANALYSIS_MAX_CONCURRENCY: int = int(os.getenv("ANALYSIS_MAX_CONCURRENCY", "16"))
+    # Share of the free slots each priority class gets while several are waiting
+    ANALYSIS_PRIORITY_WEIGHTS: str = os.getenv("ANALYSIS_PRIORITY_WEIGHTS", "high:8,normal:4,low:1")
+
+    # Analysis Cache Configuration
+    # A completed analysis of the same product younger than this is returned instead of running a new one (0 disables)
+    ANALYSIS_CACHE_TTL_SECONDS: float = float(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", "0"))
+    # Daily pre-warming of the most requested products (local "HH:MM"; unset disables the in-process job)
+    PREWARM_AT: str | None = os.getenv("PREWARM_AT")
+    PREWARM_TOP_PRODUCTS: int = int(os.getenv("PREWARM_TOP_PRODUCTS", "20"))
+    PREWARM_WINDOW_DAYS: int = int(os.getenv("PREWARM_WINDOW_DAYS", "7"))
+
+    # Batch Configuration
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+    BATCH_FLUSH_SIZE: int = int(os.getenv("BATCH_FLUSH_SIZE", "50"))
+    BATCH_MAX_SIZE: int = int(os.getenv("BATCH_MAX_SIZE", "1000"))
 
     # LLM Configuration
     ANTHROPIC_API_KEY: str | None = os.getenv("ANTHROPIC_API_KEY")
+    # large: every step on MODEL_LARGE, fast: every step on MODEL_FAST,
+    # tiered: MODEL_LARGE for the report synthesis (once every data tool has run) and after errors, MODEL_FAST otherwise
+    MODEL_ROUTING: str = os.getenv("MODEL_ROUTING", "large")
+    MODEL_LARGE: str = os.getenv("MODEL_LARGE", "anthropic:claude-3-5-sonnet-20240620")
+    MODEL_FAST: str = os.getenv("MODEL_FAST", "anthropic:claude-3-5-haiku-20241022")
+    # USD per million tokens, used to estimate the cost of analyses: MODEL_LARGE's rates, and MODEL_FAST's
+    MODEL_INPUT_COST_PER_MTOK: float = float(os.getenv("MODEL_INPUT_COST_PER_MTOK", "3.0"))
+    MODEL_OUTPUT_COST_PER_MTOK: float = float(os.getenv("MODEL_OUTPUT_COST_PER_MTOK", "15.0"))
+    MODEL_FAST_INPUT_COST_PER_MTOK: float = float(os.getenv("MODEL_FAST_INPUT_COST_PER_MTOK", "0.8"))
+    MODEL_FAST_OUTPUT_COST_PER_MTOK: float = float(os.getenv("MODEL_FAST_OUTPUT_COST_PER_MTOK", "4.0"))
+
+    # Model Rate Limits Configuration
+    # Shared by all the analyses of a process (or of every process using MODEL_RATE_LIMIT_DB); 0 disables a limit
+    MODEL_REQUESTS_PER_MINUTE: float = float(os.getenv("MODEL_REQUESTS_PER_MINUTE", "0"))
+    MODEL_TOKENS_PER_MINUTE: float = float(os.getenv("MODEL_TOKENS_PER_MINUTE", "0"))
+    MODEL_RATE_LIMIT_DB: str | None = os.getenv("MODEL_RATE_LIMIT_DB")
+    MODEL_RATE_LIMIT_RETRIES: int = int(os.getenv("MODEL_RATE_LIMIT_RETRIES", "5"))
+    MODEL_RATE_LIMIT_BACKOFF_SECONDS: float = float(os.getenv("MODEL_RATE_LIMIT_BACKOFF_SECONDS", "1.0"))
+    MODEL_RATE_LIMIT_MAX_BACKOFF_SECONDS: float = float(os.getenv("MODEL_RATE_LIMIT_MAX_BACKOFF_SECONDS", "60"))
+
+    # Model Response Cache Configuration
+    # sqlite file replaying the responses of identical model requests; unset disables the cache
+    MODEL_CACHE_PATH: str | None = os.getenv("MODEL_CACHE_PATH")
+    MODEL_CACHE_TTL_SECONDS: float = float(os.getenv("MODEL_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    MODEL_CACHE_MAX_BYTES: int = int(os.getenv("MODEL_CACHE_MAX_BYTES", str(100 * 1024 * 1024)))
+    # Fail on a cache miss instead of calling the model, for deterministic offline runs
+    MODEL_CACHE_OFFLINE: bool = os.getenv("MODEL_CACHE_OFFLINE", "false").lower() == "true"
+
+    # Tracing Configuration
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+    TRACING_SERVICE_NAME: str = os.getenv("TRACING_SERVICE_NAME", "ecommerce-research-agent")
+
+    # Profiling Configuration
+    # Fraction of analyses profiled without being asked to (?profile=true or X-Profile: true)
+    PROFILE_SAMPLE_RATE: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0.0"))
+    PROFILE_INTERVAL_SECONDS: float = float(os.getenv("PROFILE_INTERVAL_SECONDS", "0.005"))
+    PROFILES_DIR: str = os.getenv("PROFILES_DIR", str(Path(__file__).parent.parent / "profiles"))
 
     # Environment
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
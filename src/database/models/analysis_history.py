@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime
+from sqlalchemy import Boolean, Column, String, Text, DateTime, Float, Integer
 from src.database.models.base import BaseModel
 
 
@@ -13,6 +13,16 @@ class AnalysisHistory(BaseModel):
     completed_at = Column(DateTime)
     report_path = Column(String)
     error = Column(Text)
+    input_tokens = Column(Integer)
+    output_tokens = Column(Integer)
+    model_requests = Column(Integer)
+    model_latency_seconds = Column(Float)
+    usage_steps = Column(Text)
+    profile = Column(String)
+    product_name = Column(String)
+    prewarmed = Column(Boolean)
+    cached_from = Column(String)
+    batch_id = Column(String)
 
     def __repr__(self):
         return f"<AnalysisHistory(id='{self.id}', query='{self.query}', status='{self.status}')>"
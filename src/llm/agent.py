@@ -1,13 +1,25 @@
 from pydantic_ai import Agent
-from dataclasses import dataclass
+from collections.abc import Callable
+from dataclasses import dataclass, field, fields
 from pydantic_ai.mcp import MCPServerStdio
+from pydantic_ai.models import Model
 from typing import Any
 from src.llm.prompt import instructions as agent_instructions
+from src.monitoring.metrics import timed, tool_duration_seconds
+from src.monitoring.profiling import profiled_tool
+from src.monitoring.tracing import traced, tracing_enabled
+from src.llm.usage import MeteredModel
+from src.llm.governor import GovernedModel
+from src.llm.routing import configured_model
+from src.llm.response_cache import cached_model
+from src.llm.history import compact_tool_outputs
 
 
 from src.llm.tools.report_generator import generate_product_report
-from src.llm.tools.market_trend_analysis import analyze_market_trends
+from src.llm.tools.market_trend_analysis import analyze_category_trends, analyze_market_trends
+from src.llm.tools.competitor_analysis import find_competitors
 from src.llm.tools.sentiment_analysis import get_product_sentiment_analysis
+from src.llm.tools.review_search import search_review_aspects
 from src.llm.tools.webscraping import fetch_product_data, fetch_product_reviews, get_most_similar_product, available_products
 from src.llm.tools.exit_program import exit_program
 
@@ -18,9 +30,16 @@ class ResearchContext:
     product_info: dict[str, Any] | None = None
     reviews_data: dict[str, Any] | None = None
     sentiment_analysis: dict[str, Any] | None = None
+    review_aspects: dict[str, Any] | None = None
     market_trends: dict[str, Any] | None = None
     report_path: str | None = None
     category_trends: dict[str, Any] | None = None
+    competitors: dict[str, Any] | None = None
+    progress_callback: Callable[..., None] | None = field(default=None, repr=False)
+
+    def report_progress(self, step: str, **data: Any) -> None:
+        if self.progress_callback is not None:
+            self.progress_callback(step, **data)
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -28,31 +47,53 @@ class ResearchContext:
             "product_info": self.product_info,
             "reviews_data": self.reviews_data,
             "sentiment_analysis": self.sentiment_analysis,
+            "review_aspects": self.review_aspects,
             "market_trends": self.market_trends,
             "report_path": self.report_path,
             "category_trends": self.category_trends,
+            "competitors": self.competitors,
         }
 
 
+# The fields the data tools fill: the report is written (on the large model, with tiered routing) once they all are.
+DATA_FIELDS = frozenset(f.name for f in fields(ResearchContext)) - {"product_name", "report_path", "progress_callback"}
+
+
+def instrument_tool(tool: Callable) -> Callable:
+    name = tool.__name__
+    return traced(f"tool {name}", tool=name)(timed(tool_duration_seconds, tool=name)(profiled_tool(tool)))
+
+
 def generate_research_agent(
     instructions: str = agent_instructions,
-    model: str = "anthropic:claude-3-5-sonnet-20240620",
+    model: Model | str | None = None,
     name: str = "researcher",
     tools: list[MCPServerStdio] = [
         generate_product_report,
         analyze_market_trends,
+        analyze_category_trends,
+        find_competitors,
         get_product_sentiment_analysis,
+        search_review_aspects,
         fetch_product_data,
         fetch_product_reviews,
         get_most_similar_product,
         available_products,
         exit_program,
     ],
+    history_processors: list[Callable] | None = None,
 ):
+    if history_processors is None:
+        history_processors = [compact_tool_outputs]
     return Agent(
-        model=model,
+        # The governor queues requests before they are timed: MeteredModel measures the provider's latency only.
+        # Cached responses skip both, as they never reach the provider.
+        model=cached_model(GovernedModel(MeteredModel(model or configured_model(DATA_FIELDS)))),
         name=name,
         instructions=instructions,
-        tools=tools,
+        tools=[instrument_tool(tool) for tool in tools],
         deps_type=ResearchContext,
+        history_processors=history_processors,
+        # Model request spans carry the model name and gen_ai.usage.* token counts.
+        instrument=tracing_enabled(),
     )
@@ -0,0 +1,244 @@
+import asyncio
+import random
+import sqlite3
+import time
+import weakref
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, suppress
+from typing import Any
+
+from loguru import logger
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import ModelMessage, ModelMessagesTypeAdapter, ModelResponse
+from pydantic_ai.models.wrapper import WrapperModel
+
+from src.config import settings
+from src.monitoring.metrics import model_rate_limit_wait_seconds, model_rate_limited_total, model_requests_waiting
+
+# Characters of serialized messages per token, to charge a request before the provider reports its usage.
+CHARS_PER_TOKEN = 4
+# Too many requests, and Anthropic's overloaded.
+RATE_LIMIT_STATUSES = {429, 529}
+# Row of the shared buckets table holding the time until which every request is paused.
+PAUSE_ROW = "paused_until"
+
+
+def estimate_tokens(messages: list[ModelMessage]) -> int:
+    return len(ModelMessagesTypeAdapter.dump_json(messages)) // CHARS_PER_TOKEN
+
+
+def _refill(level: float, limit: float, elapsed: float) -> float:
+    return min(limit, level + elapsed * limit / 60)
+
+
+class TokenBuckets:
+    """Per-minute limits as token buckets refilled continuously, starting full; limits of 0 are ignored."""
+
+    # Whether take and give do blocking I/O, which the governor then runs off the event loop.
+    blocking = False
+
+    def __init__(self, limits_per_minute: dict[str, float], clock: Callable[[], float] = time.monotonic):
+        self.limits = {name: limit for name, limit in limits_per_minute.items() if limit > 0}
+        self.clock = clock
+        self._levels = dict(self.limits)
+        self._updated = clock()
+        self._paused_until = 0.0
+
+    @contextmanager
+    def _state(self) -> Iterator[dict[str, float]]:
+        now = self.clock()
+        levels = {name: _refill(self._levels[name], limit, now - self._updated) for name, limit in self.limits.items()}
+        yield levels
+        self._levels, self._updated = levels, now
+
+    def take(self, amounts: dict[str, float]) -> float:
+        """Take `amounts` and return 0.0, or take nothing and return the seconds until all of them are available."""
+        with self._state() as levels:
+            paused = self._paused_until - self.clock()
+            if paused > 0:
+                return paused
+            # A request larger than a whole minute of quota waits for a full bucket rather than forever.
+            amounts = {name: min(amounts.get(name, 0), limit) for name, limit in self.limits.items()}
+            wait = max(((amounts[name] - levels[name]) * 60 / limit for name, limit in self.limits.items()), default=0.0)
+            if wait <= 0:
+                for name, amount in amounts.items():
+                    levels[name] -= amount
+            return max(wait, 0.0)
+
+    def give(self, name: str, amount: float) -> None:
+        """Return (or, when negative, charge) `amount` to a bucket, e.g. once a request's actual usage is known."""
+        if name in self.limits:
+            with self._state() as levels:
+                levels[name] = min(self.limits[name], levels[name] + amount)
+
+    def pause(self, seconds: float) -> None:
+        """Make every take wait at least `seconds`, e.g. after the provider rate-limited a request."""
+        with self._state():
+            self._paused_until = max(self._paused_until, self.clock() + seconds)
+
+
+class SharedTokenBuckets(TokenBuckets):
+    """TokenBuckets kept in a sqlite file, so that the API workers of a host share one quota and its pauses."""
+
+    blocking = True
+
+    def __init__(self, limits_per_minute: dict[str, float], db_path: str):
+        super().__init__(limits_per_minute, clock=time.time)
+        self.db_path = db_path
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets (name TEXT PRIMARY KEY, level REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        conn.commit()
+        conn.close()
+
+    @contextmanager
+    def _state(self) -> Iterator[dict[str, float]]:
+        conn = sqlite3.connect(self.db_path, isolation_level=None, timeout=5)
+        try:
+            # Locks the file until COMMIT, so concurrent workers read and update the buckets one at a time.
+            conn.execute("BEGIN IMMEDIATE")
+            now = self.clock()
+            rows = {
+                name: (level, updated)
+                for name, level, updated in conn.execute("SELECT name, level, updated FROM rate_limit_buckets")
+            }
+            # Wall-clock time, as the clock of shared buckets.
+            self._paused_until = rows.get(PAUSE_ROW, (0.0, now))[0]
+            levels = {
+                name: _refill(rows[name][0], limit, now - rows[name][1]) if name in rows else limit
+                for name, limit in self.limits.items()
+            }
+            yield levels
+            conn.executemany(
+                "INSERT OR REPLACE INTO rate_limit_buckets (name, level, updated) VALUES (?, ?, ?)",
+                [(name, level, now) for name, level in levels.items()] + [(PAUSE_ROW, self._paused_until, now)],
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+
+class RateGovernor:
+    """Admits the model requests of every analysis under shared requests-per-minute and tokens-per-minute limits.
+
+    Waiting requests are admitted round-robin across analyses, one per analysis in turn, so a long analysis
+    cannot starve the others. A rate-limited response pauses every request, not only the one that got it,
+    with an exponential backoff that resets on the next success; shared buckets pause every worker using them.
+    """
+
+    def __init__(self, buckets: TokenBuckets):
+        self.buckets = buckets
+        self._queues: OrderedDict[Any, deque[tuple[asyncio.Future, int]]] = OrderedDict()
+        self._dispatcher: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+        self._failures = 0
+
+    async def _buckets(self, method: Callable[..., Any], *args: Any) -> Any:
+        if self.buckets.blocking:
+            # Waiting for the sqlite lock of shared buckets must not stall the other analyses on the loop.
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    async def acquire(self, key: Any, tokens: int) -> None:
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(key, deque()).append((future, tokens))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        else:
+            self._wakeup.set()
+        with model_requests_waiting.track_inprogress():
+            await future
+
+    async def _dispatch(self) -> None:
+        while self._queues:
+            self._wakeup.clear()
+            key, queue = next(iter(self._queues.items()))
+            future, tokens = queue[0]
+            if not future.cancelled():
+                amounts = {"requests": 1, "tokens": tokens}
+                try:
+                    wait = await self._buckets(self.buckets.take, amounts)
+                except Exception as e:
+                    # E.g. the shared buckets stayed locked: the request fails rather than waiting forever.
+                    if not future.cancelled():
+                        future.set_exception(e)
+                    amounts, wait = {}, 0.0
+                if wait > 0:
+                    # Also woken by a new request, in case the one waiting at the head was cancelled meanwhile.
+                    with suppress(TimeoutError):
+                        await asyncio.wait_for(self._wakeup.wait(), wait)
+                    continue
+                if not future.done():
+                    future.set_result(None)
+                elif future.cancelled():
+                    # Cancelled while its amounts were being taken.
+                    for name, amount in amounts.items():
+                        await self._buckets(self.buckets.give, name, amount)
+            queue.popleft()
+            # The analysis goes to the back of the line.
+            del self._queues[key]
+            if queue:
+                self._queues[key] = queue
+
+    async def succeeded(self, estimated_tokens: int, actual_tokens: int) -> None:
+        self._failures = 0
+        await self._buckets(self.buckets.give, "tokens", estimated_tokens - actual_tokens)
+
+    async def rate_limited(self, estimated_tokens: int) -> float:
+        # The provider did not serve the request, so its tokens are returned; the request slot is not.
+        await self._buckets(self.buckets.give, "tokens", estimated_tokens)
+        self._failures += 1
+        delay = min(
+            settings.MODEL_RATE_LIMIT_MAX_BACKOFF_SECONDS, settings.MODEL_RATE_LIMIT_BACKOFF_SECONDS * 2 ** (self._failures - 1)
+        )
+        # Jitter keeps the workers sharing a quota from resuming in lockstep.
+        delay *= random.uniform(1.0, 1.25)
+        await self._buckets(self.buckets.pause, delay)
+        return delay
+
+
+def build_rate_governor() -> RateGovernor:
+    limits = {"requests": settings.MODEL_REQUESTS_PER_MINUTE, "tokens": settings.MODEL_TOKENS_PER_MINUTE}
+    if settings.MODEL_RATE_LIMIT_DB:
+        return RateGovernor(SharedTokenBuckets(limits, settings.MODEL_RATE_LIMIT_DB))
+    return RateGovernor(TokenBuckets(limits))
+
+
+_governors: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, RateGovernor] = weakref.WeakKeyDictionary()
+
+
+def rate_governor() -> RateGovernor:
+    # One governor shared by every analysis running on the event loop.
+    loop = asyncio.get_running_loop()
+    if loop not in _governors:
+        _governors[loop] = build_rate_governor()
+    return _governors[loop]
+
+
+class GovernedModel(WrapperModel):
+    """Sends every model request through the rate governor, and retries rate-limited ones after its backoff."""
+
+    async def request(self, messages: list[ModelMessage], *args: Any, **kwargs: Any) -> ModelResponse:
+        governor = rate_governor()
+        # Model requests run in the task of the analysis that makes them.
+        key = asyncio.current_task()
+        tokens = estimate_tokens(messages)
+        retries = 0
+        while True:
+            queued = time.perf_counter()
+            await governor.acquire(key, tokens)
+            model_rate_limit_wait_seconds.observe(time.perf_counter() - queued)
+            try:
+                response = await super().request(messages, *args, **kwargs)
+            except ModelHTTPError as e:
+                if e.status_code not in RATE_LIMIT_STATUSES or retries == settings.MODEL_RATE_LIMIT_RETRIES:
+                    raise
+                retries += 1
+                model_rate_limited_total.inc(model=self.model_name)
+                delay = await governor.rate_limited(tokens)
+                logger.warning(f"Model rate limited ({e.status_code}), pausing model requests for {delay:.1f}s")
+                continue
+            await governor.succeeded(tokens, response.usage.input_tokens + response.usage.output_tokens)
+            return response
@@ -0,0 +1,26 @@
+import json
+from typing import Any
+
+HANDLE_KEY = "handle"
+
+
+def data_handle(field: str, **summary: Any) -> str:
+    """Tool output for data stored in ResearchContext.<field>: the field name and a summary, not the data itself.
+
+    Later tools read the data from the context, so the model never has to carry it between steps.
+    """
+    return json.dumps({HANDLE_KEY: field, **summary})
+
+
+def parse_handle(content: Any) -> dict[str, Any] | None:
+    if not isinstance(content, str) or not content.startswith(f'{{"{HANDLE_KEY}"'):
+        return None
+    return json.loads(content)
+
+
+def handle_field(content: Any) -> str | None:
+    """The ResearchContext field of a tool output that is a data handle, full or compacted (see src/llm/history.py)."""
+    if isinstance(content, dict):
+        return content.get(HANDLE_KEY)
+    handle = parse_handle(content)
+    return handle[HANDLE_KEY] if handle else None
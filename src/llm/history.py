@@ -0,0 +1,34 @@
+from dataclasses import replace
+from typing import Any
+
+from pydantic_ai import RunContext
+from pydantic_ai.messages import ModelMessage, ModelRequest, ToolReturnPart
+
+from src.llm.handles import HANDLE_KEY, parse_handle
+
+
+def _compact_part(ctx: RunContext, part: Any) -> Any:
+    if not isinstance(part, ToolReturnPart):
+        return part
+    handle = parse_handle(part.content)
+    if handle is None or getattr(ctx.deps, handle[HANDLE_KEY], None) is None:
+        return part
+    # Compacted outputs are dicts rather than JSON strings, so they are not compacted again.
+    return replace(part, content={HANDLE_KEY: handle[HANDLE_KEY], "product": handle.get("product")})
+
+
+def compact_tool_outputs(ctx: RunContext, messages: list[ModelMessage]) -> list[ModelMessage]:
+    """Shorten the data handles the model has already seen to the handle alone, once their data is in ResearchContext.
+
+    Every tool output stays in the history and is resent with each later request, so even summaries add up
+    over the steps of an analysis. The latest request is left untouched: the model always sees a tool's full
+    summary once. pydantic-ai keeps the processed history, so each output is compacted once.
+    """
+    compacted = []
+    for message in messages[:-1]:
+        if isinstance(message, ModelRequest):
+            parts = [_compact_part(ctx, part) for part in message.parts]
+            if any(new is not old for new, old in zip(parts, message.parts, strict=True)):
+                message = replace(message, parts=parts)
+        compacted.append(message)
+    return [*compacted, *messages[-1:]]
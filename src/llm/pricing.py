@@ -0,0 +1,14 @@
+from src.config import settings
+
+
+def model_rates(model_name: str | None) -> tuple[float, float]:
+    """USD per million input and output tokens of `model_name`: MODEL_FAST's rates for the fast model, the large model's otherwise."""
+    # Providers report the bare model name ("claude-3-5-haiku-20241022"), settings carry the provider prefix.
+    if model_name and model_name in (settings.MODEL_FAST, settings.MODEL_FAST.partition(":")[2]):
+        return settings.MODEL_FAST_INPUT_COST_PER_MTOK, settings.MODEL_FAST_OUTPUT_COST_PER_MTOK
+    return settings.MODEL_INPUT_COST_PER_MTOK, settings.MODEL_OUTPUT_COST_PER_MTOK
+
+
+def cost_usd(input_tokens: int | None, output_tokens: int | None, model_name: str | None = None) -> float:
+    input_rate, output_rate = model_rates(model_name)
+    return round(((input_tokens or 0) * input_rate + (output_tokens or 0) * output_rate) / 1_000_000, 6)
@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Any
+
+from pydantic_ai.messages import ModelMessage, ModelMessagesTypeAdapter, ModelResponse
+from pydantic_ai.models import Model, ModelRequestParameters
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.settings import ModelSettings
+from pydantic_ai.usage import RequestUsage
+from pydantic_core import to_jsonable_python
+
+from src.config import settings
+from src.monitoring.metrics import registry
+
+# Fields that differ between two runs of the same conversation without changing what the model is asked.
+VOLATILE_KEYS = {"timestamp", "usage", "provider_name", "provider_details", "provider_response_id"}
+
+
+class ModelCacheMiss(RuntimeError):
+    pass
+
+
+def _stable(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _stable(item) for key, item in value.items() if key not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [_stable(item) for item in value]
+    return value
+
+
+def request_key(
+    model_name: str,
+    messages: list[ModelMessage],
+    model_settings: ModelSettings | None,
+    model_request_parameters: ModelRequestParameters,
+) -> str:
+    """Hash of everything that determines a model's answer: the model, the messages, the tools and the settings."""
+    request = {
+        "model": model_name,
+        "messages": _stable(ModelMessagesTypeAdapter.dump_python(messages, mode="json")),
+        "settings": to_jsonable_python(model_settings),
+        "parameters": to_jsonable_python(model_request_parameters),
+    }
+    return hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+
+
+class ModelResponseStore:
+    """Model responses by request key in a sqlite file, kept for `ttl_seconds` and evicted least recently used first
+    once they take more than `max_bytes`; the API workers of a host can share one file."""
+
+    def __init__(self, path: str, ttl_seconds: float, max_bytes: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS model_responses (key TEXT PRIMARY KEY, response BLOB NOT NULL, "
+                "size INTEGER NOT NULL, created REAL NOT NULL, used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS model_responses_created ON model_responses (created)")
+            conn.execute("CREATE INDEX IF NOT EXISTS model_responses_used ON model_responses (used)")
+            # Running total of the sizes, so that a put does not sum the whole table.
+            conn.execute("CREATE TABLE IF NOT EXISTS model_responses_size (total INTEGER NOT NULL)")
+            conn.execute(
+                "INSERT INTO model_responses_size (total) SELECT COALESCE(SUM(size), 0) FROM model_responses "
+                "WHERE NOT EXISTS (SELECT 1 FROM model_responses_size)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, isolation_level=None, timeout=5)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def stats(self) -> tuple[int, int]:
+        return self.hits, self.misses
+
+    def get(self, key: str) -> bytes | None:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT response, created FROM model_responses WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] + self.ttl_seconds < now:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE model_responses SET used = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return row[0]
+
+    def put(self, key: str, response: bytes) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            # Locks the file until COMMIT, so concurrent workers evict against the same total.
+            conn.execute("BEGIN IMMEDIATE")
+            replaced = conn.execute("SELECT COALESCE(SUM(size), 0) FROM model_responses WHERE key = ?", (key,)).fetchone()[0]
+            conn.execute(
+                "INSERT OR REPLACE INTO model_responses (key, response, size, created, used) VALUES (?, ?, ?, ?, ?)",
+                (key, response, len(response), now, now),
+            )
+            expired = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM model_responses WHERE created < ?", (now - self.ttl_seconds,)
+            ).fetchone()[0]
+            conn.execute("DELETE FROM model_responses WHERE created < ?", (now - self.ttl_seconds,))
+            total = conn.execute("SELECT total FROM model_responses_size").fetchone()[0] + len(response) - replaced - expired
+            evicted = []
+            for evicted_key, size in conn.execute("SELECT key, size FROM model_responses ORDER BY used"):
+                if total <= self.max_bytes:
+                    break
+                evicted.append((evicted_key,))
+                total -= size
+            conn.executemany("DELETE FROM model_responses WHERE key = ?", evicted)
+            conn.execute("UPDATE model_responses_size SET total = ?", (total,))
+            conn.execute("COMMIT")
+
+
+class CachedModel(WrapperModel):
+    """Answers a request the wrapped model has already answered from the store, without calling it.
+
+    With `offline`, a request that is not in the store raises ModelCacheMiss instead of reaching the model, so
+    recorded runs replay deterministically without the provider. Replayed responses report no token usage:
+    the provider was not paid for them.
+    """
+
+    def __init__(self, wrapped: Model | str, store: ModelResponseStore, offline: bool = False):
+        super().__init__(wrapped)
+        self.store = store
+        self.offline = offline
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        key = request_key(self.model_name, messages, model_settings, model_request_parameters)
+        # The store's sqlite I/O runs off the event loop, which the other analyses share.
+        cached = await asyncio.to_thread(self.store.get, key)
+        if cached is not None:
+            return replace(ModelMessagesTypeAdapter.validate_json(cached)[0], usage=RequestUsage())
+        if self.offline:
+            raise ModelCacheMiss(f"No cached response for model request {key} and the model cache is offline")
+        response = await super().request(messages, model_settings, model_request_parameters)
+        await asyncio.to_thread(self.store.put, key, ModelMessagesTypeAdapter.dump_json([response]))
+        return response
+
+
+_stores: dict[str, ModelResponseStore] = {}
+
+
+def model_response_store(path: str) -> ModelResponseStore:
+    # One store per file, shared by the agents of the process.
+    if path not in _stores:
+        _stores[path] = ModelResponseStore(path, settings.MODEL_CACHE_TTL_SECONDS, settings.MODEL_CACHE_MAX_BYTES)
+        registry.register_cache("model_responses", _stores[path].stats)
+    return _stores[path]
+
+
+def cached_model(model: Model) -> Model:
+    if not settings.MODEL_CACHE_PATH:
+        return model
+    return CachedModel(model, model_response_store(settings.MODEL_CACHE_PATH), offline=settings.MODEL_CACHE_OFFLINE)
@@ -0,0 +1,85 @@
+from collections.abc import Collection
+from typing import Any
+
+from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, RetryPromptPart, ToolReturnPart
+from pydantic_ai.models import Model, infer_model
+from pydantic_ai.models.wrapper import WrapperModel
+
+from src.config import settings
+from src.llm.handles import handle_field
+
+START_STEP = "start"
+RETRY_STEP = "retry"
+# The handle of generate_product_report: once it is returned, the report is written.
+REPORT_FIELD = "report_path"
+ROUTING_POLICIES = ("large", "fast", "tiered")
+
+
+def request_step(messages: list[ModelMessage]) -> str:
+    """The step a model request is for, named after the tool whose output it carries ("start" for the first one)."""
+    request = messages[-1] if messages else None
+    if not isinstance(request, ModelRequest):
+        return START_STEP
+    step = START_STEP
+    for part in request.parts:
+        if isinstance(part, RetryPromptPart):
+            return RETRY_STEP
+        if isinstance(part, ToolReturnPart):
+            # Tools report failures as {"error": ...}.
+            if isinstance(part.content, str) and part.content.startswith('{"error"'):
+                return RETRY_STEP
+            step = part.tool_name
+    return step
+
+
+def collected_fields(messages: list[ModelMessage]) -> set[str]:
+    """The ResearchContext fields filled so far, read from the data handles the tools returned."""
+    return {
+        field
+        for message in messages
+        if isinstance(message, ModelRequest)
+        for part in message.parts
+        if isinstance(part, ToolReturnPart) and (field := handle_field(part.content))
+    }
+
+
+def is_synthesis(messages: list[ModelMessage], data_fields: Collection[str]) -> bool:
+    """Whether the request is the one that writes the report: every data field is filled and no report exists yet."""
+    collected = collected_fields(messages)
+    return set(data_fields) <= collected and REPORT_FIELD not in collected
+
+
+class RoutedModel(WrapperModel):
+    """Sends the synthesis request (and anything that went wrong) to the large model, the others to the fast one.
+
+    The synthesis is recognized by the data collected so far rather than by the tool called last, so adding a data
+    tool (and its `data_fields` entry) moves the synthesis after it. The fast model handles orchestration: most steps
+    only call the next tool with the product name.
+    """
+
+    def __init__(self, large: Model | str, fast: Model | str, data_fields: Collection[str]):
+        super().__init__(large)
+        self.fast = infer_model(fast)
+        self.data_fields = frozenset(data_fields)
+
+    def route(self, messages: list[ModelMessage]) -> Model:
+        if request_step(messages) == RETRY_STEP or is_synthesis(messages, self.data_fields):
+            return self.wrapped
+        return self.fast
+
+    async def request(self, messages: list[ModelMessage], *args: Any, **kwargs: Any) -> ModelResponse:
+        return await self.route(messages).request(messages, *args, **kwargs)
+
+
+def route_models(routing: str, large: Model | str, fast: Model | str, data_fields: Collection[str]) -> Model | str:
+    if routing == "large":
+        return large
+    if routing == "fast":
+        return fast
+    if routing == "tiered":
+        return RoutedModel(large, fast, data_fields)
+    raise ValueError(f"Unknown model routing {routing!r}, expected one of {', '.join(ROUTING_POLICIES)}")
+
+
+def configured_model(data_fields: Collection[str]) -> Model | str:
+    return route_models(settings.MODEL_ROUTING, settings.MODEL_LARGE, settings.MODEL_FAST, data_fields)
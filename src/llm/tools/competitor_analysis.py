@@ -0,0 +1,50 @@
+import json
+from typing import Any
+
+from loguru import logger
+from pydantic_ai import RunContext
+
+from src.catalog import get_catalog
+from src.catalog.similarity import similarity_index
+from src.config import settings
+from src.llm.handles import data_handle
+
+
+def average_rating(product: dict[str, Any]) -> float | None:
+    distribution = product.get("rating_distribution") or {}
+    counts = {stars: distribution.get(f"{stars}_star", 0) for stars in range(1, 6)}
+    total = sum(counts.values())
+    return round(sum(stars * count for stars, count in counts.items()) / total, 1) if total else None
+
+
+def competitor_row(product: dict[str, Any], competitor: dict[str, Any], similarity: float) -> dict[str, Any]:
+    base_price, price = product.get("base_price"), competitor.get("base_price")
+    return {
+        "name": competitor["name"],
+        "brand": competitor.get("brand"),
+        "category": competitor.get("category"),
+        "base_price": price,
+        "price_difference_percent": round((price - base_price) / base_price * 100, 1) if base_price and price else None,
+        "average_rating": average_rating(competitor),
+        "similarity": similarity,
+    }
+
+
+def find_competitors(ctx: RunContext) -> str:
+    product_name = ctx.deps.product_name
+    logger.info(f"Finding competitors for product: {product_name}")
+    catalog = get_catalog()
+
+    if product_name not in catalog.products:
+        logger.error(f"Product not found for competitor search: {product_name}")
+        return json.dumps({"error": f"Product not found: {product_name}"})
+
+    product = catalog.products[product_name]
+    similar = similarity_index(catalog).similar(product_name, settings.COMPETITORS_TOP_K)
+    competitors = [competitor_row(product, catalog.products[match.name], match.score) for match in similar]
+    ctx.deps.competitors = {
+        "product": competitor_row(product, product, 1.0),
+        "competitors": competitors,
+    }
+    ctx.deps.report_progress("competitors_found", product_name=product_name, competitors=len(competitors))
+    return data_handle("competitors", product=product_name, competitors=[competitor["name"] for competitor in competitors])
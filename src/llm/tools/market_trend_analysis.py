@@ -1,33 +1,64 @@
 import json
-from pathlib import Path
-from typing import Any
+from datetime import datetime
 from pydantic_ai import RunContext
 from loguru import logger
 
-
-def _load_market_data() -> dict[str, Any]:
-    current_file = Path(__file__)
-    data_path = current_file.parent.parent.parent.parent / "data" / "market_trends.json"
-
-    try:
-        with open(data_path, "r") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
+from src.catalog import get_catalog
+from src.catalog.rollups import category_key, compare_to_category
+from src.catalog.timeseries import market_history, record_trends, timeseries_store
+from src.llm.handles import data_handle
 
 
 def analyze_market_trends(ctx: RunContext) -> str:
     product_name = ctx.deps.product_name
     logger.info(f"Analyzing market trends for product: {product_name}")
 
-    logger.info("Loading market data")
-    market_data = _load_market_data()
-    logger.info("Market data loaded")
+    market_data = get_catalog().market_trends
 
     if product_name not in market_data:
         logger.error(f"Market data not found for product: {product_name}")
         return json.dumps({"error": f"Market data not found for product: {product_name}"})
 
-    ctx.deps.market_trends = market_data[product_name]
+    trends = market_data[product_name]
+    summary = {}
+    if store := timeseries_store():
+        now = datetime.now().timestamp()
+        record_trends(store, product_name, trends, now)
+        trends = {**trends, "history": market_history(store, product_name, now)}
+        # Only the window names: the aggregates change with every recording, which would defeat the response cache.
+        summary["history_windows"] = list(trends["history"])
+    ctx.deps.market_trends = trends
     logger.info(f"Market trends for product: {product_name} loaded")
-    return json.dumps(market_data[product_name])
+    ctx.deps.report_progress("market_trends_done", product_name=product_name)
+    return data_handle(
+        "market_trends",
+        product=product_name,
+        market_sentiment=trends.get("market_sentiment"),
+        trend_changes=trends.get("trend_changes"),
+        insights=len(trends.get("insights", [])),
+        **summary,
+    )
+
+
+def analyze_category_trends(ctx: RunContext) -> str:
+    product_name = ctx.deps.product_name
+    trends = ctx.deps.market_trends or {}
+    product_info = (ctx.deps.product_info or {}).get("product_info") or {}
+    category = category_key(trends.get("category") or product_info.get("category"))
+    logger.info(f"Analyzing category trends for product: {product_name} (category: {category})")
+
+    rollup = get_catalog().category_trends.get(category) if category else None
+    if rollup is None:
+        logger.error(f"Category trends not found for product: {product_name}")
+        return json.dumps({"error": f"Category trends not found for product: {product_name}"})
+
+    ctx.deps.category_trends = {**rollup, "product_vs_category": compare_to_category(trends, rollup)}
+    ctx.deps.report_progress("category_trends_done", product_name=product_name, category=category)
+    growth = rollup["changes"].get("six_month_growth_percent", {})
+    return data_handle(
+        "category_trends",
+        product=product_name,
+        category=category,
+        product_count=rollup["product_count"],
+        median_six_month_growth_percent=growth.get("median"),
+    )
@@ -1,9 +1,15 @@
+import json
+import uuid
 from datetime import datetime
+from html import escape
 from pathlib import Path
 from typing import Any
 from loguru import logger
 from pydantic_ai import RunContext
 
+from src.config import settings
+from src.llm.handles import data_handle
+
 
 def generate_product_report(
     ctx: RunContext,
@@ -13,6 +19,9 @@ def generate_product_report(
         product_info = product_info.get("product_info")
     sentiment_analysis = ctx.deps.sentiment_analysis
     market_trends = ctx.deps.market_trends
+    category_trends = ctx.deps.category_trends
+    competitors = ctx.deps.competitors
+    review_aspects = ctx.deps.review_aspects
 
     if product_info is None:
         logger.warning("Product info not found - generating empty report")
@@ -24,31 +33,69 @@ def generate_product_report(
         logger.warning("Market trends not found - generating empty report")
         market_trends = {"error": "Data not accessible"}
 
-    reports_dir = Path(__file__).parent.parent.parent.parent / "reports"
-    reports_dir.mkdir(exist_ok=True)
+    reports_dir = Path(settings.REPORTS_DIR)
+    reports_dir.mkdir(parents=True, exist_ok=True)
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    generated_at = datetime.now()
+    timestamp = generated_at.strftime("%Y%m%d_%H%M%S")
     product_name = product_info.get("name", "unknown_product").replace(" ", "_")
-    filename = f"{product_name}_report_{timestamp}"
+    # Analyses of the same product can finish within the same second: the suffix keeps their reports apart.
+    filename = f"{product_name}_report_{timestamp}_{uuid.uuid4().hex[:8]}"
     report_path = reports_dir / filename
 
-    markdown_content = _generate_markdown_content(product_info, sentiment_analysis, market_trends)
-    html_content = _generate_html_content(product_info, sentiment_analysis, market_trends)
-
-    with open(report_path.with_suffix(".md"), "w", encoding="utf-8") as f:
-        f.write(markdown_content)
-    with open(report_path.with_suffix(".html"), "w", encoding="utf-8") as f:
-        f.write(html_content)
-
-    ctx.deps.report_path = str(report_path.with_suffix(".html"))
-    return str(report_path)
+    # Only the structured result is persisted; markdown/html are rendered on demand by the API.
+    report_data = {
+        "generated_at": generated_at.isoformat(),
+        "product_info": product_info,
+        "sentiment_analysis": sentiment_analysis,
+        "review_aspects": review_aspects,
+        "market_trends": market_trends,
+        "category_trends": category_trends,
+        "competitors": competitors,
+    }
+    with open(report_path.with_suffix(".json"), "w", encoding="utf-8") as f:
+        json.dump(report_data, f, default=str)
+
+    ctx.deps.report_path = str(report_path.with_suffix(".json"))
+    ctx.deps.report_progress("report_ready", report_path=ctx.deps.report_path)
+    # The path carries a timestamp, which would make every run's next model request unique.
+    return data_handle("report_path", product=product_info.get("name", "Unknown Product"))
+
+
+def render_report(report_data: dict[str, Any], report_format: str) -> str:
+    generated_at = datetime.fromisoformat(report_data["generated_at"]) if report_data.get("generated_at") else None
+    product_info = report_data.get("product_info") or {"name": "Unknown Product"}
+    sentiment_analysis = report_data.get("sentiment_analysis") or {"error": "Data not accessible"}
+    market_trends = report_data.get("market_trends") or {"error": "Data not accessible"}
+    # Reports written before category trends, competitors and review aspects existed have none.
+    category_trends = report_data.get("category_trends")
+    competitors = report_data.get("competitors")
+    review_aspects = report_data.get("review_aspects")
+
+    if report_format == "markdown":
+        return _generate_markdown_content(
+            product_info, sentiment_analysis, market_trends, generated_at, category_trends, competitors, review_aspects
+        )
+    if report_format == "html":
+        return _generate_html_content(
+            product_info, sentiment_analysis, market_trends, generated_at, category_trends, competitors, review_aspects
+        )
+    if report_format == "json":
+        return json.dumps(report_data, default=str)
+    raise ValueError(f"Unsupported report format: {report_format}")
 
 
 def _generate_markdown_content(
-    product_info: dict[str, Any], sentiment_analysis: dict[str, Any], market_trends: dict[str, Any]
+    product_info: dict[str, Any],
+    sentiment_analysis: dict[str, Any],
+    market_trends: dict[str, Any],
+    generated_at: datetime | None = None,
+    category_trends: dict[str, Any] | None = None,
+    competitors: dict[str, Any] | None = None,
+    review_aspects: dict[str, Any] | None = None,
 ) -> str:
     product_name = product_info.get("name", "Unknown Product")
-    report_date = datetime.now().strftime("%B %d, %Y")
+    report_date = (generated_at or datetime.now()).strftime("%B %d, %Y")
 
     content = f"""# Product Analysis Report: {product_name}
 
@@ -120,6 +167,9 @@ This report provides a comprehensive analysis of **{product_name}** including pr
         content += "⚠️ **Data Not Available**\n\n"
         content += "Customer sentiment analysis data could not be accessed at this time. Please try again later or check data connectivity.\n\n"
 
+    if review_aspects:
+        content += _review_aspects_markdown(review_aspects)
+
     content += """---
 
 ## 📈 Market Trend Analysis
@@ -147,6 +197,12 @@ This report provides a comprehensive analysis of **{product_name}** including pr
             content += f"- Monthly Price Change: {changes.get('monthly_price_change_percent', 'N/A')}%\n"
             content += f"- 6-Month Growth: {changes.get('six_month_growth_percent', 'N/A')}%\n\n"
 
+        if market_trends.get("history"):
+            content += "**Recorded History:**\n"
+            for line in _history_lines(market_trends["history"]):
+                content += f"- {line}\n"
+            content += "\n"
+
         if "insights" in market_trends and market_trends["insights"]:
             content += "**Key Market Insights:**\n"
             for insight in market_trends["insights"]:
@@ -158,6 +214,12 @@ This report provides a comprehensive analysis of **{product_name}** including pr
             "Market trend analysis data could not be accessed at this time. Please try again later or check data connectivity.\n\n"
         )
 
+    if category_trends:
+        content += _category_markdown(category_trends)
+
+    if competitors and competitors.get("competitors"):
+        content += _competitors_markdown(competitors)
+
     content += """---
 
 ## 💡 Recommendations
@@ -188,11 +250,19 @@ Based on the analysis above, here are key recommendations:
     return content
 
 
-def _generate_html_content(product_info: dict[str, Any], sentiment_analysis: dict[str, Any], market_trends: dict[str, Any]) -> str:
+def _generate_html_content(
+    product_info: dict[str, Any],
+    sentiment_analysis: dict[str, Any],
+    market_trends: dict[str, Any],
+    generated_at: datetime | None = None,
+    category_trends: dict[str, Any] | None = None,
+    competitors: dict[str, Any] | None = None,
+    review_aspects: dict[str, Any] | None = None,
+) -> str:
     """Generate HTML content with the same information as the markdown report."""
 
     product_name = product_info.get("name", "Unknown Product")
-    report_date = datetime.now().strftime("%B %d, %Y")
+    report_date = (generated_at or datetime.now()).strftime("%B %d, %Y")
 
     # Start with HTML structure and CSS styling
     html_content = f"""<!DOCTYPE html>
@@ -382,6 +452,9 @@ def _generate_html_content(product_info: dict[str, Any], sentiment_analysis: dic
             </div>
 """
 
+    if review_aspects:
+        html_content += _review_aspects_html(review_aspects)
+
     html_content += """        </div>
 
         <div class="section">
@@ -419,6 +492,14 @@ def _generate_html_content(product_info: dict[str, Any], sentiment_analysis: dic
             html_content += f"                <li>6-Month Growth: {changes.get('six_month_growth_percent', 'N/A')}%</li>\n"
             html_content += "            </ul>\n"
 
+        if market_trends.get("history"):
+            html_content += """            <p><strong>Recorded History:</strong></p>
+            <ul>
+"""
+            for line in _history_lines(market_trends["history"]):
+                html_content += f"                <li>{line}</li>\n"
+            html_content += "            </ul>\n"
+
         if "insights" in market_trends and market_trends["insights"]:
             html_content += """            <p><strong>Key Market Insights:</strong></p>
             <ul>
@@ -433,6 +514,12 @@ def _generate_html_content(product_info: dict[str, Any], sentiment_analysis: dic
             </div>
 """
 
+    if category_trends:
+        html_content += _category_html(category_trends)
+
+    if competitors and competitors.get("competitors"):
+        html_content += _competitors_html(competitors)
+
     html_content += """        </div>
 
         <div class="section recommendations">
@@ -467,6 +554,197 @@ def _generate_html_content(product_info: dict[str, Any], sentiment_analysis: dic
     return html_content
 
 
+def _mentioned_aspects(review_aspects: dict[str, Any]) -> list[tuple[str, dict[str, Any]]]:
+    mentioned = [(aspect, result) for aspect, result in review_aspects.items() if result.get("mentions")]
+    return sorted(mentioned, key=lambda item: item[1]["mentions"], reverse=True)
+
+
+def _review_aspects_markdown(review_aspects: dict[str, Any]) -> str:
+    content = """---
+
+## 🔍 What Reviews Say
+
+"""
+    mentioned = _mentioned_aspects(review_aspects)
+    if not mentioned:
+        return content + "No review mentions the searched aspects.\n\n"
+
+    content += "| Aspect | Mentions | Share of reviews | Average rating | Positive / Negative |\n|---|---|---|---|---|\n"
+    for aspect, result in mentioned:
+        sentiment = result.get("sentiment", {})
+        content += (
+            f"| {aspect.title()} | {result['mentions']} | {result['share_percent']}% | {result['average_rating']}/5.0 "
+            f"| {sentiment.get('positive', 0)} / {sentiment.get('negative', 0)} |\n"
+        )
+    content += "\n"
+    for aspect, result in mentioned:
+        if result.get("snippets"):
+            content += f"**{aspect.title()}:**\n"
+            for match in result["snippets"]:
+                content += f'- "{match["text"]}" ({match["rating"]}/5)\n'
+            content += "\n"
+    return content
+
+
+def _review_aspects_html(review_aspects: dict[str, Any]) -> str:
+    html_content = """        </div>
+
+        <div class="section">
+            <h2><span class="emoji">🔍</span>What Reviews Say</h2>
+"""
+    mentioned = _mentioned_aspects(review_aspects)
+    if not mentioned:
+        return html_content + "            <p>No review mentions the searched aspects.</p>\n"
+
+    html_content += "            <ul>\n"
+    for aspect, result in mentioned:
+        html_content += (
+            f"                <li><strong>{aspect.title()}:</strong> {result['mentions']} mentions ({result['share_percent']}% of reviews), "
+            f"average rating {result['average_rating']}/5.0\n"
+        )
+        if result.get("snippets"):
+            html_content += "                    <ul>\n"
+            for match in result["snippets"]:
+                html_content += f"                        <li>&ldquo;{escape(match['text'])}&rdquo; ({match['rating']}/5)</li>\n"
+            html_content += "                    </ul>\n"
+        html_content += "                </li>\n"
+    html_content += "            </ul>\n"
+    return html_content
+
+
+HISTORY_LABELS = {
+    "price": "Price",
+    "search_volume": "Search Volume Index",
+    "price_index": "Price Index",
+    "competition_index": "Competition Index",
+}
+
+
+def _history_lines(history: dict[str, dict[str, Any]]) -> list[str]:
+    lines = []
+    for window, aggregates in history.items():
+        for name, label in HISTORY_LABELS.items():
+            aggregate = aggregates.get(name)
+            if not aggregate:
+                continue
+            prefix = "$" if name == "price" else ""
+            change = aggregate.get("change_percent")
+            lines.append(
+                f"Last {window.removesuffix('d')} days, {label}: average {prefix}{aggregate['mean']} "
+                f"(min {prefix}{aggregate['min']}, max {prefix}{aggregate['max']}, {aggregate['count']} observations"
+                + (f", change {change:+g}%)" if change is not None else ")")
+            )
+    return lines
+
+
+CATEGORY_METRIC_LABELS = {
+    "search_volume": "Search Volume Index",
+    "price_index": "Price Index",
+    "competition_index": "Competition Index",
+    "six_month_growth_percent": "6-Month Growth (%)",
+}
+
+
+def _category_rows(category_trends: dict[str, Any]) -> list[tuple[str, dict[str, Any], float | None]]:
+    summaries = {**category_trends.get("metrics", {}), **category_trends.get("changes", {})}
+    differences = category_trends.get("product_vs_category", {})
+    return [
+        (label, summaries[name], differences.get(f"{name}_vs_median"))
+        for name, label in CATEGORY_METRIC_LABELS.items()
+        if name in summaries
+    ]
+
+
+def _category_markdown(category_trends: dict[str, Any]) -> str:
+    content = f"""---
+
+## 🗂️ Category Context
+
+**Category:** {category_trends.get("category", "unknown").title()} ({category_trends.get("product_count", 0)} products)
+
+| Metric | Category median | Range (p25 - p75) | Product vs median |
+|---|---|---|---|
+"""
+    for label, summary, difference in _category_rows(category_trends):
+        versus = f"{difference:+g}" if difference is not None else "N/A"
+        content += f"| {label} | {summary['median']} | {summary['p25']} - {summary['p75']} | {versus} |\n"
+
+    distribution = category_trends.get("growth_distribution", {})
+    if distribution:
+        content += "\n**6-Month Growth Distribution:** "
+        content += ", ".join(f"{band}: {count}" for band, count in distribution.items()) + "\n\n"
+    return content
+
+
+def _category_html(category_trends: dict[str, Any]) -> str:
+    html_content = f"""        </div>
+
+        <div class="section">
+            <h2><span class="emoji">🗂️</span>Category Context</h2>
+            <div class="metric"><strong>Category:</strong> {category_trends.get("category", "unknown").title()}</div>
+            <div class="metric"><strong>Products:</strong> {category_trends.get("product_count", 0)}</div>
+            <ul>
+"""
+    for label, summary, difference in _category_rows(category_trends):
+        versus = f" (product: {difference:+g} vs median)" if difference is not None else ""
+        html_content += (
+            f"                <li>{label}: median {summary['median']}, p25-p75 {summary['p25']} - {summary['p75']}{versus}</li>\n"
+        )
+    html_content += "            </ul>\n"
+
+    distribution = category_trends.get("growth_distribution", {})
+    if distribution:
+        bands = ", ".join(f"{band}: {count}" for band, count in distribution.items())
+        html_content += f"            <p><strong>6-Month Growth Distribution:</strong> {bands}</p>\n"
+    return html_content
+
+
+def _competitor_cells(row: dict[str, Any]) -> tuple[str, str, str]:
+    price = f"${row['base_price']}" if row.get("base_price") is not None else "N/A"
+    difference = row.get("price_difference_percent")
+    versus = f"{difference:+g}%" if difference is not None else "N/A"
+    rating = f"{row['average_rating']}/5.0" if row.get("average_rating") is not None else "N/A"
+    return price, versus, rating
+
+
+def _competitors_markdown(competitors: dict[str, Any]) -> str:
+    content = """---
+
+## 🥊 Competitor Comparison
+
+Most similar catalog products (description, specifications, category and brand).
+
+| Product | Brand | Price | Price vs product | Average rating | Similarity |
+|---|---|---|---|---|---|
+"""
+    product = competitors.get("product")
+    if product:
+        price, _, rating = _competitor_cells(product)
+        content += f"| **{product['name']}** | {product.get('brand') or 'N/A'} | {price} | - | {rating} | - |\n"
+    for row in competitors["competitors"]:
+        price, versus, rating = _competitor_cells(row)
+        content += f"| {row['name']} | {row.get('brand') or 'N/A'} | {price} | {versus} | {rating} | {row['similarity']} |\n"
+    return content + "\n"
+
+
+def _competitors_html(competitors: dict[str, Any]) -> str:
+    html_content = """        </div>
+
+        <div class="section">
+            <h2><span class="emoji">🥊</span>Competitor Comparison</h2>
+            <p>Most similar catalog products (description, specifications, category and brand).</p>
+            <ul>
+"""
+    for row in competitors["competitors"]:
+        price, versus, rating = _competitor_cells(row)
+        html_content += (
+            f"                <li><strong>{row['name']}</strong> ({row.get('brand') or 'N/A'}): {price} ({versus} vs product), "
+            f"rating {rating}, similarity {row['similarity']}</li>\n"
+        )
+    html_content += "            </ul>\n"
+    return html_content
+
+
 def _generate_recommendations(sentiment_analysis: dict[str, Any], market_trends: dict[str, Any]) -> list[str]:
     recommendations = []
 
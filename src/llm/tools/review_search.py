@@ -0,0 +1,42 @@
+import json
+
+from loguru import logger
+from pydantic_ai import RunContext
+
+from src.catalog import get_catalog
+from src.catalog.review_index import ASPECTS, review_search
+from src.config import settings
+from src.llm.handles import data_handle
+
+
+def search_review_aspects(ctx: RunContext, aspects: list[str] | None = None) -> str:
+    """Count the reviews mentioning each aspect (battery, camera, price...) and return their best matching snippets.
+
+    Args:
+        aspects: Aspects to search for; every common aspect when omitted.
+    """
+    product_name = ctx.deps.product_name
+    logger.info(f"Searching reviews by aspect for product: {product_name}")
+    reviews = get_catalog().reviews.get(product_name) if product_name else None
+    if not reviews:
+        logger.error(f"Reviews not found for product: {product_name}")
+        return json.dumps({"error": f"Reviews not found for product: {product_name}"})
+
+    index = review_search(get_catalog()).index(product_name, reviews)
+    results = {aspect: index.aspect(aspect, settings.REVIEW_SNIPPETS_PER_ASPECT) for aspect in aspects or ASPECTS}
+    ctx.deps.review_aspects = results
+    ctx.deps.report_progress("review_aspects_done", product_name=product_name, aspects=len(results))
+    return data_handle(
+        "review_aspects",
+        product=product_name,
+        total_reviews=len(index.reviews),
+        aspects={
+            aspect: {
+                "mentions": result["mentions"],
+                "average_rating": result["average_rating"],
+                "snippets": [match["text"] for match in result["snippets"]],
+            }
+            for aspect, result in results.items()
+            if result["mentions"]
+        },
+    )
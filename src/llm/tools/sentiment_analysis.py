@@ -3,6 +3,8 @@ from typing import Any
 from loguru import logger
 from pydantic_ai import RunContext
 
+from src.llm.handles import data_handle
+
 
 def _analyze_product_sentiment(reviews: list[dict[str, Any]]) -> dict[str, Any]:
     if not reviews:
@@ -60,4 +62,5 @@ def get_product_sentiment_analysis(ctx: RunContext) -> str:
 
     ctx.deps.sentiment_analysis = analysis
     logger.info(f"Sentiment analysis for product: {product_name} completed")
-    return json.dumps(analysis, indent=2)
+    ctx.deps.report_progress("sentiment_done", product_name=product_name, overall_sentiment=analysis["overall_sentiment"])
+    return data_handle("sentiment_analysis", **analysis)
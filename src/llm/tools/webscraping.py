@@ -2,74 +2,47 @@ import json
 from datetime import datetime, timedelta
 from typing import Any
 from fuzzywuzzy import fuzz
-from pathlib import Path
 from pydantic_ai import RunContext
 from loguru import logger
 
-
-current_dir = Path(__file__).parent
-data_dir = current_dir / ".." / ".." / ".." / "data"
-
-
-def load_retailers():
-    retailers_path = data_dir / "retailers.json"
-    with open(retailers_path, "r") as f:
-        return json.load(f)
-
-
-def load_products():
-    products_path = data_dir / "products.json"
-    with open(products_path, "r") as f:
-        return json.load(f)
-
-
-def load_retailer_config():
-    config_path = data_dir / "retailer_config.json"
-    with open(config_path, "r") as f:
-        return json.load(f)
-
-
-def load_market_data():
-    market_path = data_dir / "market_data.json"
-    with open(market_path, "r") as f:
-        return json.load(f)
-
-
-def load_reviews():
-    reviews_path = data_dir / "reviews.json"
-    with open(reviews_path, "r") as f:
-        return json.load(f)
-
-
-retailers = load_retailers()
-product_database = load_products()
-retailer_config = load_retailer_config()
-market_data = load_market_data()
-reviews = load_reviews()
+from src.catalog import get_catalog
+from src.catalog.resolver import product_index
+from src.catalog.timeseries import record_prices, timeseries_store
+from src.llm.handles import data_handle
 
 
 def normalize_product_name(product_name: str) -> str:
     return product_name.lower().strip()
 
 
-def get_most_similar_product(product_name: str) -> str:
-    return max(product_database, key=lambda x: fuzz.token_sort_ratio(product_name, x["name"]))["name"]
+def get_most_similar_product(ctx: RunContext, product_name: str) -> str:
+    catalog = get_catalog()
+    match = product_index(catalog).resolve(product_name, threshold=0)
+    # Queries sharing no word with any product name still get the closest one.
+    most_similar_product = (
+        match.name if match else max(catalog.products, key=lambda name: fuzz.token_sort_ratio(product_name, name))
+    )
+    ctx.deps.report_progress("resolved", query=product_name, product_name=most_similar_product)
+    return most_similar_product
 
 
 def generate_delivery_date() -> str:
-    days_ahead = market_data["delivery"]["default_days"]
+    days_ahead = get_catalog().market_data["delivery"]["default_days"]
     delivery_date = datetime.now() + timedelta(days=days_ahead)
     return delivery_date.strftime("%Y-%m-%d")
 
 
 def available_products(ctx: RunContext) -> str:
-    ctx.available_products = [product["name"] for product in product_database]
-    return json.dumps([product["name"] for product in product_database])
+    ctx.available_products = list(get_catalog().products)
+    return json.dumps(ctx.available_products)
 
 
 def generate_retailer_data(base_price: float, retailer: str) -> dict[str, Any]:
+    catalog = get_catalog()
+    market_data = catalog.market_data
+
     # Get retailer-specific configuration
-    retailer_info = retailer_config.get(retailer, {})
+    retailer_info = catalog.retailer_config.get(retailer, {})
 
     # Use fixed price variation
     price_variation = market_data["pricing"]["base_variation"]
@@ -117,14 +90,32 @@ def generate_rating_distribution(product_info: dict | None = None) -> dict[str,
     raise ValueError("Product info does not contain rating distribution")
 
 
+def review_stats(reviews: list[dict[str, Any]]) -> dict[str, Any]:
+    rating_counts = {f"{stars}_star": 0 for stars in range(5, 0, -1)}
+    total_rating = 0
+    for review in reviews:
+        rating = review.get("rating", 0)
+        total_rating += rating
+        if f"{rating}_star" in rating_counts:
+            rating_counts[f"{rating}_star"] += 1
+    return {
+        "review_count": len(reviews),
+        "average_rating": round(total_rating / len(reviews), 1) if reviews else None,
+        "rating_counts": rating_counts,
+    }
+
+
 def fetch_product_data(ctx: RunContext, product_name: str) -> str:
-    if product_name not in [product["name"] for product in product_database]:
+    catalog = get_catalog()
+    if product_name not in catalog.products:
         return json.dumps({"error": "Product not found"})
     logger.info(f"Product data for product: {product_name} loaded")
     ctx.deps.product_name = product_name
 
-    product_info = next(product for product in product_database if product["name"] == product_name)
-    retailer_data = [generate_retailer_data(product_info["base_price"], retailer) for retailer in retailers]
+    product_info = catalog.products[product_name]
+    retailer_data = [generate_retailer_data(product_info["base_price"], retailer) for retailer in catalog.retailers]
+    if store := timeseries_store():
+        record_prices(store, product_name, retailer_data, datetime.now().timestamp())
     prices = [data["price"] for data in retailer_data if data["availability"] != "Out of Stock"]
     min_price = min(prices) if prices else None
     max_price = max(prices) if prices else None
@@ -163,22 +154,35 @@ def fetch_product_data(ctx: RunContext, product_name: str) -> str:
         "scraping_metadata": {
             "timestamp": datetime.now().isoformat(),
             "search_query": product_name,
-            "data_sources": len(retailers),
+            "data_sources": len(catalog.retailers),
             "success_rate": 100.0,
         },
     }
     ctx.deps.product_info = product_info
-    return json.dumps(product_info)
+    ctx.deps.report_progress("product_data_fetched", product_name=product_name, retailers=len(retailer_data))
+    return data_handle(
+        "product_info",
+        product=product_name,
+        brand=product_info["product_info"]["brand"],
+        category=product_info["product_info"]["category"],
+        pricing_data=product_info["pricing_data"],
+        availability_summary=product_info["availability_summary"],
+        average_rating=avg_rating,
+        total_reviews=total_reviews,
+    )
 
 
 def fetch_product_reviews(ctx: RunContext, product_name: str) -> str:
     logger.info(f"Fetching reviews for product: {product_name}")
+    catalog = get_catalog()
 
-    if product_name not in [product["name"] for product in product_database]:
+    if product_name not in catalog.products:
         return json.dumps({"error": "Product not found"})
 
-    if product_name in reviews:
-        ctx.deps.reviews_data = reviews[product_name]
+    if product_name in catalog.reviews:
+        product_reviews = catalog.reviews[product_name]
+        ctx.deps.reviews_data = product_reviews
         logger.info(f"Reviews for product: {product_name} loaded")
-        return json.dumps(reviews[product_name])
+        ctx.deps.report_progress("reviews_fetched", product_name=product_name, review_count=len(product_reviews))
+        return data_handle("reviews_data", product=product_name, **review_stats(product_reviews))
     return json.dumps({"error": "Reviews not found for this product"})
@@ -0,0 +1,107 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, ToolCallPart, ToolReturnPart
+from pydantic_ai.models.wrapper import WrapperModel
+
+from src.llm.pricing import cost_usd
+from src.monitoring.metrics import model_request_duration_seconds
+
+FINAL_STEP = "final"
+
+
+@dataclass
+class StepUsage:
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    model_latency_seconds: float = 0.0
+    tool_output_bytes: int = 0
+    # The model that answered the step, and the cost of its tokens at that model's rates.
+    model: str | None = None
+    cost_usd: float = 0.0
+
+
+class UsageRecorder:
+    """Collects token counts, request counts and model latency for one analysis, per step.
+
+    A step is named after the tool the model called in its response (or "final" when it called none), so a
+    step's tokens are what it cost the model to decide on that tool; `tool_output_bytes` is the size of what
+    the tool returned, which is resent to the model on every later request.
+    """
+
+    def __init__(self):
+        self.steps: dict[str, StepUsage] = {}
+
+    def _step(self, name: str) -> StepUsage:
+        return self.steps.setdefault(name, StepUsage())
+
+    def record_request(self, messages: list[ModelMessage]) -> None:
+        if messages and isinstance(messages[-1], ModelRequest):
+            for part in messages[-1].parts:
+                if isinstance(part, ToolReturnPart):
+                    self._step(part.tool_name).tool_output_bytes += len(part.model_response_str().encode())
+
+    def record_response(self, response: ModelResponse, latency_seconds: float) -> None:
+        tools = [part.tool_name for part in response.parts if isinstance(part, ToolCallPart)]
+        step = self._step("+".join(tools) or FINAL_STEP)
+        step.requests += 1
+        step.input_tokens += response.usage.input_tokens
+        step.output_tokens += response.usage.output_tokens
+        step.model_latency_seconds += latency_seconds
+        step.model = response.model_name
+        step.cost_usd += cost_usd(response.usage.input_tokens, response.usage.output_tokens, response.model_name)
+
+    def totals(self) -> dict[str, Any]:
+        return {
+            "input_tokens": sum(step.input_tokens for step in self.steps.values()),
+            "output_tokens": sum(step.output_tokens for step in self.steps.values()),
+            "model_requests": sum(step.requests for step in self.steps.values()),
+            "model_latency_seconds": round(sum(step.model_latency_seconds for step in self.steps.values()), 3),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        steps = {
+            name: {
+                **asdict(step),
+                "model_latency_seconds": round(step.model_latency_seconds, 3),
+                "cost_usd": round(step.cost_usd, 6),
+            }
+            for name, step in self.steps.items()
+        }
+        return {**self.totals(), "steps": steps}
+
+
+_current_recorder: ContextVar[UsageRecorder | None] = ContextVar("usage_recorder", default=None)
+
+
+@contextmanager
+def track_usage() -> Iterator[UsageRecorder]:
+    """Attribute the model requests made in this context (i.e. by this analysis' task) to a fresh recorder."""
+    recorder = UsageRecorder()
+    token = _current_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current_recorder.reset(token)
+
+
+class MeteredModel(WrapperModel):
+    """Times every model request and reports it to the recorder of the analysis that made it."""
+
+    async def request(self, messages: list[ModelMessage], *args: Any, **kwargs: Any) -> ModelResponse:
+        recorder = _current_recorder.get()
+        if recorder is not None:
+            recorder.record_request(messages)
+        started = time.perf_counter()
+        response = await super().request(messages, *args, **kwargs)
+        latency = time.perf_counter() - started
+        # Labelled with the model that answered, which a RoutedModel picks per request.
+        model_request_duration_seconds.observe(latency, model=response.model_name or self.model_name)
+        if recorder is not None:
+            recorder.record_response(response, latency)
+        return response
@@ -0,0 +1,261 @@
+import abc
+import functools
+import inspect
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+LabelSet = tuple[tuple[str, str], ...]
+Sample = tuple[str, dict[str, str], float]
+
+
+def _label_set(labels: dict[str, object]) -> LabelSet:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _nearest_rank(sorted_values: list[float], quantile: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(quantile * len(sorted_values)))]
+
+
+class Metric(abc.ABC):
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._lock = threading.Lock()
+
+    @abc.abstractmethod
+    def samples(self) -> list[Sample]: ...
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str):
+        super().__init__(name, documentation)
+        self._values: dict[LabelSet, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_set(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_set(labels), 0)
+
+    def samples(self) -> list[Sample]:
+        with self._lock:
+            return [(self.name, dict(labels), value) for labels, value in self._values.items()]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[_label_set(labels)] = value
+
+    @contextmanager
+    def track_inprogress(self, **labels) -> Iterator[None]:
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Summary(Metric):
+    """Latency summary whose quantiles are computed over the most recent `window` observations."""
+
+    type = "summary"
+    quantiles = (0.5, 0.95, 0.99)
+
+    def __init__(self, name: str, documentation: str, window: int = 1024):
+        super().__init__(name, documentation)
+        self.window = window
+        self._observations: dict[LabelSet, deque[float]] = {}
+        self._counts: dict[LabelSet, int] = {}
+        self._sums: dict[LabelSet, float] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_set(labels)
+        with self._lock:
+            if key not in self._observations:
+                self._observations[key] = deque(maxlen=self.window)
+                self._counts[key] = 0
+                self._sums[key] = 0.0
+            self._observations[key].append(value)
+            self._counts[key] += 1
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def quantile(self, quantile: float, **labels) -> float | None:
+        with self._lock:
+            observations = sorted(self._observations.get(_label_set(labels), ()))
+        return _nearest_rank(observations, quantile) if observations else None
+
+    def percentiles(self, label: str | None = None) -> dict:
+        """p50/p95/p99 overall, or keyed by the value of `label` when given."""
+        with self._lock:
+            observations = {key: list(values) for key, values in self._observations.items()}
+        grouped: dict[str | None, list[float]] = {}
+        for key, values in observations.items():
+            grouped.setdefault(dict(key).get(label) if label else None, []).extend(values)
+
+        def summarize(values: list[float]) -> dict[str, float]:
+            values = sorted(values)
+            return {f"p{int(quantile * 100)}": round(_nearest_rank(values, quantile), 6) for quantile in self.quantiles}
+
+        if label is None:
+            return summarize(grouped[None]) if grouped else {}
+        return {group: summarize(values) for group, values in grouped.items()}
+
+    def samples(self) -> list[Sample]:
+        samples = []
+        with self._lock:
+            snapshot = [(key, sorted(values), self._counts[key], self._sums[key]) for key, values in self._observations.items()]
+        for key, observations, count, total in snapshot:
+            labels = dict(key)
+            for quantile in self.quantiles:
+                samples.append((self.name, {**labels, "quantile": str(quantile)}, _nearest_rank(observations, quantile)))
+            samples.append((f"{self.name}_count", labels, count))
+            samples.append((f"{self.name}_sum", labels, total))
+        return samples
+
+
+def timed(summary: Summary, **labels) -> Callable:
+    """Decorate a sync or async function so each call is observed in `summary`."""
+
+    def decorator(function: Callable) -> Callable:
+        if inspect.iscoroutinefunction(function):
+
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                with summary.time(**labels):
+                    return await function(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with summary.time(**labels):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class CollectedMetric(Metric):
+    """Samples read at collection time from elsewhere, such as the registered caches' stats."""
+
+    def __init__(self, name: str, documentation: str, metric_type: str, samples: list[Sample]):
+        super().__init__(name, documentation)
+        self.type = metric_type
+        self._samples = samples
+
+    def samples(self) -> list[Sample]:
+        return self._samples
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._caches: dict[str, Callable[[], tuple[int, int]]] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        return self.register(Counter(name, documentation))
+
+    def gauge(self, name: str, documentation: str) -> Gauge:
+        return self.register(Gauge(name, documentation))
+
+    def summary(self, name: str, documentation: str) -> Summary:
+        return self.register(Summary(name, documentation))
+
+    def register_cache(self, name: str, stats: Callable[[], tuple[int, int]]) -> None:
+        """Expose a cache's hit rate; `stats` returns its (hits, misses) counts."""
+        self._caches[name] = stats
+
+    def cache_stats(self) -> dict[str, dict[str, float]]:
+        stats = {}
+        for name, collect in list(self._caches.items()):
+            hits, misses = collect()
+            total = hits + misses
+            stats[name] = {"hits": hits, "misses": misses, "hit_ratio": round(hits / total, 4) if total else 0.0}
+        return stats
+
+    def collect(self) -> list[tuple[Metric, list[Sample]]]:
+        collected = [(metric, metric.samples()) for metric in self._metrics.values()]
+        cache_stats = self.cache_stats()
+        for suffix, field in (("hits_total", "hits"), ("misses_total", "misses"), ("hit_ratio", "hit_ratio")):
+            metric = CollectedMetric(
+                f"cache_{suffix}",
+                f"Cache {field.replace('_', ' ')} per cache",
+                "gauge" if field == "hit_ratio" else "counter",
+                [(f"cache_{suffix}", {"cache": name}, values[field]) for name, values in cache_stats.items()],
+            )
+            collected.append((metric, metric.samples()))
+        return collected
+
+    def render_prometheus(self) -> str:
+        lines = []
+        for metric, samples in self.collect():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in samples:
+                rendered_labels = ",".join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+                lines.append(f"{name}{{{rendered_labels}}} {value}" if rendered_labels else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+registry = MetricsRegistry()
+
+analyses_queued = registry.gauge("analyses_queued", "Analyses waiting for a concurrency slot")
+analyses_running = registry.gauge("analyses_running", "Analyses currently executing the agent")
+analyses_unresolved_total = registry.counter(
+    "analyses_unresolved_total", "Analyses failed before running because their query matches no catalog product"
+)
+analysis_queue_wait_seconds = registry.summary("analysis_queue_wait_seconds", "Time analyses wait for a slot per priority")
+analysis_duration_seconds = registry.summary("analysis_duration_seconds", "End-to-end agent run latency")
+tool_duration_seconds = registry.summary("tool_duration_seconds", "Agent tool call latency per tool")
+model_request_duration_seconds = registry.summary("model_request_duration_seconds", "LLM request latency per model")
+model_requests_waiting = registry.gauge("model_requests_waiting", "LLM requests waiting for the rate governor")
+model_rate_limit_wait_seconds = registry.summary("model_rate_limit_wait_seconds", "Time LLM requests wait for the rate governor")
+model_rate_limited_total = registry.counter("model_rate_limited_total", "LLM requests rejected by the provider's rate limits")
+db_operation_duration_seconds = registry.summary("db_operation_duration_seconds", "Database operation latency per operation")
+component_loaded = registry.gauge("component_loaded", "1 once a startup component (catalog, agent) is loaded")
+
+
+def live_metrics() -> dict:
+    return {
+        "queue_depth": sum(value for _, _, value in analyses_queued.samples()),
+        "running_analyses": sum(value for _, _, value in analyses_running.samples()),
+        "queue_wait_seconds": analysis_queue_wait_seconds.percentiles("priority"),
+        "analysis_latency_seconds": analysis_duration_seconds.percentiles(),
+        "tool_latency_seconds": tool_duration_seconds.percentiles("tool"),
+        "model_latency_seconds": model_request_duration_seconds.percentiles("model"),
+        "model_rate_limit_wait_seconds": model_rate_limit_wait_seconds.percentiles(),
+        "db_latency_seconds": db_operation_duration_seconds.percentiles("operation"),
+        "caches": registry.cache_stats(),
+    }
@@ -0,0 +1,152 @@
+import functools
+import inspect
+import random
+import sys
+import threading
+from collections import Counter
+from collections.abc import Callable, Coroutine, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from src.config import settings
+
+WAITING_FRAME = "(waiting)"
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({code.co_filename}:{code.co_firstlineno})"
+
+
+def _stack_until(frame: FrameType | None, anchor: FrameType) -> list[str] | None:
+    """Frame names from `anchor` (root) to `frame` (leaf), or None if `anchor` is not on the stack."""
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        if frame is anchor:
+            return names[::-1]
+        frame = frame.f_back
+    return None
+
+
+def _await_chain(coroutine: Any) -> list[str]:
+    """Frame names of a suspended coroutine and of everything it is awaiting, outermost first."""
+    names = []
+    while coroutine is not None:
+        frame = getattr(coroutine, "cr_frame", None) or getattr(coroutine, "gi_frame", None)
+        if frame is not None:
+            names.append(_frame_name(frame))
+        coroutine = getattr(coroutine, "cr_await", None) or getattr(coroutine, "gi_yieldfrom", None)
+    return names
+
+
+class SamplingProfiler:
+    """Wall-clock sampling profiler for one coroutine, in folded-stack format (flamegraph.pl, speedscope, inferno).
+
+    Every `interval` seconds a background thread records where the coroutine is:
+    - running on the event loop: the stack from the coroutine's frame up;
+    - suspended: its await chain, then either the stack of a worker thread running one of its sync tools
+      (see `profiled_tool`) or a "(waiting)" leaf while it waits on I/O such as the model API.
+    Other tasks sharing the event loop are not sampled.
+    """
+
+    def __init__(self, coroutine: Coroutine, interval: float = 0.005):
+        self.coroutine = coroutine
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._loop_thread = threading.get_ident()
+        self._workers: dict[int, FrameType] = {}
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    @contextmanager
+    def worker(self, anchor: FrameType) -> Iterator[None]:
+        """Attribute the current thread's stack above `anchor` to the profiled coroutine while in this block."""
+        thread = threading.get_ident()
+        if thread == self._loop_thread:
+            yield
+            return
+        self._workers[thread] = anchor
+        try:
+            yield
+        finally:
+            self._workers.pop(thread, None)
+
+    def sample(self) -> None:
+        frames = sys._current_frames()
+        anchor = self.coroutine.cr_frame
+        if anchor is None:
+            return
+        stack = _stack_until(frames.get(self._loop_thread), anchor)
+        if stack is None:
+            stack = _await_chain(self.coroutine)
+            for thread, worker_anchor in list(self._workers.items()):
+                worker_stack = _stack_until(frames.get(thread), worker_anchor)
+                if worker_stack:
+                    stack = stack + worker_stack
+                    break
+            else:
+                stack.append(WAITING_FRAME)
+        self.samples[";".join(stack)] += 1
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.sample()
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+_active_profiler: ContextVar[SamplingProfiler | None] = ContextVar("active_profiler", default=None)
+
+
+async def profile_coroutine(coroutine: Coroutine, interval: float = 0.005) -> tuple[Any, SamplingProfiler]:
+    """Await `coroutine` under a SamplingProfiler; return its result and the profiler."""
+    profiler = SamplingProfiler(coroutine, interval)
+    token = _active_profiler.set(profiler)
+    profiler.start()
+    try:
+        result = await coroutine
+    finally:
+        profiler.stop()
+        _active_profiler.reset(token)
+    return result, profiler
+
+
+def profiled_tool(tool: Callable) -> Callable:
+    """Let the active profiler, if any, sample this tool when pydantic-ai runs it in a worker thread."""
+    if inspect.iscoroutinefunction(tool):
+        # Async tools run on the event loop, where the profiler already sees them.
+        return tool
+
+    @functools.wraps(tool)
+    def wrapper(*args, **kwargs):
+        profiler = _active_profiler.get()
+        if profiler is None:
+            return tool(*args, **kwargs)
+        with profiler.worker(sys._getframe()):
+            return tool(*args, **kwargs)
+
+    return wrapper
+
+
+def should_profile(requested: bool = False) -> bool:
+    """Profile when the client asked for it, otherwise for a PROFILE_SAMPLE_RATE fraction of analyses."""
+    return requested or random.random() < settings.PROFILE_SAMPLE_RATE
+
+
+def save_profile(analysis_id: str, profiler: SamplingProfiler) -> str:
+    path = Path(settings.PROFILES_DIR) / f"{analysis_id}.folded"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(profiler.folded())
+    return str(path)
@@ -0,0 +1,100 @@
+import functools
+import inspect
+import json
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from typing import Any
+
+from src.config import settings
+
+TRACER_NAME = "ecommerce-research-agent"
+_NO_SPAN = nullcontext()
+
+
+def tracing_enabled() -> bool:
+    return settings.TRACING_ENABLED
+
+
+def configure_tracing(app) -> None:
+    """Export spans through logfire and instrument FastAPI requests and sqlite3 queries; a no-op unless TRACING_ENABLED."""
+    if not tracing_enabled():
+        return
+    import logfire
+
+    # Spans go to Logfire when LOGFIRE_TOKEN is set, and to any OTEL_EXPORTER_OTLP_* endpoint configured in the environment.
+    logfire.configure(service_name=settings.TRACING_SERVICE_NAME, send_to_logfire="if-token-present", console=False)
+    logfire.instrument_fastapi(app)
+    logfire.instrument_sqlite3()
+
+
+def get_tracer():
+    from opentelemetry import trace
+
+    return trace.get_tracer(TRACER_NAME)
+
+
+def payload_size(value: Any) -> int:
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode())
+    return len(json.dumps(value, default=str).encode())
+
+
+def span(name: str, **attributes: Any):
+    """Context manager yielding an OpenTelemetry span, or a shared null context when tracing is off."""
+    if not tracing_enabled():
+        return _NO_SPAN
+    return get_tracer().start_as_current_span(name, attributes=attributes)
+
+
+@contextmanager
+def _payload_span(name: str, attributes: dict[str, Any], args: tuple, kwargs: dict) -> Iterator[Any]:
+    # The first positional argument is the RunContext (tools) or self (methods) and is not part of the payload.
+    payload = {"args": list(args[1:]), "kwargs": kwargs}
+    with get_tracer().start_as_current_span(name, attributes=attributes) as current:
+        current.set_attribute("payload.input_bytes", payload_size(payload))
+        yield current
+
+
+def traced(name: str, **attributes: Any) -> Callable:
+    """Decorate a sync or async function to run inside a span recording its input and output payload sizes.
+
+    The switch is read once, at decoration time: with tracing off the function is returned untouched.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        if not tracing_enabled():
+            return function
+
+        if inspect.iscoroutinefunction(function):
+
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                with _payload_span(name, attributes, args, kwargs) as current:
+                    result = await function(*args, **kwargs)
+                    current.set_attribute("payload.output_bytes", payload_size(result))
+                    return result
+
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with _payload_span(name, attributes, args, kwargs) as current:
+                result = function(*args, **kwargs)
+                current.set_attribute("payload.output_bytes", payload_size(result))
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+def record_usage(current, usage) -> None:
+    """Attach a pydantic-ai RunUsage to `current` (a span, or None when tracing is off)."""
+    if current is None:
+        return
+    current.set_attribute("gen_ai.usage.input_tokens", usage.input_tokens)
+    current.set_attribute("gen_ai.usage.output_tokens", usage.output_tokens)
+    current.set_attribute("gen_ai.usage.requests", usage.requests)
+    current.set_attribute("gen_ai.usage.tool_calls", usage.tool_calls)
@@ -0,0 +1,77 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.models.analysis.responses import AnalysisStatus
+from src.api.services.batch import batches, create_batch, run_batch, stored_batch
+from src.api.services.database_service import DatabaseService
+from src.cli import read_queries
+
+
+@pytest.mark.asyncio
+@patch("src.api.services.batch.generate_research_agent")
+@patch("src.api.services.batch.execute_analysis", new_callable=AsyncMock)
+async def test_run_batch_shares_agent_and_writes_results(mock_execute_analysis, mock_generate_agent, tmp_path):
+    db_service = DatabaseService(str(tmp_path / "batch.db"))
+    mock_execute_analysis.side_effect = lambda analysis_id, query, agent: (
+        {"report_path": f"reports/{query}.json", "error": None}
+        if query != "PlayStation 5"
+        else {"report_path": None, "error": "boom"}
+    )
+
+    batch = create_batch(["iPhone 15 Pro", "MacBook Pro 14", "playstation 5", "qwzx vbnm"], db_service)
+    assert (batch.failed, batch.running) == (1, 3)
+    await run_batch(batch, db_service, concurrency=2)
+
+    mock_generate_agent.assert_called_once()
+    assert {call.args[2] for call in mock_execute_analysis.call_args_list} == {mock_generate_agent.return_value}
+    assert mock_execute_analysis.call_count == 3
+    assert (batch.completed, batch.failed, batch.running) == (2, 2, 0)
+    assert batch.to_dict()["throughput_per_minute"] > 0
+
+    rows = {row["query"]: row for row in db_service.get_all_analyses()}
+    assert rows["iPhone 15 Pro"]["status"] == AnalysisStatus.COMPLETED
+    assert rows["iPhone 15 Pro"]["report"] == "reports/iPhone 15 Pro.json"
+    assert rows["playstation 5"]["product_name"] == "PlayStation 5"
+    assert rows["playstation 5"]["status"] == AnalysisStatus.FAILED
+    assert rows["playstation 5"]["error"] == "boom"
+    assert rows["qwzx vbnm"]["product_name"] is None
+    assert rows["qwzx vbnm"]["error"].startswith("Product not found")
+
+
+def test_batch_status_is_read_back_from_the_database(monkeypatch, tmp_path):
+    db_service = DatabaseService(str(tmp_path / "batch.db"))
+    monkeypatch.setattr("src.api.routes.analysis.db_service", db_service)
+    monkeypatch.setattr("src.api.services.batch.generate_research_agent", lambda: None)
+
+    async def execute(analysis_id, product_name, agent=None):
+        return {"report_path": f"reports/{product_name}.json", "error": None}
+
+    monkeypatch.setattr("src.api.services.batch.execute_analysis", execute)
+    batch = create_batch(["iPhone 15 Pro", "MacBook Pro 14", "qwzx vbnm"], db_service)
+    assert (stored_batch(batch.batch_id, db_service).failed, stored_batch(batch.batch_id, db_service).running) == (1, 2)
+    assert batch.batch_id in batches
+    asyncio.run(run_batch(batch, db_service))
+
+    # Finished batches are only kept in the database, as for a worker that did not run the batch.
+    assert batch.batch_id not in batches
+    response = TestClient(app).get(f"/api/v1/analyze/batch/{batch.batch_id}").json()
+
+    assert (response["total"], response["completed"], response["failed"], response["running"]) == (3, 2, 1, 0)
+    assert response["completed_at"] is not None
+    assert stored_batch("unknown", db_service) is None
+
+
+def test_read_queries(tmp_path):
+    path = tmp_path / "products.jsonl"
+    path.write_text(json.dumps({"query": "iPhone 15 Pro"}) + "\n\n" + json.dumps("MacBook Pro 14") + "\n")
+
+    assert read_queries(path) == ["iPhone 15 Pro", "MacBook Pro 14"]
+
+    path.write_text(json.dumps({"product": "iPhone"}) + "\n")
+    with pytest.raises(ValueError, match="products.jsonl:1"):
+        read_queries(path)
@@ -0,0 +1,39 @@
+from benchmarks.catalogs import synthetic_catalog
+from benchmarks.run import compare, run_benchmarks
+
+
+def test_synthetic_catalog_generates_on_access():
+    catalog = synthetic_catalog(products=1_000, reviews=20_000)
+    name = list(catalog.products)[500]
+
+    assert len(catalog.products) == 1_000
+    assert catalog.products[name]["name"] == name
+    assert len(catalog.reviews[name]) == catalog.products[name]["rating_distribution"]["total_reviews"]
+    assert catalog.products[name] == synthetic_catalog(products=1_000, reviews=20_000).products[name]
+
+
+def test_run_benchmarks_covers_every_tool():
+    results = run_benchmarks(sizes=(10,), repeat=1)
+
+    assert set(results) == {
+        "get_most_similar_product",
+        "fetch_product_data",
+        "fetch_product_reviews",
+        "_analyze_product_sentiment",
+        "search_review_aspects",
+        "analyze_market_trends",
+        "analyze_category_trends",
+        "find_competitors",
+        "generate_product_report",
+    }
+    assert all(timings["10"] > 0 for timings in results.values())
+
+
+def test_compare_flags_slowdowns_beyond_threshold():
+    baseline = {"fetch_product_reviews": {"1000": 0.010, "10": 0.0001}, "analyze_market_trends": {"1000": 0.010}}
+    results = {"fetch_product_reviews": {"1000": 0.020, "10": 0.0003}, "analyze_market_trends": {"1000": 0.011}}
+
+    regressions = compare(results, baseline, threshold=1.25)
+
+    assert [(regression["case"], regression["size"]) for regression in regressions] == [("fetch_product_reviews", "1000")]
+    assert regressions[0]["ratio"] == 2.0
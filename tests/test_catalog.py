@@ -0,0 +1,46 @@
+import shutil
+
+from src.catalog import DATA_DIR, Catalog
+from src.catalog.snapshot import CatalogSnapshot, build_snapshot, ensure_snapshot
+
+
+def test_snapshot_matches_json_catalog(tmp_path):
+    snapshot_path = build_snapshot(DATA_DIR, tmp_path / "catalog.snapshot")
+
+    from_json = Catalog.from_json(DATA_DIR)
+    from_snapshot = Catalog.from_snapshot(snapshot_path)
+
+    assert sorted(from_snapshot.products) == sorted(from_json.products)
+    assert from_snapshot.products["iPhone 15 Pro"] == from_json.products["iPhone 15 Pro"]
+    assert from_snapshot.reviews["iPhone 15 Pro"] == from_json.reviews["iPhone 15 Pro"]
+    assert dict(from_snapshot.market_trends) == dict(from_json.market_trends)
+    assert from_snapshot.retailers == from_json.retailers
+    assert "Unknown Product" not in from_snapshot.products
+    assert None not in from_snapshot.market_trends
+    assert from_snapshot.category_trends == from_json.category_trends
+
+
+def test_category_trends_aggregate_every_product_of_a_category():
+    catalog = Catalog.from_json(DATA_DIR)
+    smartphones = [trends for trends in catalog.market_trends.values() if trends["category"] == "smartphones"]
+    rollup = catalog.category_trends["smartphones"]
+
+    assert rollup["product_count"] == len(smartphones)
+    assert rollup["metrics"]["search_volume"]["max"] == max(t["current_metrics"]["search_volume"] for t in smartphones)
+    assert sum(rollup["growth_distribution"].values()) == len(smartphones)
+    assert sum(rollup["market_sentiment"].values()) == len(smartphones)
+
+
+def test_ensure_snapshot_rebuilds_when_data_changes(tmp_path):
+    data_dir = tmp_path / "data"
+    shutil.copytree(DATA_DIR, data_dir)
+    snapshot_path = tmp_path / "catalog.snapshot"
+
+    ensure_snapshot(data_dir, snapshot_path)
+    assert CatalogSnapshot(snapshot_path).is_fresh(data_dir)
+
+    (data_dir / "retailers.json").write_text('["Amazon"]')
+    assert not CatalogSnapshot(snapshot_path).is_fresh(data_dir)
+
+    ensure_snapshot(data_dir, snapshot_path)
+    assert Catalog.from_snapshot(snapshot_path).retailers == ["Amazon"]
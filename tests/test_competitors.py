@@ -0,0 +1,49 @@
+import json
+import time
+from unittest.mock import Mock
+
+from benchmarks.catalogs import synthetic_catalog
+from src.catalog import DATA_DIR, Catalog
+from src.catalog.similarity import SimilarityIndex, similarity_index
+from src.catalog.snapshot import build_snapshot
+from src.catalog.vectors import build_product_vectors
+from src.llm.agent import ResearchContext
+from src.llm.tools.competitor_analysis import find_competitors
+
+
+def test_snapshot_and_json_catalogs_rank_the_same_competitors(tmp_path):
+    from_json = Catalog.from_json(DATA_DIR)
+    from_snapshot = Catalog.from_snapshot(build_snapshot(DATA_DIR, tmp_path / "catalog.snapshot"))
+
+    assert from_snapshot.product_vectors["iPhone 15 Pro"] == build_product_vectors(from_json.products.values())[0]["iPhone 15 Pro"]
+    json_ranking = similarity_index(from_json).similar("iPhone 15 Pro", 3)
+    assert similarity_index(from_snapshot).similar("iPhone 15 Pro", 3) == json_ranking
+    assert json_ranking[0].name == "Samsung Galaxy S24 Ultra"
+
+
+def test_batched_queries_match_single_queries_on_a_large_catalog():
+    catalog = synthetic_catalog(products=20_000, reviews=0)
+    index = SimilarityIndex(*build_product_vectors(catalog.products.values()))
+    names = list(catalog.products)[:20]
+
+    started = time.perf_counter()
+    similar = index.similar(names[0], 5)
+    assert time.perf_counter() - started < 0.5
+    assert len(similar) == 5 and names[0] not in [match.name for match in similar]
+    assert all(catalog.products[match.name]["category"] == catalog.products[names[0]]["category"] for match in similar)
+    assert index.similar_batch(names, 5)[names[0]] == list(similar)
+
+
+def test_find_competitors():
+    ctx = Mock()
+    ctx.deps = ResearchContext(product_name="iPhone 15 Pro")
+
+    result = json.loads(find_competitors(ctx))
+
+    assert result["handle"] == "competitors"
+    assert result["competitors"][0] == "Samsung Galaxy S24 Ultra"
+    assert ctx.deps.competitors["product"]["name"] == "iPhone 15 Pro"
+    assert ctx.deps.competitors["competitors"][0]["price_difference_percent"] == 20.1
+
+    ctx.deps = ResearchContext(product_name="Unknown Product")
+    assert "error" in json.loads(find_competitors(ctx))
@@ -0,0 +1,42 @@
+from collections import Counter
+
+from benchmarks.dataset import SyntheticDataset, main
+from src.catalog import Catalog
+from src.llm.tools.sentiment_analysis import _analyze_product_sentiment
+
+
+def test_generated_files_are_consistent(tmp_path):
+    SyntheticDataset(products=500, reviews=20_000, retailers=1_200, seed=7).write(tmp_path)
+    catalog = Catalog.from_json(tmp_path)
+
+    names = list(catalog.products)
+    review_counts = [len(catalog.reviews[name]) for name in names]
+    assert len(names) == len(set(names)) == 500
+    assert sum(review_counts) == 20_000
+    assert set(catalog.market_trends) == set(names)
+    assert len(catalog.retailers) == len(set(catalog.retailers)) == 1_200
+    assert set(catalog.retailer_config) == set(catalog.retailers)
+
+    for name in names[:20]:
+        reviews = catalog.reviews[name]
+        distribution = catalog.products[name]["rating_distribution"]
+        ratings = Counter(review["rating"] for review in reviews)
+        assert [distribution[f"{stars}_star"] for stars in range(1, 6)] == [ratings[stars] for stars in range(1, 6)]
+        assert _analyze_product_sentiment(reviews)["total_reviews"] == distribution["total_reviews"]
+
+
+def test_names_collide_and_popularity_is_skewed():
+    dataset = SyntheticDataset(products=2_000, reviews=100_000)
+    names = set(dataset.product_names())
+
+    assert "Samsung Galaxy S23" in names and "Samsung Galaxy S23 Ultra" in names
+    assert dataset.review_counts[0] > 10 * dataset.review_counts[100] > 0
+    assert dataset.product(42) == SyntheticDataset(products=2_000, reviews=100_000).product(42)
+
+
+def test_cli_builds_a_snapshot(tmp_path):
+    main([str(tmp_path), "--products", "50", "--reviews", "500", "--retailers", "30", "--snapshot"])
+
+    catalog = Catalog.from_snapshot(tmp_path / "catalog.snapshot")
+    assert len(catalog.products) == 50
+    assert len(catalog.retailers) == 30
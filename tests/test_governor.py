@@ -0,0 +1,124 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+from pydantic_ai import Agent
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from src.llm.agent import ResearchContext
+from src.llm.governor import GovernedModel, RateGovernor, SharedTokenBuckets, TokenBuckets
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_buckets_refill_per_minute():
+    clock = FakeClock()
+    buckets = TokenBuckets({"requests": 60, "tokens": 6000, "unlimited": 0}, clock=clock)
+
+    assert buckets.take({"requests": 1, "tokens": 5500}) == 0.0
+    assert buckets.take({"requests": 1, "tokens": 1000}) == pytest.approx(5.0)
+    clock.now = 5.0
+    assert buckets.take({"requests": 1, "tokens": 1000, "unlimited": 10**9}) == 0.0
+    # Charged afterwards for more tokens than estimated.
+    buckets.give("tokens", -600)
+    assert buckets.take({"tokens": 1}) == pytest.approx(6.01)
+    assert buckets.take({"requests": 100, "tokens": 10**6}) > 0
+
+
+def test_governor_admits_analyses_round_robin():
+    async def run() -> list[str]:
+        buckets = TokenBuckets({"requests": 6000})
+        buckets.take({"requests": 6000})
+        governor = RateGovernor(buckets)
+        admitted = []
+
+        async def analysis(name: str, requests: int):
+            for _ in range(requests):
+                await governor.acquire(name, 10)
+                admitted.append(name)
+
+        await asyncio.gather(analysis("long", 6), analysis("short", 2), analysis("other", 2))
+        return admitted
+
+    admitted = asyncio.run(run())
+
+    assert admitted[:6] == ["long", "short", "other", "long", "short", "other"]
+    assert admitted[6:] == ["long"] * 4
+
+
+def test_rate_limited_requests_back_off_centrally(monkeypatch):
+    monkeypatch.setattr("src.llm.governor.settings.MODEL_RATE_LIMIT_BACKOFF_SECONDS", 0.01)
+    calls = []
+
+    def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        calls.append(len(messages))
+        if len(calls) <= 2:
+            raise ModelHTTPError(429, "stub")
+        return ModelResponse(parts=[TextPart("done")])
+
+    agent = Agent(GovernedModel(FunctionModel(respond)), deps_type=ResearchContext)
+
+    result = asyncio.run(agent.run("analyse", deps=ResearchContext()))
+
+    assert result.output == "done"
+    assert len(calls) == 3
+
+
+def test_rate_limit_errors_surface_after_the_retries(monkeypatch):
+    monkeypatch.setattr("src.llm.governor.settings.MODEL_RATE_LIMIT_BACKOFF_SECONDS", 0.001)
+    monkeypatch.setattr("src.llm.governor.settings.MODEL_RATE_LIMIT_RETRIES", 2)
+
+    def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        raise ModelHTTPError(429, "stub")
+
+    with pytest.raises(ModelHTTPError):
+        asyncio.run(Agent(GovernedModel(FunctionModel(respond))).run("analyse"))
+
+
+def test_shared_buckets_are_shared_between_processes(tmp_path):
+    first = SharedTokenBuckets({"requests": 60}, str(tmp_path / "limits.db"))
+    second = SharedTokenBuckets({"requests": 60}, str(tmp_path / "limits.db"))
+
+    assert first.take({"requests": 59}) == 0.0
+    assert second.take({"requests": 1}) == 0.0
+    assert first.take({"requests": 1}) > 0.9
+
+
+def test_pauses_are_shared_between_processes(tmp_path):
+    first = SharedTokenBuckets({"requests": 60}, str(tmp_path / "limits.db"))
+    second = SharedTokenBuckets({"requests": 60}, str(tmp_path / "limits.db"))
+
+    first.pause(30)
+
+    assert second.take({"requests": 1}) > 29
+    assert first.take({"requests": 1}) > 29
+
+
+def test_shared_buckets_are_read_off_the_event_loop(tmp_path):
+    path = str(tmp_path / "limits.db")
+
+    async def run() -> float:
+        governor = RateGovernor(SharedTokenBuckets({"requests": 60}, path))
+        # Another worker holds the buckets.
+        lock = sqlite3.connect(path, isolation_level=None)
+        lock.execute("BEGIN IMMEDIATE")
+        acquired = asyncio.create_task(governor.acquire("analysis", 10))
+        started = time.perf_counter()
+        await asyncio.sleep(0.1)
+        slept = time.perf_counter() - started
+        assert not acquired.done()
+        lock.execute("COMMIT")
+        lock.close()
+        await asyncio.wait_for(acquired, 5)
+        return slept
+
+    assert asyncio.run(run()) < 1
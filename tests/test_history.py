@@ -0,0 +1,66 @@
+import asyncio
+import json
+from unittest.mock import Mock
+
+from pydantic_ai.messages import ModelRequest, ModelResponse, ToolCallPart, ToolReturnPart, UserPromptPart
+
+from benchmarks.context_trimming import compare_trimming
+from benchmarks.stub_model import scripted_model
+from src.api.services.research import execute_analysis
+from src.llm.agent import ResearchContext, generate_research_agent
+from src.llm.handles import data_handle
+from src.llm.history import compact_tool_outputs
+
+
+def tool_return(tool_name: str, content: str) -> list:
+    return [
+        ModelResponse(parts=[ToolCallPart(tool_name, {}, tool_call_id=tool_name)]),
+        ModelRequest(parts=[ToolReturnPart(tool_name, content, tool_call_id=tool_name)]),
+    ]
+
+
+def test_compacts_seen_handles_once_stored():
+    reviews = [{"rating": 5, "review_text": "Great"}, {"rating": 4, "review_text": "Good"}]
+    ctx = Mock()
+    ctx.deps = ResearchContext(reviews_data=reviews)
+    handle = data_handle("reviews_data", product="iPhone 15 Pro", review_count=2, average_rating=4.5)
+    messages = [
+        ModelRequest(parts=[UserPromptPart("analyse 'iPhone 15 Pro'")]),
+        *tool_return("fetch_product_reviews", handle),
+        *tool_return("analyze_market_trends", json.dumps({"error": "Market data not found"})),
+        *tool_return("get_product_sentiment_analysis", data_handle("sentiment_analysis", overall_sentiment="positive")),
+        *tool_return("fetch_product_data", data_handle("product_info", product="iPhone 15 Pro")),
+    ]
+
+    compacted = compact_tool_outputs(ctx, messages)
+
+    assert compacted[0] is messages[0]
+    assert compacted[2].parts[0].content == {"handle": "reviews_data", "product": "iPhone 15 Pro"}
+    # Errors and handles whose data is not stored are kept, and the latest output is always sent in full.
+    assert compacted[4] is messages[4]
+    assert compacted[6] is messages[6]
+    assert compacted[8] is messages[8]
+    assert messages[2].parts[0].content == handle
+    assert compact_tool_outputs(ctx, compacted)[2].parts[0].content == compacted[2].parts[0].content
+
+
+def test_analysis_passes_handles_and_keeps_full_data_for_the_report(monkeypatch, tmp_path):
+    monkeypatch.setattr("src.llm.tools.report_generator.settings.REPORTS_DIR", str(tmp_path))
+    agent = generate_research_agent(model=scripted_model())
+
+    result = asyncio.run(execute_analysis("compacted", "iPhone 15 Pro", agent))
+    with open(result["report_path"]) as f:
+        report = json.load(f)
+
+    assert result["error"] is None
+    assert result["usage"]["steps"]["fetch_product_reviews"]["tool_output_bytes"] < 1000
+    assert len(result["reviews_data"]) > 0
+    assert report["product_info"]["name"] == "iPhone 15 Pro"
+    assert report["market_trends"] == result["market_trends"]
+
+
+def test_trimming_reduces_input_tokens():
+    results = compare_trimming(["iPhone 15 Pro"])
+
+    assert results["iPhone 15 Pro"]["compacted"] < results["iPhone 15 Pro"]["full"]
+    assert results["iPhone 15 Pro"]["reduction"] > 0.1
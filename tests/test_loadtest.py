@@ -0,0 +1,45 @@
+import asyncio
+
+from benchmarks.loadtest import run_load, stub_api
+from benchmarks.stub_model import scripted_model
+from src.api.services.progress import progress_broker
+from src.api.services.research import execute_analysis
+from src.llm.agent import generate_research_agent
+
+
+def test_scripted_model_runs_the_full_tool_sequence(monkeypatch, tmp_path):
+    monkeypatch.setattr("src.llm.tools.report_generator.settings.REPORTS_DIR", str(tmp_path))
+    agent = generate_research_agent(model=scripted_model())
+
+    result = asyncio.run(execute_analysis("loadtest-analysis", "iphone 15", agent))
+    steps = [event["step"] for event in progress_broker.history("loadtest-analysis")]
+
+    assert result["error"] is None
+    assert result["product_name"] == "iPhone 15 Pro"
+    assert result["report_path"].startswith(str(tmp_path))
+    assert steps == [
+        "started",
+        "resolved",
+        "product_data_fetched",
+        "reviews_fetched",
+        "sentiment_done",
+        "review_aspects_done",
+        "market_trends_done",
+        "category_trends_done",
+        "competitors_found",
+        "report_ready",
+    ]
+    assert result["category_trends"]["category"] == "smartphones"
+
+
+def test_load_run_reports_throughput_and_latency():
+    with stub_api(model_delay=0.0) as base_url:
+        result = asyncio.run(
+            run_load(base_url, ["iPhone 15 Pro", "MacBook Pro 14"], rate=20, requests=6, poll_interval=0.05)
+        ).to_dict()
+
+    assert result["requests"] == 6
+    assert result["completed"] == 6
+    assert result["error_rate"] == 0.0
+    assert result["throughput_per_second"] > 0
+    assert set(result["analysis_latency_seconds"]) == {"p50", "p95", "p99"}
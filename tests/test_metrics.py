@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.monitoring.metrics import Gauge, Metric, MetricsRegistry, Summary, timed
+
+
+def test_summary_percentiles_per_label():
+    summary = Summary("tool_duration_seconds", "Tool latency")
+    for value in range(1, 101):
+        summary.observe(value / 100, tool="fetch_product_data")
+    summary.observe(5.0, tool="generate_product_report")
+
+    percentiles = summary.percentiles("tool")
+
+    assert percentiles["fetch_product_data"] == {"p50": 0.51, "p95": 0.96, "p99": 1.0}
+    assert percentiles["generate_product_report"]["p99"] == 5.0
+    assert summary.percentiles()["p99"] == 1.0
+
+
+def test_timed_observes_sync_and_async_calls():
+    summary = Summary("duration_seconds", "Duration")
+
+    @timed(summary, operation="sync")
+    def sync_operation():
+        raise ValueError
+
+    @timed(summary, operation="async")
+    async def async_operation():
+        return 42
+
+    with pytest.raises(ValueError):
+        sync_operation()
+    assert asyncio.run(async_operation()) == 42
+    assert set(summary.percentiles("operation")) == {"sync", "async"}
+
+
+def test_render_prometheus():
+    registry = MetricsRegistry()
+    gauge = registry.register(Gauge("analyses_running", "Running analyses"))
+    with gauge.track_inprogress():
+        gauge.inc()
+    registry.register_cache("report_render", lambda: (3, 1))
+
+    text = registry.render_prometheus()
+
+    assert "# TYPE analyses_running gauge\nanalyses_running 1" in text
+    assert 'cache_hit_ratio{cache="report_render"} 0.75' in text
+    assert '# TYPE cache_hits_total counter\ncache_hits_total{cache="report_render"} 3' in text
+    with pytest.raises(TypeError):
+        Metric("untyped", "A metric without samples")
+
+
+def test_metrics_and_health_endpoints():
+    client = TestClient(app)
+
+    health = client.get("/health").json()
+    metrics = client.get("/metrics")
+
+    assert health["services"]["database"] == "healthy"
+    assert {"queue_depth", "running_analyses", "tool_latency_seconds", "db_latency_seconds", "caches"} <= set(health["metrics"])
+    assert metrics.status_code == 200
+    assert 'db_operation_duration_seconds_count{operation="ping"}' in metrics.text
+    assert "# TYPE component_loaded gauge" in metrics.text
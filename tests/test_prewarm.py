@@ -0,0 +1,115 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.models.analysis.requests import AnalysisPriority
+from src.api.models.analysis.responses import AnalysisStatus
+from src.api.services.database_service import DatabaseService
+from src.api.services.prewarm import prewarm, seconds_until, top_products
+
+
+def add_requests(db_service: DatabaseService, product_name: str, count: int, days_ago: int = 0, prewarmed: bool = False):
+    for index in range(count):
+        db_service.add_analysis(
+            analysis_id=f"{product_name}-{days_ago}-{prewarmed}-{index}",
+            query=product_name.lower(),
+            product_name=product_name,
+            status=AnalysisStatus.COMPLETED,
+            created_at=datetime.now() - timedelta(days=days_ago),
+            prewarmed=prewarmed,
+        )
+
+
+def test_top_products_rank_recent_requests_only(tmp_path):
+    db_service = DatabaseService(str(tmp_path / "prewarm.db"))
+    add_requests(db_service, "iPhone 15 Pro", 3)
+    add_requests(db_service, "MacBook Pro 14", 2)
+    add_requests(db_service, "PlayStation 5", 5, days_ago=30)
+    add_requests(db_service, "Nintendo Switch OLED", 5, prewarmed=True)
+    add_requests(db_service, "Sony WH-1000XM5", 1)
+
+    assert top_products(db_service, limit=2, window_days=7) == ["iPhone 15 Pro", "MacBook Pro 14"]
+
+
+def test_prewarmed_analyses_serve_the_next_requests(monkeypatch, tmp_path):
+    db_service = DatabaseService(str(tmp_path / "prewarm.db"))
+    add_requests(db_service, "iPhone 15 Pro", 2)
+    monkeypatch.setattr("src.api.routes.analysis.db_service", db_service)
+    monkeypatch.setattr("src.api.services.research.settings.ANALYSIS_CACHE_TTL_SECONDS", 3600)
+    monkeypatch.setattr("src.api.services.batch.generate_research_agent", lambda: None)
+    executed = []
+
+    async def execute(analysis_id, product_name, agent=None):
+        executed.append(product_name)
+        return {"report_path": f"reports/{product_name}.json", "error": None}
+
+    monkeypatch.setattr("src.api.services.batch.execute_analysis", execute)
+    monkeypatch.setattr("src.api.services.research.execute_analysis", execute)
+
+    batch = asyncio.run(prewarm(db_service, limit=5, window_days=1))
+    assert batch.priority == AnalysisPriority.LOW and (batch.total, batch.completed) == (1, 1)
+    assert executed == ["iPhone 15 Pro"]
+
+    response = TestClient(app).post("/api/v1/analyze", json={"query": "iphone 15 pro"}).json()
+
+    assert response["status"] == AnalysisStatus.COMPLETED
+    assert response["report"] == "reports/iPhone 15 Pro.json"
+    assert executed == ["iPhone 15 Pro"]
+    # Served requests count as demand, pre-warming runs don't.
+    assert db_service.get_top_products(datetime.now() - timedelta(days=1), 5) == [("iPhone 15 Pro", 3)]
+
+
+def test_cache_hits_do_not_extend_the_ttl(monkeypatch, tmp_path):
+    db_service = DatabaseService(str(tmp_path / "prewarm.db"))
+    db_service.add_analysis(
+        analysis_id="run",
+        query="iphone 15 pro",
+        product_name="iPhone 15 Pro",
+        status=AnalysisStatus.COMPLETED,
+        created_at=datetime.now() - timedelta(minutes=50),
+        report="reports/iPhone 15 Pro.json",
+    )
+    monkeypatch.setattr("src.api.routes.analysis.db_service", db_service)
+    monkeypatch.setattr("src.api.routes.analysis.run_analysis", lambda *args, **kwargs: None)
+    monkeypatch.setattr("src.api.services.research.settings.ANALYSIS_CACHE_TTL_SECONDS", 3600)
+    client = TestClient(app)
+
+    for _ in range(3):
+        response = client.post("/api/v1/analyze", json={"query": "iphone 15 pro"}).json()
+        assert response["status"] == AnalysisStatus.COMPLETED
+        assert db_service.get_analysis(response["analysis_id"])["cached_from"] == "run"
+
+    # Three hours after the run, its copies are younger than the TTL but the run itself is not.
+    db_service.update_analysis("run", created_at=datetime.now() - timedelta(hours=3))
+    response = client.post("/api/v1/analyze", json={"query": "iphone 15 pro"}).json()
+
+    assert response["status"] == AnalysisStatus.RUNNING
+    assert db_service.get_analysis(response["analysis_id"])["cached_from"] is None
+
+
+def test_seconds_until_next_run():
+    now = datetime(2026, 10, 19, 22, 30)
+
+    assert seconds_until("23:00", now) == 1800
+    assert seconds_until("04:00", now) == 5.5 * 3600
+
+
+def test_workers_do_not_each_prewarm(monkeypatch):
+    started = []
+
+    async def prewarm_daily(db_service, at):
+        started.append(at)
+
+    monkeypatch.setattr("src.api.main.prewarm_daily", prewarm_daily)
+    monkeypatch.setattr("src.api.main.settings.WARMUP_ON_STARTUP", False)
+    monkeypatch.setattr("src.api.main.settings.PREWARM_AT", "04:00")
+    monkeypatch.setattr("src.api.main.settings.API_WORKERS", 2)
+    with TestClient(app):
+        pass
+    monkeypatch.setattr("src.api.main.settings.API_WORKERS", 1)
+    with TestClient(app):
+        pass
+
+    assert started == ["04:00"]
@@ -0,0 +1,83 @@
+import asyncio
+import time
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from benchmarks.stub_model import scripted_model
+from src.api.main import app
+from src.api.models.analysis.responses import AnalysisStatus
+from src.api.services.database_service import DatabaseService
+from src.api.services.research import run_analysis
+from src.llm.agent import generate_research_agent
+from src.monitoring.profiling import WAITING_FRAME, profile_coroutine, profiled_tool
+
+
+def busy_tool() -> str:
+    deadline = time.perf_counter() + 0.1
+    while time.perf_counter() < deadline:
+        pass
+    return "done"
+
+
+def test_profiler_follows_tools_into_worker_threads():
+    tool = profiled_tool(busy_tool)
+
+    async def analysis():
+        await asyncio.sleep(0.05)
+        return await asyncio.to_thread(tool)
+
+    result, profiler = asyncio.run(profile_coroutine(analysis(), interval=0.002))
+    stacks = {stack: count for stack, count in profiler.samples.items()}
+
+    assert result == "done"
+    assert any(stack.endswith(WAITING_FRAME) for stack in stacks)
+    in_tool = sum(count for stack, count in stacks.items() if "busy_tool" in stack)
+    assert in_tool > 10
+    for line in profiler.folded().splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack.startswith("test_profiler_follows_tools_into_worker_threads.<locals>.analysis") and int(count) > 0
+
+
+def test_profiled_analysis_is_downloadable(monkeypatch, tmp_path):
+    monkeypatch.setattr("src.llm.tools.report_generator.settings.REPORTS_DIR", str(tmp_path / "reports"))
+    monkeypatch.setattr("src.monitoring.profiling.settings.PROFILES_DIR", str(tmp_path / "profiles"))
+    db_service = DatabaseService(str(tmp_path / "profiling.db"))
+    monkeypatch.setattr("src.api.routes.analysis.db_service", db_service)
+    for analysis_id in ("profiled", "plain"):
+        db_service.add_analysis(
+            analysis_id=analysis_id, query="iPhone 15 Pro", status=AnalysisStatus.RUNNING, created_at=datetime.now()
+        )
+    agent = generate_research_agent(model=scripted_model(delay_seconds=0.01))
+
+    asyncio.run(run_analysis("profiled", "iPhone 15 Pro", db_service, agent, profile=True))
+    asyncio.run(run_analysis("plain", "iPhone 15 Pro", db_service, agent))
+    client = TestClient(app)
+    response = client.get("/api/v1/analyze/profiled/profile")
+
+    assert db_service.get_analysis("profiled")["status"] == AnalysisStatus.COMPLETED
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="profiled.folded"'
+    assert "execute_analysis" in response.text
+    assert client.get("/api/v1/analyze/plain/profile").status_code == 404
+    assert client.get("/api/v1/analyze/missing/profile").status_code == 404
+
+
+def test_profiling_is_requested_by_query_flag_or_header(monkeypatch, tmp_path):
+    monkeypatch.setattr("src.api.routes.analysis.db_service", DatabaseService(str(tmp_path / "profiling.db")))
+    calls = []
+
+    async def record_run(analysis_id, query, db_service, profile=False, priority=None):
+        calls.append(profile)
+
+    monkeypatch.setattr("src.api.routes.analysis.run_analysis", record_run)
+    monkeypatch.setattr("src.monitoring.profiling.settings.PROFILE_SAMPLE_RATE", 0.0)
+    client = TestClient(app)
+
+    client.post("/api/v1/analyze", json={"query": "iPhone 15 Pro"})
+    client.post("/api/v1/analyze", params={"profile": "true"}, json={"query": "iPhone 15 Pro"})
+    client.post("/api/v1/analyze", headers={"X-Profile": "true"}, json={"query": "iPhone 15 Pro"})
+    monkeypatch.setattr("src.monitoring.profiling.settings.PROFILE_SAMPLE_RATE", 1.0)
+    client.post("/api/v1/analyze", json={"query": "iPhone 15 Pro"})
+
+    assert calls == [False, True, True, True]
@@ -0,0 +1,54 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from src.api.services.progress import ProgressBroker, format_sse
+from src.llm.agent import ResearchContext
+from src.llm.tools.sentiment_analysis import get_product_sentiment_analysis
+
+
+@pytest.mark.asyncio
+async def test_progress_broker_replays_history_and_streams_until_terminal():
+    broker = ProgressBroker()
+    broker.publish("analysis-1", "started", query="iPhone 15 Pro")
+
+    async def collect():
+        return [event["step"] async for event in broker.subscribe("analysis-1", heartbeat=1)]
+
+    task = asyncio.create_task(collect())
+    await asyncio.sleep(0)
+    await asyncio.to_thread(broker.publish, "analysis-1", "report_ready", report_path="report.json")
+    broker.publish("analysis-1", "completed")
+
+    assert await asyncio.wait_for(task, timeout=1) == ["started", "report_ready", "completed"]
+
+
+@pytest.mark.asyncio
+async def test_progress_broker_heartbeat():
+    broker = ProgressBroker()
+    events = broker.subscribe("analysis-2", heartbeat=0.01)
+
+    assert await anext(events) is None
+    await events.aclose()
+
+
+def test_tools_report_progress():
+    events = []
+    ctx = Mock()
+    ctx.deps = ResearchContext(
+        product_name="iPhone 15 Pro",
+        reviews_data=[{"sentiment": "positive", "rating": 5}],
+        progress_callback=lambda step, **data: events.append((step, data)),
+    )
+
+    get_product_sentiment_analysis(ctx)
+
+    assert events == [("sentiment_done", {"product_name": "iPhone 15 Pro", "overall_sentiment": "positive"})]
+
+
+def test_format_sse():
+    message = format_sse({"analysis_id": "a", "step": "completed", "timestamp": None, "data": {}})
+
+    assert message.startswith("event: completed\ndata: {")
+    assert message.endswith("\n\n")
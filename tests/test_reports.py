@@ -0,0 +1,139 @@
+import gzip
+import json
+import uuid
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.services.database_service import db_service
+from src.api.services.reports import (
+    etag_matches,
+    negotiate_content_encoding,
+    negotiate_report_media_type,
+    render_report_file,
+    report_etag,
+    report_version,
+)
+from src.llm.tools.report_generator import render_report
+
+REPORT_DATA = {
+    "generated_at": "2025-09-21T16:25:24",
+    "product_info": {"name": "iPhone 15 Pro", "category": "Smartphones"},
+    "sentiment_analysis": {"overall_sentiment": "positive", "average_rating": 4.5, "total_reviews": 3},
+    "market_trends": {"category": "smartphones", "market_sentiment": "bullish"},
+    "review_aspects": {
+        "battery": {
+            "mentions": 1,
+            "share_percent": 25.0,
+            "average_rating": 2.0,
+            "sentiment": {"negative": 1},
+            "snippets": [{"text": "Battery life doesn't last as long as advertised.", "rating": 2, "sentiment": "negative"}],
+        },
+        "shipping": {"mentions": 0, "share_percent": 0.0, "average_rating": None, "sentiment": {}, "snippets": []},
+    },
+    "category_trends": {
+        "category": "smartphones",
+        "product_count": 2,
+        "metrics": {"search_volume": {"median": 117.5, "p25": 113.75, "p75": 121.25}},
+        "changes": {},
+        "growth_distribution": {"declining": 0, "flat": 0, "growing": 1, "strong": 1},
+        "product_vs_category": {"search_volume_vs_median": 7.5},
+    },
+    "competitors": {
+        "product": {"name": "iPhone 15 Pro", "brand": "Apple", "base_price": 999.0, "average_rating": 4.3},
+        "competitors": [
+            {
+                "name": "Samsung Galaxy S24 Ultra",
+                "brand": "Samsung",
+                "base_price": 1199.99,
+                "price_difference_percent": 20.1,
+                "average_rating": 3.9,
+                "similarity": 0.4476,
+            }
+        ],
+    },
+}
+
+
+def test_negotiate_report_media_type():
+    assert negotiate_report_media_type(None) == "text/html"
+    assert negotiate_report_media_type("*/*") == "text/html"
+    assert negotiate_report_media_type("text/markdown") == "text/markdown"
+    assert negotiate_report_media_type("text/html;q=0.5, application/json") == "application/json"
+    assert negotiate_report_media_type("image/png") is None
+
+
+def test_render_report_formats():
+    markdown = render_report(REPORT_DATA, "markdown")
+    html = render_report(REPORT_DATA, "html")
+
+    assert markdown.startswith("# Product Analysis Report: iPhone 15 Pro")
+    assert "September 21, 2025" in markdown
+    assert "## 🗂️ Category Context" in markdown and "Category Context" in html
+    assert "| Battery | 1 | 25.0% | 2.0/5.0 | 0 / 1 |" in markdown and "Shipping" not in markdown
+    assert "Battery life doesn&#x27;t last" in html
+    assert "| Samsung Galaxy S24 Ultra | Samsung | $1199.99 | +20.1% |" in markdown and "Competitor Comparison" in html
+    assert "<!DOCTYPE html>" in html
+    assert json.loads(render_report(REPORT_DATA, "json")) == REPORT_DATA
+
+
+def test_render_report_file_is_cached(tmp_path):
+    report_path = tmp_path / "iPhone_15_Pro_report.json"
+    report_path.write_text(json.dumps(REPORT_DATA))
+    render_report_file.cache_clear()
+
+    first = render_report_file(str(report_path), "text/html", report_version(str(report_path)))
+    second = render_report_file(str(report_path), "text/html", report_version(str(report_path)))
+
+    assert first is second
+    assert render_report_file.cache_info().hits == 1
+    assert gzip.decompress(first.body("gzip")) == first.body(None)
+
+    # A rewritten report is rendered again, under a new ETag.
+    etag = report_etag(str(report_path), report_version(str(report_path)), "text/html")
+    report_path.write_text(json.dumps({**REPORT_DATA, "product_info": {"name": "iPhone 15 Pro Max"}}))
+    rewritten = render_report_file(str(report_path), "text/html", report_version(str(report_path)))
+    assert b"iPhone 15 Pro Max" in rewritten.body(None)
+    assert report_etag(str(report_path), report_version(str(report_path)), "text/html") != etag
+
+
+def test_negotiate_content_encoding_and_etags():
+    assert negotiate_content_encoding(None) is None
+    assert negotiate_content_encoding("gzip, deflate") == "gzip"
+    assert negotiate_content_encoding("gzip;q=0, identity") is None
+
+    etag = report_etag("reports/a.json", "2:1:100", "text/html", "gzip")
+    assert etag != report_etag("reports/a.json", "2:1:100", "text/html")
+    assert etag != report_etag("reports/a.json", "3:1:100", "text/html", "gzip")
+    assert etag_matches(f'W/{etag}, "other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_get_analysis_conditional_request(monkeypatch, tmp_path):
+    report_path = tmp_path / "iPhone_15_Pro_report.json"
+    report_path.write_text(json.dumps(REPORT_DATA))
+    analysis_id = str(uuid.uuid4())
+    db_service.add_analysis(
+        analysis_id=analysis_id,
+        query="iPhone 15 Pro",
+        status="completed",
+        created_at=datetime.now(),
+        completed_at=datetime.now(),
+        report=str(report_path),
+    )
+    client = TestClient(app)
+
+    response = client.get(f"/api/v1/analyze/{analysis_id}", headers={"Accept": "text/markdown", "Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "immutable" in response.headers["cache-control"]
+    assert response.text.startswith("# Product Analysis Report")
+
+    # A revalidated report is neither read nor rendered.
+    monkeypatch.setattr("src.api.routes.analysis.render_report_file", None)
+    cached = client.get(
+        f"/api/v1/analyze/{analysis_id}",
+        headers={"Accept": "text/markdown", "Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]},
+    )
+    assert cached.status_code == 304
@@ -0,0 +1,91 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+
+from benchmarks.catalogs import synthetic_catalog
+from src.api.main import app
+from src.api.models.analysis.responses import AnalysisStatus
+from src.api.services.database_service import DatabaseService
+from src.catalog import get_catalog
+from src.catalog.resolver import ProductIndex, product_index, resolve_product
+
+
+def test_resolves_partial_names_and_rejects_unknown_products():
+    catalog = get_catalog()
+
+    assert resolve_product("iphone 15", catalog).name == "iPhone 15 Pro"
+    assert resolve_product("galaxy s24", catalog).name == "Samsung Galaxy S24 Ultra"
+    assert resolve_product("asdkjh qwe", catalog) is None
+    assert resolve_product("", catalog) is None
+
+
+def test_index_scores_only_candidates_and_caches_queries():
+    names = list(synthetic_catalog(products=100_000, reviews=0).products)
+    index = ProductIndex(names)
+    target = names[12_345]
+
+    started = time.perf_counter()
+    match = index.resolve(target.upper(), threshold=90)
+    assert time.perf_counter() - started < 1.0
+    assert match is not None and match.name == target
+
+    index.resolve(target.lower(), threshold=90)
+    assert index.cache_stats() == (1, 1)
+    assert len(index.candidates(target)) <= 50
+
+
+def test_concurrent_first_queries_build_the_index_once(monkeypatch):
+    builds = []
+
+    class SlowIndex(ProductIndex):
+        def __init__(self, *args, **kwargs):
+            builds.append(1)
+            time.sleep(0.05)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr("src.catalog.resolver._index", None)
+    monkeypatch.setattr("src.catalog.resolver.ProductIndex", SlowIndex)
+    catalog = synthetic_catalog(products=100, reviews=0)
+    with ThreadPoolExecutor(8) as pool:
+        indexes = list(pool.map(lambda _: product_index(catalog), range(8)))
+
+    assert len(builds) == 1
+    assert all(index is indexes[0] for index in indexes)
+
+
+def test_unknown_products_fail_before_running(monkeypatch, tmp_path):
+    db_service = DatabaseService(str(tmp_path / "resolver.db"))
+    monkeypatch.setattr("src.api.routes.analysis.db_service", db_service)
+    executed = []
+
+    async def execute(analysis_id, product_name, agent=None):
+        executed.append(product_name)
+        return {"report_path": None, "error": None}
+
+    monkeypatch.setattr("src.api.services.research.execute_analysis", execute)
+    client = TestClient(app)
+
+    unknown = client.post("/api/v1/analyze", json={"query": "qwzx vbnm"}).json()
+    known = client.post("/api/v1/analyze", json={"query": "iphone 15"}).json()
+
+    assert unknown["status"] == AnalysisStatus.FAILED and unknown["error"].startswith("Product not found")
+    assert known["product_name"] == "iPhone 15 Pro"
+    assert executed == ["iPhone 15 Pro"]
+    assert db_service.get_analysis(unknown["analysis_id"])["status"] == AnalysisStatus.FAILED
+    assert db_service.get_analysis(known["analysis_id"])["product_name"] == "iPhone 15 Pro"
+
+
+def test_failed_analyses_report_their_error(monkeypatch, tmp_path):
+    db_service = DatabaseService(str(tmp_path / "resolver.db"))
+    monkeypatch.setattr("src.api.routes.analysis.db_service", db_service)
+    client = TestClient(app)
+    analysis_id = client.post("/api/v1/analyze", json={"query": "qwzx vbnm"}).json()["analysis_id"]
+
+    response = client.get(f"/api/v1/analyze/{analysis_id}")
+    events = client.get(f"/api/v1/analyze/{analysis_id}/events").text
+
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["status"] == AnalysisStatus.FAILED
+    assert response.json()["error"].startswith("Product not found")
+    assert events.startswith("event: failed\n") and "Product not found" in events
@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from pydantic_ai.messages import ModelRequest, UserPromptPart
+from pydantic_ai.models import ModelRequestParameters
+from pydantic_ai.models.function import FunctionModel
+
+from benchmarks.response_cache import compare_replay
+from benchmarks.stub_model import scripted_model
+from src.api.services.research import execute_analysis
+from src.llm.agent import generate_research_agent
+from src.llm.response_cache import CachedModel, ModelCacheMiss, ModelResponseStore, request_key
+
+
+def test_request_key_ignores_timestamps():
+    parameters = ModelRequestParameters()
+    now = datetime.now()
+    first = [ModelRequest(parts=[UserPromptPart("analyse 'iPhone 15 Pro'", timestamp=now)])]
+    again = [ModelRequest(parts=[UserPromptPart("analyse 'iPhone 15 Pro'", timestamp=now + timedelta(hours=1))])]
+    other = [ModelRequest(parts=[UserPromptPart("analyse 'Galaxy S24'", timestamp=now)])]
+
+    assert request_key("large", first, None, parameters) == request_key("large", again, None, parameters)
+    assert request_key("large", first, None, parameters) != request_key("large", other, None, parameters)
+    assert request_key("large", first, None, parameters) != request_key("fast", first, None, parameters)
+    assert request_key("large", first, None, parameters) != request_key("large", first, {"temperature": 0}, parameters)
+
+
+def test_store_expires_and_evicts_least_recently_used(tmp_path):
+    store = ModelResponseStore(str(tmp_path / "cache.db"), ttl_seconds=3600, max_bytes=25)
+    store.put("a", b"x" * 10)
+    store.put("b", b"x" * 10)
+    assert store.get("a") is not None
+    store.put("c", b"x" * 10)
+
+    assert store.get("b") is None
+    assert store.get("a") is not None and store.get("c") is not None
+    assert store.stats() == (3, 1)
+
+    expired = ModelResponseStore(store.path, ttl_seconds=0, max_bytes=25)
+    assert expired.get("a") is None
+
+
+def test_store_keeps_a_running_total_of_sizes(tmp_path):
+    store = ModelResponseStore(str(tmp_path / "cache.db"), ttl_seconds=3600, max_bytes=25)
+    store.put("a", b"x" * 10)
+    store.put("a", b"x" * 5)
+    store.put("b", b"x" * 10)
+    store.put("c", b"x" * 10)
+
+    # Replacing "a" freed 5 bytes, so "b" and "c" fit with it.
+    assert all(store.get(key) is not None for key in "abc")
+    store.put("d", b"x" * 10)
+    assert store.get("a") is None and store.get("b") is None
+    # Reopening the file keeps its total.
+    reopened = ModelResponseStore(store.path, ttl_seconds=3600, max_bytes=25)
+    reopened.put("e", b"x")
+    assert all(reopened.get(key) is not None for key in "cde")
+
+
+def test_offline_cache_replays_recorded_run(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.config.settings.REPORTS_DIR", str(tmp_path / "reports"))
+    store = ModelResponseStore(str(tmp_path / "cache.db"), ttl_seconds=3600, max_bytes=1024 * 1024)
+    recorded = asyncio.run(
+        execute_analysis("record", "iPhone 15 Pro", generate_research_agent(model=CachedModel(scripted_model(), store)))
+    )
+
+    async def unreachable(messages, info):
+        raise AssertionError("the offline cache called the model")
+
+    offline = CachedModel(FunctionModel(unreachable, model_name="scripted"), store, offline=True)
+    replayed = asyncio.run(execute_analysis("replay", "iPhone 15 Pro", generate_research_agent(model=offline)))
+
+    assert replayed["error"] is None
+    assert replayed["sentiment_analysis"] == recorded["sentiment_analysis"]
+    assert recorded["usage"]["input_tokens"] > 0 and replayed["usage"]["input_tokens"] == 0
+    assert store.stats() == (10, 10)
+
+    with pytest.raises(ModelCacheMiss):
+        asyncio.run(offline.request([ModelRequest(parts=[UserPromptPart("unseen")])], None, ModelRequestParameters()))
+
+
+def test_replayed_runs_skip_the_model():
+    results = compare_replay(["iPhone 15 Pro"], delay=0.2)
+
+    assert (results["cold"]["hits"], results["cold"]["misses"]) == (0, 10)
+    assert (results["replayed"]["hits"], results["replayed"]["misses"]) == (10, 0)
+    assert results["replayed"]["median_seconds"] < results["cold"]["median_seconds"] / 4
@@ -0,0 +1,98 @@
+import json
+import threading
+from unittest.mock import Mock
+
+from src.catalog.review_index import ReviewIndex, ReviewSearch, snippet
+from src.llm.agent import ResearchContext
+from src.llm.tools.review_search import search_review_aspects
+
+REVIEWS = [
+    {"review_text": "Battery life is poor, the battery drains by noon.", "rating": 2, "sentiment": "negative"},
+    {"review_text": "Great camera and a decent battery.", "rating": 4, "sentiment": "positive"},
+    {"review_text": "Overpriced for what you get.", "rating": 2, "sentiment": "negative"},
+    {"review_text": "The camera is stunning, photos look amazing in low light.", "rating": 5, "sentiment": "positive"},
+]
+
+
+def test_aspects_are_counted_and_ranked_with_bm25():
+    index = ReviewIndex()
+    index.add(REVIEWS)
+
+    battery = index.aspect("battery", limit=1)
+    assert battery["mentions"] == 2 and battery["average_rating"] == 3.0
+    assert battery["snippets"][0]["text"].startswith("Battery life is poor")
+    assert index.aspect("price", limit=2)["sentiment"] == {"negative": 1}
+    assert index.aspect("low light", limit=2)["mentions"] == 1
+    assert index.aspect("bluetooth", limit=2) == {
+        "mentions": 0,
+        "share_percent": 0.0,
+        "average_rating": None,
+        "sentiment": {},
+        "snippets": [],
+    }
+
+
+def test_reviews_are_indexed_incrementally():
+    search = ReviewSearch(cache_size=1)
+    reviews = list(REVIEWS[:2])
+    index = search.index("iPhone 15 Pro", reviews)
+    reviews.extend(REVIEWS[2:])
+
+    assert search.index("iPhone 15 Pro", reviews) is index
+    rebuilt = ReviewIndex()
+    rebuilt.add(REVIEWS)
+    assert index.scores(["camera", "battery"]) == rebuilt.scores(["camera", "battery"])
+    assert search.cache_stats() == (1, 1)
+    search.index("Sony WH-1000XM5", REVIEWS)
+    assert search.index("iPhone 15 Pro", reviews) is not index
+
+
+def test_indexing_a_product_does_not_block_the_others(monkeypatch):
+    search = ReviewSearch()
+    indexing, release = threading.Event(), threading.Event()
+    add = ReviewIndex.add
+
+    def slow_add(self, reviews):
+        if len(reviews) == len(REVIEWS):
+            indexing.set()
+            release.wait(5)
+        add(self, reviews)
+
+    monkeypatch.setattr(ReviewIndex, "add", slow_add)
+    slow = threading.Thread(target=search.index, args=("iPhone 15 Pro", REVIEWS))
+    slow.start()
+    assert indexing.wait(5)
+    try:
+        other = threading.Thread(target=search.index, args=("Sony WH-1000XM5", REVIEWS[:1]))
+        other.start()
+        other.join(1)
+        assert not other.is_alive()
+    finally:
+        release.set()
+        slow.join()
+
+
+def test_snippet_is_cut_around_the_first_match():
+    text = "Unboxing was smooth. " * 10 + "The battery lasts two days. " + "Setup took minutes. " * 10
+
+    cut = snippet(text, ["battery"], size=80)
+    assert "battery lasts two days" in cut and cut.startswith("…") and cut.endswith("…")
+    assert len(cut) <= 82
+
+
+def test_search_review_aspects():
+    ctx = Mock()
+    ctx.deps = ResearchContext(product_name="iPhone 15 Pro")
+
+    result = json.loads(search_review_aspects(ctx))
+
+    assert result["handle"] == "review_aspects"
+    assert result["aspects"]["camera"]["mentions"] == 2
+    assert "battery" in result["aspects"]["battery"]["snippets"][0].lower()
+    assert "shipping" not in result["aspects"] and ctx.deps.review_aspects["shipping"]["mentions"] == 0
+
+    json.loads(search_review_aspects(ctx, aspects=["titanium design"]))
+    assert list(ctx.deps.review_aspects) == ["titanium design"]
+
+    ctx.deps = ResearchContext(product_name="Unknown Product")
+    assert "error" in json.loads(search_review_aspects(ctx))
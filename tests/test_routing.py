@@ -0,0 +1,53 @@
+import json
+
+import pytest
+from pydantic_ai.messages import ModelRequest, RetryPromptPart, ToolReturnPart, UserPromptPart
+
+from benchmarks.routing import compare_routing
+from src.llm.agent import DATA_FIELDS
+from src.llm.handles import data_handle
+from src.llm.routing import RETRY_STEP, START_STEP, configured_model, is_synthesis, request_step
+
+
+def test_request_step():
+    assert request_step([ModelRequest(parts=[UserPromptPart("analyse 'iPhone 15 Pro'")])]) == START_STEP
+    assert request_step([ModelRequest(parts=[ToolReturnPart("fetch_product_data", '{"handle": "product_info"}')])]) == (
+        "fetch_product_data"
+    )
+    error = json.dumps({"error": "Product not found"})
+    assert request_step([ModelRequest(parts=[ToolReturnPart("fetch_product_data", error)])]) == RETRY_STEP
+    assert request_step([ModelRequest(parts=[RetryPromptPart("invalid arguments")])]) == RETRY_STEP
+
+
+def test_tiered_routing_sends_only_synthesis_to_the_large_model():
+    results = compare_routing(["iPhone 15 Pro"], large_delay=0, fast_delay=0)
+
+    assert (results["large"]["large_requests"], results["large"]["fast_requests"]) == (10, 0)
+    assert (results["fast"]["large_requests"], results["fast"]["fast_requests"]) == (0, 10)
+    assert (results["tiered"]["large_requests"], results["tiered"]["fast_requests"]) == (1, 9)
+    # The large model writes the report once every data tool has run.
+    assert results["tiered"]["large_tool_calls"] == ["generate_product_report"]
+
+
+def test_synthesis_waits_for_every_data_field():
+    def returned(*fields):
+        return [ModelRequest(parts=[ToolReturnPart(f"tool_{field}", data_handle(field)) for field in fields])]
+
+    assert not is_synthesis(returned("product_info", "sentiment_analysis"), DATA_FIELDS)
+    assert is_synthesis(returned(*DATA_FIELDS), DATA_FIELDS)
+    # A new data tool moves the synthesis after it.
+    assert not is_synthesis(returned(*DATA_FIELDS), {*DATA_FIELDS, "pricing_history"})
+    assert not is_synthesis(returned(*DATA_FIELDS, "report_path"), DATA_FIELDS)
+    # Handles compacted by the history processor still count.
+    compacted = [ModelRequest(parts=[ToolReturnPart("tool", {"handle": field, "product": None}) for field in DATA_FIELDS])]
+    assert is_synthesis(compacted, DATA_FIELDS)
+
+
+def test_configured_model(monkeypatch):
+    monkeypatch.setattr("src.llm.routing.settings.MODEL_ROUTING", "large")
+    monkeypatch.setattr("src.llm.routing.settings.MODEL_LARGE", "anthropic:claude-3-5-sonnet-20240620")
+    assert configured_model(DATA_FIELDS) == "anthropic:claude-3-5-sonnet-20240620"
+
+    monkeypatch.setattr("src.llm.routing.settings.MODEL_ROUTING", "cheapest")
+    with pytest.raises(ValueError, match="Unknown model routing"):
+        configured_model(DATA_FIELDS)
@@ -0,0 +1,86 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.models.analysis.requests import AnalysisPriority
+from src.api.services.database_service import DatabaseService
+from src.api.services.scheduler import AnalysisScheduler, parse_priority_weights
+from src.monitoring.metrics import analysis_queue_wait_seconds
+
+HIGH, NORMAL, LOW = AnalysisPriority.HIGH, AnalysisPriority.NORMAL, AnalysisPriority.LOW
+
+
+def test_parse_priority_weights():
+    assert parse_priority_weights("high:8, low:0.5") == {HIGH: 8.0, NORMAL: 1.0, LOW: 0.5}
+
+
+def test_free_slots_go_to_priorities_by_weight():
+    async def run() -> list[str]:
+        scheduler = AnalysisScheduler(max_concurrency=1, weights={HIGH: 4, NORMAL: 2, LOW: 1})
+        started = []
+        release = asyncio.Event()
+
+        async def blocker():
+            async with scheduler.slot(LOW):
+                await release.wait()
+
+        async def analysis(priority: AnalysisPriority):
+            async with scheduler.slot(priority):
+                started.append(priority.value)
+                await asyncio.sleep(0)
+
+        running = asyncio.create_task(blocker())
+        await asyncio.sleep(0)
+        # A bulk submission queued first, then interactive requests.
+        waiting = [asyncio.create_task(analysis(LOW)) for _ in range(3)]
+        await asyncio.sleep(0)
+        waiting += [asyncio.create_task(analysis(priority)) for priority in [HIGH] * 6 + [NORMAL] * 3]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(running, *waiting)
+        return started
+
+    started = asyncio.run(run())
+
+    assert started[:7] == ["high", "high", "normal", "high", "high", "normal", "low"]
+    assert started.count("low") == 3
+    assert started.index("low") < len(started) - 3
+
+
+def test_cancelled_waiters_give_up_their_place():
+    async def run() -> int:
+        scheduler = AnalysisScheduler(max_concurrency=1, weights=parse_priority_weights(""))
+        release = asyncio.Event()
+
+        async def analysis():
+            async with scheduler.slot(NORMAL):
+                await release.wait()
+
+        first, second, third = (asyncio.create_task(analysis()) for _ in range(3))
+        await asyncio.sleep(0)
+        second.cancel()
+        release.set()
+        await asyncio.gather(first, third)
+        return scheduler.running
+
+    assert asyncio.run(run()) == 0
+
+
+def test_priority_reaches_the_scheduler(monkeypatch, tmp_path):
+    monkeypatch.setattr("src.api.routes.analysis.db_service", DatabaseService(str(tmp_path / "scheduler.db")))
+    executed = []
+
+    async def execute(analysis_id, query, agent=None):
+        executed.append(query)
+        return {"report_path": None, "error": None}
+
+    monkeypatch.setattr("src.api.services.research.execute_analysis", execute)
+    client = TestClient(app)
+
+    response = client.post("/api/v1/analyze", json={"query": "iPhone 15 Pro", "priority": "high"})
+    invalid = client.post("/api/v1/analyze", json={"query": "iPhone 15 Pro", "priority": "urgent"})
+
+    assert response.status_code == 200 and executed == ["iPhone 15 Pro"]
+    assert invalid.status_code == 422
+    assert analysis_queue_wait_seconds.quantile(0.5, priority="high") is not None
@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.services.warmup import WarmupState, warm_up, warmup_state
+
+ROOT_DIR = Path(__file__).parent.parent
+HEAVY_MODULES = {"pydantic_ai", "anthropic", "mcp", "sqlalchemy", "fuzzywuzzy"}
+COLD_START_BUDGET_MS = float(os.getenv("COLD_START_BUDGET_MS", "3000"))
+
+
+def measure_import_time(module: str) -> tuple[float, set[str]]:
+    """Import `module` in a fresh interpreter with `-X importtime`; return its cumulative ms and every module loaded."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_ms = 0.0
+    imported = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        imported.add(name.strip())
+        if name.strip() == module:
+            cumulative_ms = int(cumulative) / 1000
+    return cumulative_ms, imported
+
+
+def test_api_cold_start_defers_agent_stack():
+    cumulative_ms, imported = measure_import_time("src.api.main")
+
+    assert not {module for module in imported if module.split(".")[0] in HEAVY_MODULES}
+    assert 0 < cumulative_ms < COLD_START_BUDGET_MS, f"src.api.main cold import: {cumulative_ms:.1f} ms"
+
+
+def test_readiness_reflects_warmup(monkeypatch):
+    client = TestClient(app)
+
+    with monkeypatch.context() as patched:
+        patched.setattr("src.api.routes.health.warmup_state", WarmupState(["catalog", "agent"]))
+        assert client.get("/health").status_code == 200
+        assert client.get("/ready").status_code == 503
+
+    warm_up()
+
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["components"] == {"catalog": "ready", "agent": "ready"}
+    assert warmup_state.is_ready
+
+
+def test_components_load_lazily_without_warmup(monkeypatch):
+    state = WarmupState(["catalog", "agent"])
+    monkeypatch.setattr("src.api.main.settings.WARMUP_ON_STARTUP", False)
+    monkeypatch.setattr("src.api.main.warmup_state", state)
+    monkeypatch.setattr("src.api.routes.health.warmup_state", state)
+
+    with TestClient(app) as client:
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["components"] == {"catalog": "lazy", "agent": "lazy"}
+        assert client.get("/health").json()["services"]["agent"] == "healthy"
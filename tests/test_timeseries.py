@@ -0,0 +1,83 @@
+from unittest.mock import Mock
+
+from src.catalog.timeseries import CHUNK_MS, TimeSeriesStore, price_series, trend_series
+from src.llm.agent import ResearchContext
+from src.llm.tools.market_trend_analysis import analyze_market_trends
+from src.llm.tools.report_generator import render_report
+from src.llm.tools.webscraping import fetch_product_data
+
+DAY = 86400
+NOW = 1_790_000_000
+
+
+def test_range_aggregate_and_downsample(tmp_path):
+    store = TimeSeriesStore(str(tmp_path / "timeseries.db"), flush_size=50)
+    series = price_series("iPhone 15 Pro", "Amazon")
+    # Out of order, over several chunks and flushes.
+    store.append_many((series, NOW - day * DAY, 100 + day) for day in reversed(range(200)))
+    store.append(price_series("iPhone 15 Pro", "Best Buy"), NOW, 90)
+    store.flush()
+
+    points = store.range(series, NOW - 30 * DAY, NOW)
+    assert [value for _, value in points] == [100 + day for day in reversed(range(31))]
+    last_30_days = store.aggregate([series], NOW - 30 * DAY, NOW)
+    assert last_30_days["count"] == 31 and last_30_days["mean"] == 115 and last_30_days["first"] == 130
+    assert last_30_days["change_percent"] == round((100 - 130) / 130 * 100, 2)
+
+    every_retailer = store.aggregate(store.series(price_series("iPhone 15 Pro")), NOW - 30 * DAY, NOW)
+    assert every_retailer["count"] == 32 and every_retailer["min"] == 90
+    assert store.aggregate([series], NOW + DAY, NOW + 2 * DAY) is None
+
+    weeks = store.downsample(series, NOW - 28 * DAY, NOW, 7 * DAY)
+    assert sum(bucket["count"] for bucket in weeks) == 29
+
+
+def test_buffered_points_are_read_before_they_are_written(tmp_path):
+    store = TimeSeriesStore(str(tmp_path / "timeseries.db"), flush_size=100, flush_seconds=3600)
+    series = price_series("iPhone 15 Pro", "Amazon")
+    store.append(series, NOW - DAY, 110)
+    store.flush()
+    store.append(series, NOW, 100)
+
+    assert store.series(price_series("iPhone 15 Pro")) == [series]
+    assert store.range(series, NOW - DAY, NOW) == [(NOW - DAY, 110), (NOW, 100)]
+    assert store.aggregate([series], NOW - DAY, NOW)["last"] == 100
+    assert TimeSeriesStore(store.path).range(series, NOW - DAY, NOW) == [(NOW - DAY, 110)]
+
+    # Written at the first append once flush_seconds have passed.
+    store.flush_seconds = 0
+    store.append(series, NOW + 1, 105)
+    assert len(TimeSeriesStore(store.path).range(series, NOW - DAY, NOW + 1)) == 3
+
+
+def test_compact_merges_and_downsamples_old_chunks(tmp_path):
+    store = TimeSeriesStore(str(tmp_path / "timeseries.db"), flush_size=10)
+    series = trend_series("iPhone 15 Pro", "search_volume")
+    start = NOW - NOW % (CHUNK_MS // 1000) - 10 * DAY
+    for hours in range(0, 48, 6):
+        store.append_many((series, start + hour * 3600, hour % 24) for hour in range(hours, hours + 6))
+        store.flush()
+    before = store.aggregate([series], start, start + 2 * DAY)
+
+    assert store.compact(NOW) == 2
+    assert store.aggregate([series], start, start + 2 * DAY) == before
+
+    store.compact(NOW, bucket_seconds=DAY)
+    assert store.range(series, start, start + 2 * DAY) == [(start, 11.5), (start + DAY, 11.5)]
+
+
+def test_analyses_record_prices_and_trends(monkeypatch, tmp_path):
+    monkeypatch.setattr("src.catalog.timeseries.settings.TIMESERIES_PATH", str(tmp_path / "timeseries.db"))
+    for _ in range(2):
+        ctx = Mock()
+        ctx.deps = ResearchContext(product_name="iPhone 15 Pro")
+        fetch_product_data(ctx, "iPhone 15 Pro")
+        analyze_market_trends(ctx)
+
+    history = ctx.deps.market_trends["history"]
+    retailers = len(ctx.deps.product_info["retailers"])
+    assert list(history) == ["30d", "180d"]
+    assert history["30d"]["price"]["count"] == 2 * retailers
+    assert history["30d"]["search_volume"]["count"] == 2
+    report = render_report({"product_info": {"name": "iPhone 15 Pro"}, "market_trends": ctx.deps.market_trends}, "markdown")
+    assert "Last 30 days, Price: average $" in report
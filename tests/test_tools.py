@@ -3,7 +3,7 @@ from unittest.mock import Mock, patch, mock_open
 
 from src.llm.tools.webscraping import fetch_product_data, fetch_product_reviews
 from src.llm.tools.sentiment_analysis import get_product_sentiment_analysis
-from src.llm.tools.market_trend_analysis import analyze_market_trends
+from src.llm.tools.market_trend_analysis import analyze_category_trends, analyze_market_trends
 from src.llm.tools.report_generator import generate_product_report
 from src.llm.agent import ResearchContext
 
@@ -16,13 +16,14 @@ def test_fetch_product_data():
 
     assert result is not None
     result_data = json.loads(result)
-    assert "product_info" in result_data
+    assert result_data["handle"] == "product_info"
+    assert result_data["product"] == "iPhone 15 Pro"
     assert "pricing_data" in result_data
     assert "availability_summary" in result_data
-    assert "rating_summary" in result_data
-    assert "retailers" in result_data
-    assert "scraping_metadata" in result_data
-    assert result_data["product_info"]["name"] == "iPhone 15 Pro"
+    assert "retailers" not in result_data
+    assert "retailers" in ctx.deps.product_info
+    assert "scraping_metadata" in ctx.deps.product_info
+    assert ctx.deps.product_info["product_info"]["name"] == "iPhone 15 Pro"
 
 
 def test_fetch_product_reviews():
@@ -33,9 +34,10 @@ def test_fetch_product_reviews():
 
     assert result is not None
     result_data = json.loads(result)
-    assert isinstance(result_data, list)
-    assert len(result_data) >= 0
-    assert ctx.deps.reviews_data is not None
+    assert result_data["handle"] == "reviews_data"
+    assert result_data["review_count"] == len(ctx.deps.reviews_data) > 0
+    assert sum(result_data["rating_counts"].values()) == result_data["review_count"]
+    assert isinstance(ctx.deps.reviews_data, list)
 
 
 def test_get_product_sentiment_analysis():
@@ -74,8 +76,25 @@ def test_analyze_market_trends():
     assert result is not None
     result_data = json.loads(result)
 
-    assert isinstance(result_data, dict)
-    assert ctx.deps.market_trends is not None
+    assert result_data["handle"] == "market_trends"
+    assert result_data["market_sentiment"] == ctx.deps.market_trends["market_sentiment"]
+    assert "insights" in ctx.deps.market_trends
+
+
+def test_analyze_category_trends():
+    ctx = Mock()
+    ctx.deps = ResearchContext(product_name="iPhone 15 Pro")
+    ctx.deps.market_trends = {"category": "smartphones", "current_metrics": {"search_volume": 125}}
+
+    result = json.loads(analyze_category_trends(ctx))
+
+    assert result["handle"] == "category_trends"
+    assert result["category"] == "smartphones"
+    search_volume = ctx.deps.category_trends["metrics"]["search_volume"]
+    assert ctx.deps.category_trends["product_vs_category"]["search_volume_vs_median"] == 125 - search_volume["median"]
+
+    ctx.deps = ResearchContext(product_name="Unknown Product")
+    assert "error" in json.loads(analyze_category_trends(ctx))
 
 
 @patch("builtins.open", new_callable=mock_open)
@@ -90,8 +109,8 @@ def test_generate_product_report(mock_mkdir, mock_file):
 
     result = generate_product_report(ctx)
 
-    assert result is not None
-    assert "iPhone_15_Pro_report_" in result
+    assert json.loads(result) == {"handle": "report_path", "product": "iPhone 15 Pro"}
+    assert "iPhone_15_Pro_report_" in ctx.deps.report_path
     mock_file.assert_called()
     mock_mkdir.assert_called()
     assert ctx.deps.report_path is not None
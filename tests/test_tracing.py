@@ -0,0 +1,50 @@
+import asyncio
+from contextlib import nullcontext
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from pydantic_ai.messages import ModelResponse, ToolCallPart
+from pydantic_ai.models.function import FunctionModel
+
+from src.api.services.research import execute_analysis
+from src.llm.agent import generate_research_agent
+from src.monitoring import tracing
+
+
+def scripted_model(messages, info):
+    if len(messages) == 1:
+        return ModelResponse(parts=[ToolCallPart("get_most_similar_product", {"product_name": "iphone 15"})])
+    return ModelResponse(parts=[ToolCallPart("exit_program", {})])
+
+
+def test_tracing_disabled_is_a_no_op(monkeypatch):
+    monkeypatch.setattr(tracing.settings, "TRACING_ENABLED", False)
+
+    def tool(ctx, product_name: str) -> str:
+        return product_name
+
+    assert tracing.traced("tool")(tool) is tool
+    assert isinstance(tracing.span("analysis"), nullcontext)
+
+
+def test_analysis_spans_carry_payload_sizes_and_token_counts(monkeypatch):
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(tracing.settings, "TRACING_ENABLED", True)
+    monkeypatch.setattr(tracing, "get_tracer", lambda: provider.get_tracer(tracing.TRACER_NAME))
+
+    agent = generate_research_agent(model=FunctionModel(scripted_model))
+    result = asyncio.run(execute_analysis("analysis-1", "iphone 15", agent))
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    tool_span = spans["tool get_most_similar_product"]
+    analysis_span = spans["analysis"]
+
+    assert result["error"] is None
+    assert tool_span.attributes["payload.input_bytes"] > 0
+    assert tool_span.attributes["payload.output_bytes"] > 0
+    assert tool_span.parent.span_id == analysis_span.context.span_id
+    assert analysis_span.attributes["gen_ai.usage.requests"] == 2
+    assert analysis_span.attributes["gen_ai.usage.input_tokens"] > 0
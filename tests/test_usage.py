@@ -0,0 +1,100 @@
+import asyncio
+import sqlite3
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from pydantic_ai.messages import ModelResponse, ToolCallPart
+from pydantic_ai.usage import RequestUsage
+
+from benchmarks.stub_model import TOOL_SEQUENCE, scripted_model
+from src.api.main import app
+from src.api.models.analysis.responses import AnalysisStatus
+from src.api.services.database_service import DatabaseService
+from src.api.services.research import analysis_outcome, execute_analysis
+from src.api.services.usage import analysis_usage
+from src.llm.agent import generate_research_agent
+from src.llm.usage import UsageRecorder
+
+
+def test_execute_analysis_records_usage_per_step(monkeypatch, tmp_path):
+    monkeypatch.setattr("src.llm.tools.report_generator.settings.REPORTS_DIR", str(tmp_path))
+    agent = generate_research_agent(model=scripted_model())
+
+    usage = asyncio.run(execute_analysis("usage-analysis", "iPhone 15 Pro", agent))["usage"]
+
+    assert list(usage["steps"]) == TOOL_SEQUENCE
+    assert usage["model_requests"] == 10
+    assert usage["input_tokens"] == sum(step["input_tokens"] for step in usage["steps"].values()) > 0
+    assert usage["steps"]["fetch_product_reviews"]["tool_output_bytes"] > 0
+    assert usage["steps"]["exit_program"]["tool_output_bytes"] == 0
+
+
+def test_existing_database_is_migrated(tmp_path):
+    db_path = tmp_path / "old.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE analysis_history (analysis_id TEXT PRIMARY KEY, query TEXT NOT NULL, status TEXT NOT NULL, "
+        "created_at TIMESTAMP NOT NULL, completed_at TIMESTAMP, report TEXT, error TEXT)"
+    )
+    conn.execute(
+        "INSERT INTO analysis_history VALUES ('old', 'iPhone 15 Pro', 'completed', '2024-01-01 12:00:00', NULL, NULL, NULL)"
+    )
+    conn.commit()
+    conn.close()
+
+    data = DatabaseService(str(db_path)).get_analysis("old")
+
+    assert data["query"] == "iPhone 15 Pro"
+    assert data["input_tokens"] is None and data["usage_steps"] is None
+
+
+def test_usage_endpoints(monkeypatch, tmp_path):
+    db_service = DatabaseService(str(tmp_path / "usage.db"))
+    monkeypatch.setattr("src.api.routes.usage.db_service", db_service)
+    for analysis_id, query, tokens in (("a", "iPhone 15 Pro", 1000), ("b", "iPhone 15 Pro", 1000), ("c", "PlayStation 5", 5000)):
+        db_service.add_analysis(analysis_id=analysis_id, query=query, status=AnalysisStatus.RUNNING, created_at=datetime.now())
+        usage = {"input_tokens": tokens, "output_tokens": 100, "model_requests": 1, "model_latency_seconds": 1.0}
+        step = {
+            "requests": 1,
+            "output_tokens": 100,
+            "model_latency_seconds": 1.0,
+            "tool_output_bytes": 4000,
+            "input_tokens": tokens,
+        }
+        db_service.update_analysis(**analysis_outcome(analysis_id, {"usage": {**usage, "steps": {"fetch_product_data": step}}}))
+    client = TestClient(app)
+
+    analysis = client.get("/api/v1/analyze/c/usage").json()
+    by_product = client.get("/api/v1/usage", params={"group_by": "product"}).json()
+    by_day = client.get("/api/v1/usage").json()
+
+    assert analysis["cost_usd"] == 0.0165
+    assert analysis["steps"]["fetch_product_data"]["tool_output_bytes"] == 4000
+    assert [row["key"] for row in by_product["rows"]] == ["PlayStation 5", "iPhone 15 Pro"]
+    assert by_product["rows"][1]["analyses"] == 2
+    assert by_product["rows"][1]["steps"]["fetch_product_data"]["input_tokens"] == 2000
+    assert by_day["rows"][0]["input_tokens"] == 7000
+    assert client.get("/api/v1/usage", params={"group_by": "retailer"}).status_code == 422
+
+
+def test_steps_are_priced_at_the_rates_of_their_model(monkeypatch, tmp_path):
+    monkeypatch.setattr("src.llm.pricing.settings.MODEL_FAST", "anthropic:claude-3-5-haiku-20241022")
+    monkeypatch.setattr("src.llm.pricing.settings.MODEL_FAST_INPUT_COST_PER_MTOK", 0.8)
+    monkeypatch.setattr("src.llm.pricing.settings.MODEL_FAST_OUTPUT_COST_PER_MTOK", 4.0)
+    recorder = UsageRecorder()
+    for model_name, tool in (("claude-3-5-haiku-20241022", "fetch_product_data"), ("claude-3-5-sonnet-20240620", "exit_program")):
+        response = ModelResponse(
+            parts=[ToolCallPart(tool, {})], usage=RequestUsage(input_tokens=1000, output_tokens=100), model_name=model_name
+        )
+        recorder.record_response(response, 1.0)
+    usage = recorder.to_dict()
+    db_service = DatabaseService(str(tmp_path / "usage.db"))
+    db_service.add_analysis(analysis_id="a", query="iPhone 15 Pro", status=AnalysisStatus.RUNNING, created_at=datetime.now())
+    db_service.update_analysis(**analysis_outcome("a", {"usage": usage}))
+
+    steps = analysis_usage(db_service.get_analysis("a"))["steps"]
+
+    assert steps["fetch_product_data"]["model"] == "claude-3-5-haiku-20241022"
+    assert steps["fetch_product_data"]["cost_usd"] == 0.0012
+    assert steps["exit_program"]["cost_usd"] == 0.0045
+    assert analysis_usage(db_service.get_analysis("a"))["cost_usd"] == 0.0057